@@ -4,19 +4,29 @@ Provides: Conversation Context, Sentiment Analysis, Text Summarization
 Uses: Free Hugging Face API, TextBlob, NLTK
 """
 
-import requests
 import json
+import sqlite3
+import threading
+import time
 from datetime import datetime
-from collections import deque
+from collections import deque, OrderedDict
 import re
-from textblob import TextBlob
-try:
-    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-    VADER_AVAILABLE = True
-except ImportError:
-    VADER_AVAILABLE = False
+from lazy_loader import lazy_import
+from singleflight import get_group, request_key
+from hf_client import get_client
+from sentiment_batch import BatchScorer, get_vader, NUMPY_AVAILABLE, VADER_AVAILABLE
+from textrank import TextRankSummarizer
+from chunked_summary import ChunkedSummarizer, CHARS_PER_TOKEN
+if not VADER_AVAILABLE:
     print("VADER not available. Install with: pip install vaderSentiment")
 
+# Concurrent identical Hugging Face requests share one upstream call
+SUMMARIZE_CALLS = get_group('hf_summarize')
+GENERATE_CALLS = get_group('hf_generate')
+
+# TextBlob pulls in NLTK and is only the fallback when VADER is missing
+textblob = lazy_import('textblob')
+
 class ConversationMemory:
     """Manages conversation context and history"""
     
@@ -26,10 +36,10 @@ class ConversationMemory:
         self.user_preferences = {}
         self.session_start = datetime.now()
         
-    def add_interaction(self, user_input, assistant_response, metadata=None):
+    def add_interaction(self, user_input, assistant_response, metadata=None, timestamp=None):
         """Add an interaction to conversation history"""
         interaction = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': timestamp or datetime.now().isoformat(),
             'user': user_input,
             'assistant': assistant_response,
             'metadata': metadata or {}
@@ -62,12 +72,148 @@ class ConversationMemory:
         return self.user_preferences.get(key, default)
 
 
+class ConversationStore:
+    """Per-user ConversationMemory objects, bounded by an LRU, an idle TTL and a memory cap"""
+    
+    # Rough per-interaction overhead (dict, timestamp, metadata) on top of the text itself
+    INTERACTION_OVERHEAD = 400
+    
+    def __init__(self, loader=None, max_history=10, max_users=5000, idle_ttl=1800, max_bytes=32 * 1024 * 1024):
+        """
+        Args:
+            loader: Optional callable(user_id, limit) returning the user's most recent
+                (user_input, assistant_response, timestamp) tuples, oldest first.
+                Used to rehydrate a memory that is not cached (e.g. after a restart).
+            max_history: Interactions kept per user
+            max_users: Most memories held at once (least recently used are evicted)
+            idle_ttl: Seconds a memory may go unused before it is dropped
+            max_bytes: Approximate cap on the text held across all memories
+        """
+        self.loader = loader
+        self.max_history = max_history
+        self.max_users = max_users
+        self.idle_ttl = idle_ttl
+        self.max_bytes = max_bytes
+        
+        self._entries = OrderedDict()  # user id -> [memory, last_used, size]
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'rehydrated': 0,
+            'evictions': 0,
+            'expirations': 0
+        }
+    
+    def _estimate_size(self, memory):
+        """Approximate bytes held by a memory"""
+        return sum(len(i['user']) + len(i['assistant']) + self.INTERACTION_OVERHEAD
+                   for i in memory.conversation_history)
+    
+    def _load(self, user_id):
+        """Build a memory for a user, rehydrated from the loader if there is one"""
+        memory = ConversationMemory(max_history=self.max_history)
+        if self.loader is not None:
+            try:
+                for user_input, assistant_response, timestamp in self.loader(user_id, self.max_history):
+                    memory.add_interaction(user_input, assistant_response, timestamp=str(timestamp))
+                self.stats['rehydrated'] += 1
+            except Exception as e:
+                print(f"Conversation rehydrate error for user {user_id}: {e}")
+        return memory
+    
+    def _remove(self, user_id):
+        """Drop a user's memory (lock held)"""
+        _, _, size = self._entries.pop(user_id)
+        self.total_bytes -= size
+    
+    def _enforce_limits(self, now):
+        """Expire idle memories and evict until within bounds (lock held)"""
+        # The LRU head is always the least recently used, so expired entries sit there
+        while self._entries:
+            user_id, (_, last_used, _) = next(iter(self._entries.items()))
+            if now - last_used < self.idle_ttl:
+                break
+            self._remove(user_id)
+            self.stats['expirations'] += 1
+        
+        while len(self._entries) > 1 and (len(self._entries) > self.max_users or self.total_bytes > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+            self.stats['evictions'] += 1
+    
+    def get(self, user_id):
+        """Get a user's memory, rehydrating it on a cache miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and now - entry[1] < self.idle_ttl:
+                entry[1] = now
+                self._entries.move_to_end(user_id)
+                self.stats['hits'] += 1
+                return entry[0]
+            self.stats['misses'] += 1
+        
+        # Load outside the lock so a slow database read does not block other users
+        memory = self._load(user_id)
+        size = self._estimate_size(memory)
+        
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and now - entry[1] < self.idle_ttl:
+                # Another thread loaded it meanwhile
+                return entry[0]
+            if entry is not None:
+                self._remove(user_id)
+            self._entries[user_id] = [memory, now, size]
+            self.total_bytes += size
+            self._enforce_limits(now)
+        return memory
+    
+    def record(self, user_id, user_input, assistant_response, metadata=None):
+        """Add an interaction to a user's memory"""
+        memory = self.get(user_id)
+        memory.add_interaction(user_input, assistant_response, metadata)
+        
+        size = self._estimate_size(memory)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] is memory:
+                self.total_bytes += size - entry[2]
+                entry[2] = size
+                self._enforce_limits(time.monotonic())
+    
+    def forget(self, user_id):
+        """Drop a user's memory (history cleared or account deleted)"""
+        with self._lock:
+            if user_id in self._entries:
+                self._remove(user_id)
+    
+    def get_stats(self):
+        """Get store statistics"""
+        with self._lock:
+            users = len(self._entries)
+            total_bytes = self.total_bytes
+        lookups = self.stats['hits'] + self.stats['misses']
+        hit_rate = self.stats['hits'] / lookups if lookups else 0.0
+        return dict(self.stats, users=users, bytes=total_bytes, hit_rate=round(hit_rate, 4))
+
+
 class SentimentAnalyzer:
     """Analyzes sentiment and emotions from text"""
     
     def __init__(self):
-        self.vader = SentimentIntensityAnalyzer() if VADER_AVAILABLE else None
+        self._vader = None
+        self._batch_scorer = None
+        self._batch_lock = threading.Lock()
         
+    @property
+    def vader(self):
+        """Shared VADER analyzer, loaded on first use - parsing the lexicon is the expensive part"""
+        if self._vader is None:
+            self._vader = get_vader()
+        return self._vader
+    
     def analyze_sentiment(self, text):
         """
         Analyze sentiment of text
@@ -106,7 +252,7 @@ class SentimentAnalyzer:
                     result['confidence'] = 1 - abs(compound)
             else:
                 # Fallback to TextBlob
-                blob = TextBlob(text)
+                blob = textblob.TextBlob(text)
                 polarity = blob.sentiment.polarity
                 
                 result['score'] = polarity
@@ -126,6 +272,115 @@ class SentimentAnalyzer:
             
         return result
     
+    @staticmethod
+    def _vader_result(text, compound, pos, neg, neu):
+        """Build an analyze_sentiment-style result from VADER scores"""
+        if compound >= 0.05:
+            sentiment, confidence = 'positive', compound
+        elif compound <= -0.05:
+            sentiment, confidence = 'negative', abs(compound)
+        else:
+            sentiment, confidence = 'neutral', 1 - abs(compound)
+        return {
+            'text': text,
+            'sentiment': sentiment,
+            'score': compound,
+            'confidence': confidence,
+            'emotions': {'positive': pos, 'negative': neg, 'neutral': neu}
+        }
+    
+    def _get_batch_scorer(self):
+        """Vectorised scorer sharing this analyzer's lexicon (None without NumPy/VADER)"""
+        if self.vader is None or not NUMPY_AVAILABLE:
+            return None
+        with self._batch_lock:
+            if self._batch_scorer is None:
+                self._batch_scorer = BatchScorer(self.vader)
+            return self._batch_scorer
+    
+    def analyze_batch(self, texts, exact=False):
+        """
+        Analyze the sentiment of many texts at once
+        
+        Args:
+            texts: List of strings
+            exact: Score each text with VADER itself instead of the vectorised
+                scorer (slower; the two agree except on VADER's slang special cases)
+        
+        Returns:
+            List of analyze_sentiment-style dicts, in input order
+        """
+        scorer = None if exact else self._get_batch_scorer()
+        if scorer is None:
+            return [self.analyze_sentiment(text) for text in texts]
+        
+        scores = scorer.score(texts)
+        return [
+            self._vader_result(text, float(compound), float(pos), float(neg), float(neu))
+            for text, compound, pos, neg, neu in zip(texts, scores['compound'], scores['pos'],
+                                                     scores['neg'], scores['neu'])
+        ]
+    
+    def score_batch(self, texts):
+        """Compound scores only (-1..1) for many texts - the cheap path for bulk jobs"""
+        scorer = self._get_batch_scorer()
+        if scorer is None:
+            return [self.analyze_sentiment(text)['score'] for text in texts]
+        return scorer.score(texts)['compound'].tolist()
+    
+    def analyze_stream(self, rows, batch_size=5000):
+        """
+        Score an (id, text) stream in chunks without holding it all in memory
+        
+        Args:
+            rows: Iterable of (row_id, text)
+            batch_size: Texts scored per vectorised pass
+        
+        Yields:
+            Lists of (row_id, compound score), one list per chunk
+        """
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= batch_size:
+                yield list(zip((row_id for row_id, _ in chunk), self.score_batch([text for _, text in chunk])))
+                chunk = []
+        if chunk:
+            yield list(zip((row_id for row_id, _ in chunk), self.score_batch([text for _, text in chunk])))
+    
+    def analyze_chat_history(self, db_path, after_id=0, batch_size=5000, limit=None):
+        """
+        Stream sentiment for stored chat messages, oldest first
+        
+        Reads chat_history read-only with keyset pagination on id, so it can run
+        next to the app and resume from the last id it reported.
+        
+        Args:
+            db_path: Path to the web database
+            after_id: Only score messages with a larger id (resume point)
+            batch_size: Rows read and scored per chunk
+            limit: Stop after this many messages (None = all)
+        
+        Yields:
+            Lists of (chat_history id, compound score), one list per chunk
+        """
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            remaining = limit
+            while remaining is None or remaining > 0:
+                size = batch_size if remaining is None else min(batch_size, remaining)
+                rows = conn.execute(
+                    'SELECT id, message FROM chat_history WHERE id > ? ORDER BY id LIMIT ?', (after_id, size)
+                ).fetchall()
+                if not rows:
+                    break
+                yield from self.analyze_stream(rows, batch_size=len(rows))
+                after_id = rows[-1][0]
+                if remaining is not None:
+                    remaining -= len(rows)
+        finally:
+            conn.close()
+    
     def get_emotion_response(self, sentiment_result):
         """Get appropriate response based on sentiment"""
         sentiment = sentiment_result['sentiment']
@@ -160,49 +415,58 @@ class TextSummarizer:
     
     def __init__(self, REMOVED_HF_TOKEN=None):
         self.REMOVED_HF_TOKEN = REMOVED_HF_TOKEN
-        self.api_url = "https://api-inference.huggingface.co/models/facebook/bart-large-cnn"
+        self.model = "facebook/bart-large-cnn"
+        self.textrank = TextRankSummarizer()
+        # Texts beyond the BART window are summarized chunk by chunk, then reduced;
+        # failed calls get an extractive summary, which is not cached
+        self.chunker = ChunkedSummarizer(self._summarize_once, fallback_fn=self._fallback_summary)
         
     def summarize(self, text, max_length=130, min_length=30):
         """
         Summarize text using Hugging Face BART model
         """
         if not self.REMOVED_HF_TOKEN:
-            return self._extractive_summary(text, sentences=3)
-            
-        try:
-            headers = {"Authorization": f"Bearer {self.REMOVED_HF_TOKEN}"}
-            payload = {
-                "inputs": text,
-                "parameters": {
-                    "max_length": max_length,
-                    "min_length": min_length,
-                    "do_sample": False
-                },
-                "options": {"wait_for_model": True}
+            # TextRank has no input window, so there is nothing to chunk
+            return self._extractive_summary(text, sentences=3, max_chars=max_length * CHARS_PER_TOKEN)
+        
+        return self.chunker.summarize(text, max_length, min_length)
+    
+    def _summarize_once(self, text, max_length, min_length):
+        """One BART call for text that fits the model window"""
+        key = request_key(self.model, max_length, min_length, text)
+        return SUMMARIZE_CALLS.do(key, self._summarize_with_hf, text, max_length, min_length)
+    
+    def _summarize_with_hf(self, text, max_length, min_length):
+        """
+        Call the BART summarization endpoint
+        
+        Raises:
+            ValueError: The response has no summary (request errors propagate too)
+        """
+        payload = {
+            "inputs": text,
+            "parameters": {
+                "max_length": max_length,
+                "min_length": min_length,
+                "do_sample": False
             }
-            
-            response = requests.post(self.api_url, headers=headers, json=payload, timeout=30)
-            
-            if response.status_code == 200:
-                result = response.json()
-                if isinstance(result, list) and len(result) > 0:
-                    return result[0].get('summary_text', text)
-            
-            # Fallback to extractive summary
-            return self._extractive_summary(text, sentences=3)
-            
-        except Exception as e:
-            print(f"Summarization error: {e}")
-            return self._extractive_summary(text, sentences=3)
+        }
+        
+        result = get_client().infer(self.model, payload, self.REMOVED_HF_TOKEN)
+        if isinstance(result, list) and result and isinstance(result[0], dict) and result[0].get('summary_text'):
+            return result[0]['summary_text']
+        raise ValueError(f"No summary in the model response: {str(result)[:200]}")
+    
+    def _fallback_summary(self, text, max_length, min_length):
+        """Extractive summary used when a BART call fails"""
+        return self._extractive_summary(text, sentences=3, max_chars=max_length * CHARS_PER_TOKEN)
     
-    def _extractive_summary(self, text, sentences=3):
-        """Simple extractive summarization (fallback)"""
+    def _extractive_summary(self, text, sentences=3, max_chars=None):
+        """Offline TextRank summary (fallback when BART is unavailable)"""
         try:
-            from textblob import TextBlob
-            blob = TextBlob(text)
-            sentences_list = blob.sentences[:sentences]
-            return ' '.join(str(s) for s in sentences_list)
-        except:
+            return self.textrank.summarize(text, sentences=sentences, max_chars=max_chars)
+        except Exception as e:
+            print(f"[WARNING] TextRank summarization failed: {e}")
             # Ultimate fallback - just take first N sentences
             sentences_list = text.split('. ')[:sentences]
             return '. '.join(sentences_list) + '.'
@@ -211,20 +475,35 @@ class TextSummarizer:
 class AdvancedAI:
     """Main advanced AI class combining all features"""
     
-    def __init__(self, REMOVED_HF_TOKEN=None, max_history=10):
+    def __init__(self, REMOVED_HF_TOKEN=None, max_history=10, history_loader=None):
+        # self.memory serves single-user callers; web users get their own via self.conversations
         self.memory = ConversationMemory(max_history=max_history)
-        self.sentiment_analyzer = SentimentAnalyzer()
+        self.conversations = ConversationStore(loader=history_loader, max_history=max_history)
+        self.sentiment_analyzer = get_sentiment_analyzer()
         self.summarizer = TextSummarizer(REMOVED_HF_TOKEN=REMOVED_HF_TOKEN)
         self.REMOVED_HF_TOKEN = REMOVED_HF_TOKEN
         
-    def process_input(self, user_input, include_sentiment=True):
+    def get_memory(self, user_id=None):
+        """Get the conversation memory for a user (the shared memory when user_id is None)"""
+        if user_id is None:
+            return self.memory
+        return self.conversations.get(user_id)
+    
+    def remember(self, user_id, user_input, response, metadata=None):
+        """Add an interaction to a user's memory"""
+        if user_id is None:
+            self.memory.add_interaction(user_input, response, metadata)
+        else:
+            self.conversations.record(user_id, user_input, response, metadata)
+    
+    def process_input(self, user_input, include_sentiment=True, user_id=None):
         """
         Process user input with sentiment analysis and context
         """
         result = {
             'input': user_input,
             'timestamp': datetime.now().isoformat(),
-            'context': self.memory.get_context(last_n=3)
+            'context': self.get_memory(user_id).get_context(last_n=3)
         }
         
         if include_sentiment:
@@ -232,7 +511,7 @@ class AdvancedAI:
             
         return result
     
-    def generate_response(self, user_input, context=None):
+    def generate_response(self, user_input, context=None, user_id=None):
         """
         Generate contextual response using Hugging Face
         """
@@ -242,7 +521,7 @@ class AdvancedAI:
             
             # Get conversation context
             if context is None:
-                context = self.memory.get_context(last_n=3)
+                context = self.get_memory(user_id).get_context(last_n=3)
             
             # Build prompt with context
             if context:
@@ -257,7 +536,7 @@ class AdvancedAI:
                 response = "I understand. How can I help you with that?"
             
             # Add interaction to memory
-            self.memory.add_interaction(user_input, response, {'sentiment': sentiment})
+            self.remember(user_id, user_input, response, {'sentiment': sentiment})
             
             return {
                 'response': response,
@@ -275,29 +554,27 @@ class AdvancedAI:
     
     def _generate_with_hf(self, prompt):
         """Generate response using Hugging Face API"""
+        return GENERATE_CALLS.do(request_key(prompt), self._request_generation, prompt)
+    
+    def _request_generation(self, prompt):
+        """Call the BlenderBot endpoint"""
         try:
-            api_url = "https://api-inference.huggingface.co/models/facebook/blenderbot-400M-distill"
-            headers = {"Authorization": f"Bearer {self.REMOVED_HF_TOKEN}"}
             payload = {
                 "inputs": prompt,
                 "parameters": {
                     "max_length": 100,
                     "temperature": 0.7,
                     "top_p": 0.9
-                },
-                "options": {"wait_for_model": True}
+                }
             }
             
-            response = requests.post(api_url, headers=headers, json=payload, timeout=30)
-            
-            if response.status_code == 200:
-                result = response.json()
-                if isinstance(result, list) and len(result) > 0:
-                    generated = result[0].get('generated_text', '')
-                    # Extract assistant response
-                    if 'Assistant:' in generated:
-                        return generated.split('Assistant:')[-1].strip()
-                    return generated
+            result = get_client().infer("facebook/blenderbot-400M-distill", payload, self.REMOVED_HF_TOKEN)
+            if isinstance(result, list) and len(result) > 0:
+                generated = result[0].get('generated_text', '')
+                # Extract assistant response
+                if 'Assistant:' in generated:
+                    return generated.split('Assistant:')[-1].strip()
+                return generated
                     
         except Exception as e:
             print(f"HF API error: {e}")
@@ -308,9 +585,9 @@ class AdvancedAI:
         """Summarize long text"""
         return self.summarizer.summarize(text, max_length=max_length)
     
-    def get_conversation_summary(self):
+    def get_conversation_summary(self, user_id=None):
         """Get summary of current conversation"""
-        history = self.memory.get_full_history()
+        history = self.get_memory(user_id).get_full_history()
         if not history:
             return "No conversation history yet."
         
@@ -320,30 +597,63 @@ class AdvancedAI:
             conv_text.append(f"User: {interaction['user']}")
             conv_text.append(f"Assistant: {interaction['assistant']}")
         
-        full_text = ' '.join(conv_text)
+        # Blank lines keep each turn a sentence boundary for chunking
+        full_text = '\n\n'.join(conv_text)
         return self.summarize_text(full_text, max_length=200)
     
-    def clear_memory(self):
+    def clear_memory(self, user_id=None):
         """Clear conversation memory"""
-        self.memory.clear_history()
+        if user_id is None:
+            self.memory.clear_history()
+        else:
+            self.conversations.forget(user_id)
 
 
 # Convenience functions for easy integration
-def create_advanced_ai(REMOVED_HF_TOKEN=None, max_history=10):
+def create_advanced_ai(REMOVED_HF_TOKEN=None, max_history=10, history_loader=None):
     """Create and return AdvancedAI instance"""
-    return AdvancedAI(REMOVED_HF_TOKEN=REMOVED_HF_TOKEN, max_history=max_history)
+    return AdvancedAI(REMOVED_HF_TOKEN=REMOVED_HF_TOKEN, max_history=max_history, history_loader=history_loader)
+
+
+_default_sentiment_analyzer = None
+_default_sentiment_lock = threading.Lock()
+
+
+def get_sentiment_analyzer():
+    """Process-wide SentimentAnalyzer"""
+    global _default_sentiment_analyzer
+    with _default_sentiment_lock:
+        if _default_sentiment_analyzer is None:
+            _default_sentiment_analyzer = SentimentAnalyzer()
+        return _default_sentiment_analyzer
 
 
 def analyze_sentiment(text):
     """Quick sentiment analysis"""
-    analyzer = SentimentAnalyzer()
-    return analyzer.analyze_sentiment(text)
+    return get_sentiment_analyzer().analyze_sentiment(text)
+
+
+def analyze_sentiment_batch(texts):
+    """Quick sentiment analysis of many texts"""
+    return get_sentiment_analyzer().analyze_batch(texts)
+
+
+_default_summarizers = {}  # token -> TextSummarizer, so calls share its chunk cache and pool
+_default_summarizers_lock = threading.Lock()
+
+
+def get_summarizer(REMOVED_HF_TOKEN=None):
+    """Process-wide TextSummarizer for a token"""
+    with _default_summarizers_lock:
+        summarizer = _default_summarizers.get(REMOVED_HF_TOKEN)
+        if summarizer is None:
+            summarizer = _default_summarizers[REMOVED_HF_TOKEN] = TextSummarizer(REMOVED_HF_TOKEN=REMOVED_HF_TOKEN)
+        return summarizer
 
 
 def summarize_text(text, REMOVED_HF_TOKEN=None):
     """Quick text summarization"""
-    summarizer = TextSummarizer(REMOVED_HF_TOKEN=REMOVED_HF_TOKEN)
-    return summarizer.summarize(text)
+    return get_summarizer(REMOVED_HF_TOKEN).summarize(text)
 
 
 if __name__ == "__main__":
@@ -4,11 +4,22 @@ Flask Backend API for Axon AI Web Interface
 Provides REST API and WebSocket support for the chat interface
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response
 from flask_cors import CORS
 from web_database import WebDatabase
+from maintenance import MaintenanceWorker, RETENTION_SETTINGS
+from sentiment_pipeline import SentimentBackfill
+from export_stream import EXPORT_FORMATS, stream_rows, gzip_stream
 from ai_integration import AIBridge
+from lazy_loader import WarmUp
+from singleflight import get_all_stats as get_coalescing_stats
+from hf_client import get_stats as get_hf_stats
+from unit_registry import ConversionError, get_unit, convert_many
 from functools import wraps
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import atexit
+import base64
+import json
 import os
 import smtplib
 from email.message import EmailMessage
@@ -24,15 +35,57 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = 'axon-ai-secret-key-change-in-production'
 CORS(app)
 
+# Request limits
+SSE_KEEPALIVE_SECONDS = 1.0      # Keep-alive comment interval while a streamed reply is pending
+SSE_CHUNK_WORDS = 4              # Words per streamed chunk event
+MAX_HISTORY_PAGE_SIZE = 200      # Chat history rows per page
+MAX_CONVERT_VALUES = 100000      # Values per /api/convert request
+MAX_BATCH_SIZE = 10000           # Messages per admin batch request
+MAX_BATCH_WORKERS = 32           # Concurrent handlers per admin batch request
+
 # Initialize SocketIO (will auto-detect best async mode)
 # Supports: eventlet, gevent, threading (in order of preference)
 
 # Initialize database and AI bridge
-db = WebDatabase()
-ai_bridge = AIBridge()
+# DB_PROFILE selects the SQLite performance profile ('performance' or 'safe')
+# DB_WRITE_BEHIND=1 batches chat_history/activity_logs inserts on a writer thread
+db = WebDatabase(
+    profile=os.environ.get('DB_PROFILE', 'performance'),
+    write_behind=os.environ.get('DB_WRITE_BEHIND', '0') == '1'
+)
+
+
+def load_conversation(user_id, limit):
+    """Recent exchanges for a user, oldest first (rehydrates conversation memory)"""
+    history = db.get_chat_history(user_id, limit)
+    return [(h['message'], h['response'], h['timestamp']) for h in reversed(history)]
+
+
+ai_bridge = AIBridge(history_loader=load_conversation)
+
+# AI modules load lazily; preload them in the background once the worker is serving (AI_WARM_UP=0 disables)
+warm_up = WarmUp(ai_bridge.warm_up_tasks(), delay=float(os.environ.get('AI_WARM_UP_DELAY', 2)))
+if os.environ.get('AI_WARM_UP', '1') != '0':
+    warm_up.start()
+
+# Background cleanup of expired sessions and retention (MAINTENANCE_INTERVAL=0 disables)
+maintenance = MaintenanceWorker(db, interval=int(os.environ.get('MAINTENANCE_INTERVAL', 900)))
+if maintenance.interval > 0:
+    maintenance.start()
+
+# Background sentiment scoring of stored messages (SENTIMENT_BACKFILL_INTERVAL=0 disables)
+sentiment_backfill = SentimentBackfill(db, interval=int(os.environ.get('SENTIMENT_BACKFILL_INTERVAL', 60)))
+if sentiment_backfill.interval > 0:
+    sentiment_backfill.start()
 
-# Store active sessions
-active_sessions = {}
+# Close pooled database connections when the worker exits
+# (atexit runs in reverse order: background workers stop before the pool closes)
+atexit.register(db.close)
+atexit.register(ai_bridge.contacts_db.close)
+atexit.register(ai_bridge.wiki_cache.close)
+atexit.register(maintenance.stop)
+atexit.register(sentiment_backfill.stop)
+atexit.register(warm_up.stop)
 
 
 # ============================================================================
@@ -74,9 +127,8 @@ def admin_required(f):
         if not session['valid']:
             return jsonify({'success': False, 'message': 'Invalid session'}), 401
         
-        # Check if user is admin
-        user_result = db.get_user_by_id(session['user']['id'])
-        if not user_result['success'] or not user_result['user']['is_admin']:
+        # Check if user is admin (verify_session already carries the flags)
+        if not session['user']['is_admin']:
             return jsonify({'success': False, 'message': 'Admin access required'}), 403
         
         # Pass user info to the route
@@ -125,9 +177,6 @@ def login():
         user_id = result['user']['id']
         session_token = db.create_session(user_id)
         
-        # Store in active sessions
-        active_sessions[session_token] = result['user']
-        
         return jsonify({
             'success': True,
             'session_token': session_token,
@@ -170,9 +219,6 @@ def admin_login():
     user_id = user['id']
     session_token = db.create_session(user_id)
     
-    # Store in active sessions
-    active_sessions[session_token] = user
-    
     # Log activity
     db.log_activity(user_id, 'ADMIN_LOGIN', f'Admin logged in via email: {email}')
     
@@ -198,9 +244,8 @@ def create_admin():
     
     # Get requester details
     requester_id = session['user']['id']
-    user_result = db.get_user_by_id(requester_id)
     
-    if not user_result['success'] or not user_result['user']['is_superadmin']:
+    if not session['user']['is_superadmin']:
         return jsonify({'success': False, 'message': 'Unauthorized to create admin accounts'}), 403
     
     # Get new admin details
@@ -230,8 +275,6 @@ def logout():
     
     if session_token:
         db.delete_session(session_token)
-        if session_token in active_sessions:
-            del active_sessions[session_token]
         
         return jsonify({'success': True, 'message': 'Logged out successfully'}), 200
     else:
@@ -254,13 +297,135 @@ def get_user():
         return jsonify({'success': False, 'message': 'Invalid session'}), 401
 
 
+# ============================================================================
+# Chat API
+# ============================================================================
+
+def sse_event(event, data):
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _read_chat_request():
+    """Validate the session and chat payload; returns (user, payload) or (None, error response)"""
+    session_token = request.headers.get('Authorization')
+    
+    if not session_token:
+        return None, (jsonify({'success': False, 'message': 'Not authenticated'}), 401)
+    
+    session = db.verify_session(session_token)
+    
+    if not session['valid']:
+        return None, (jsonify({'success': False, 'message': 'Invalid session'}), 401)
+    
+    data = request.json or {}
+    message = (data.get('message') or '').strip()
+    
+    if not message:
+        return None, (jsonify({'success': False, 'message': 'Message required'}), 400)
+    
+    payload = {
+        'message': message,
+        'mode': data.get('mode', 'text'),
+        'language': data.get('language', 'en')
+    }
+    return session['user'], payload
+
+
+@app.route('/api/chat', methods=['POST'])
+def chat():
+    """Send a message to Axon and get the full response"""
+    user, payload = _read_chat_request()
+    if user is None:
+        return payload
+    
+    result = ai_bridge.process_command(payload['message'], payload['mode'], payload['language'], user_id=user['id'])
+    db.add_chat_message(user['id'], payload['message'], result['response'],
+                        payload['mode'], result.get('language', payload['language']))
+    
+    return jsonify({
+        'success': result['success'],
+        'response': result['response'],
+        'language': result.get('language', payload['language'])
+    }), 200
+
+
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream():
+    """
+    Send a message to Axon and get the response as Server-Sent Events
+    
+    Handlers produce their reply in one piece, so nothing is sent before it is
+    ready: start goes out immediately, keep-alive comments follow while the
+    handler runs, then the finished reply arrives as chunk {text} events and
+    done {response, language}. The exchange is saved by the handler thread,
+    so it is kept even if the client disconnects first.
+    """
+    user, payload = _read_chat_request()
+    if user is None:
+        return payload
+    
+    user_id = user['id']
+    
+    def save(result):
+        db.add_chat_message(user_id, payload['message'], result['response'], payload['mode'],
+                            result.get('language', payload['language']))
+    
+    # Started before the response so the reply is produced and saved whether or not the client stays
+    future = ai_bridge.submit_command(payload['message'], payload['mode'], payload['language'],
+                                      user_id=user_id, on_result=save)
+    
+    def generate():
+        yield sse_event('start', {'mode': payload['mode']})
+        
+        while True:
+            try:
+                result = future.result(timeout=SSE_KEEPALIVE_SECONDS)
+                break
+            except FutureTimeoutError:
+                yield ': keep-alive\n\n'
+        
+        response_text = result['response']
+        words = response_text.split(' ')
+        for i in range(0, len(words), SSE_CHUNK_WORDS):
+            chunk = ' '.join(words[i:i + SSE_CHUNK_WORDS])
+            yield sse_event('chunk', {'text': chunk if i == 0 else ' ' + chunk})
+        
+        yield sse_event('done', {
+            'success': result['success'],
+            'response': response_text,
+            'language': result.get('language', payload['language'])
+        })
+    
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    return Response(generate(), mimetype='text/event-stream', headers=headers)
+
+
 # ============================================================================
 # Chat History API
 # ============================================================================
 
+def encode_history_cursor(message_id):
+    """Encode a chat_history id as an opaque pagination cursor"""
+    return base64.urlsafe_b64encode(f'h:{message_id}'.encode()).decode().rstrip('=')
+
+
+def decode_history_cursor(cursor):
+    """Decode a pagination cursor back to a chat_history id (None if malformed)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        prefix, message_id = base64.urlsafe_b64decode(padded.encode()).decode().split(':', 1)
+        return int(message_id) if prefix == 'h' else None
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
 @app.route('/api/history', methods=['GET'])
 def get_history():
-    """Get chat history for current user"""
+    """
+    Get chat history for current user, one page at a time
+    Query params: limit, and either cursor (from next_cursor) or before_id
+    """
     session_token = request.headers.get('Authorization')
     
     if not session_token:
@@ -270,11 +435,47 @@ def get_history():
     
     if session['valid']:
         user_id = session['user']['id']
-        limit = request.args.get('limit', 50, type=int)
+        limit = max(1, min(request.args.get('limit', 50, type=int), MAX_HISTORY_PAGE_SIZE))
+        before_id = request.args.get('before_id', type=int)
+        
+        cursor = request.args.get('cursor')
+        if cursor:
+            before_id = decode_history_cursor(cursor)
+            if before_id is None:
+                return jsonify({'success': False, 'message': 'Invalid cursor'}), 400
         
-        history = db.get_chat_history(user_id, limit)
+        page = db.get_chat_history_page(user_id, limit, before_id)
+        next_cursor = page['next_cursor']
         
-        return jsonify({'success': True, 'history': history}), 200
+        return jsonify({
+            'success': True,
+            'history': page['history'],
+            'next_cursor': encode_history_cursor(next_cursor) if next_cursor else None
+        }), 200
+    else:
+        return jsonify({'success': False, 'message': 'Invalid session'}), 401
+
+
+@app.route('/api/history/search', methods=['GET'])
+def search_history():
+    """Full-text search over the current user's chat history"""
+    session_token = request.headers.get('Authorization')
+    
+    if not session_token:
+        return jsonify({'success': False, 'message': 'Not authenticated'}), 401
+    
+    session = db.verify_session(session_token)
+    
+    if session['valid']:
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'success': False, 'message': 'Search query required'}), 400
+        
+        user_id = session['user']['id']
+        limit = max(1, min(request.args.get('limit', 20, type=int), MAX_HISTORY_PAGE_SIZE))
+        results = db.search_chat_history(user_id, query, limit)
+        
+        return jsonify({'success': True, 'query': query, 'results': results}), 200
     else:
         return jsonify({'success': False, 'message': 'Invalid session'}), 401
 
@@ -292,6 +493,7 @@ def clear_history():
     if session['valid']:
         user_id = session['user']['id']
         rows_deleted = db.clear_chat_history(user_id)
+        ai_bridge.forget_conversation(user_id)
         
         return jsonify({
             'success': True,
@@ -361,9 +563,8 @@ def update_profile():
         email = data.get('email')
         
         # Update user info in database
-        conn = db.db_path
         import sqlite3
-        connection = sqlite3.connect(conn)
+        connection = db.get_connection()
         cursor = connection.cursor()
         
         try:
@@ -373,6 +574,7 @@ def update_profile():
             ''', (username, email, user_id))
             connection.commit()
             connection.close()
+            db.invalidate_user_sessions(user_id)
             
             return jsonify({
                 'success': True,
@@ -442,6 +644,46 @@ def get_stats():
         return jsonify({'success': False, 'message': 'Invalid session'}), 401
 
 
+@app.route('/api/convert', methods=['POST'])
+def convert_units_bulk():
+    """
+    Convert a list of values between two units in one call
+    Body: {"values": [...], "from": "km", "to": "miles"}
+    """
+    session_token = request.headers.get('Authorization')
+    
+    if not session_token:
+        return jsonify({'success': False, 'message': 'Not authenticated'}), 401
+    
+    session = db.verify_session(session_token)
+    
+    if not session['valid']:
+        return jsonify({'success': False, 'message': 'Invalid session'}), 401
+    
+    data = request.json or {}
+    values = data.get('values')
+    
+    if not isinstance(values, list) or not values:
+        return jsonify({'success': False, 'message': 'values must be a non-empty list'}), 400
+    if len(values) > MAX_CONVERT_VALUES:
+        return jsonify({'success': False, 'message': f'At most {MAX_CONVERT_VALUES} values per request'}), 400
+    
+    try:
+        source = get_unit(data.get('from', ''))
+        target = get_unit(data.get('to', ''))
+        results = convert_many(values, source, target)
+    except ConversionError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    
+    return jsonify({
+        'success': True,
+        'from': source.name,
+        'to': target.name,
+        'dimension': source.dimension,
+        'results': results
+    }), 200
+
+
 @app.route('/api/delete-account', methods=['DELETE'])
 def delete_account():
     """Delete user account"""
@@ -455,9 +697,9 @@ def delete_account():
     if session['valid']:
         user_id = session['user']['id']
         
-        # Delete user data
-        import sqlite3
-        conn = sqlite3.connect(db.db_path)
+        # Delete user data (commit queued writes first so none land afterwards)
+        db.flush_writes()
+        conn = db.get_connection()
         cursor = conn.cursor()
         
         # Delete chat history
@@ -469,6 +711,8 @@ def delete_account():
         
         conn.commit()
         conn.close()
+        db.invalidate_user_sessions(user_id)
+        ai_bridge.forget_conversation(user_id)
         
         return jsonify({
             'success': True,
@@ -544,6 +788,7 @@ def admin_delete_user(current_user, user_id):
     result = db.delete_user(user_id)
     
     if result['success']:
+        ai_bridge.forget_conversation(user_id)
         db.log_activity(current_user['id'], 'DELETE_USER', f'Deleted user {user_id}')
     
     return jsonify(result), 200
@@ -630,6 +875,150 @@ def admin_update_settings(current_user):
 
 
 
+@app.route('/api/admin/db-pragmas', methods=['GET'])
+@admin_required
+def admin_get_db_pragmas(current_user):
+    """Get the SQLite performance profile and pragmas in effect (admin only)"""
+    databases = {
+        'web': db.get_pragmas(),
+        'contacts': ai_bridge.contacts_db.get_pragmas()
+    }
+    return jsonify({'success': True, 'databases': databases}), 200
+
+
+@app.route('/api/admin/db-stats', methods=['GET'])
+@admin_required
+def admin_get_db_stats(current_user):
+    """Get database, cache and outbound call coalescing metrics (admin only)"""
+    stats = db.get_runtime_stats()
+    stats['conversations'] = ai_bridge.get_conversation_stats()
+    stats['wikipedia_cache'] = ai_bridge.get_wikipedia_cache_stats()
+    stats['coalesced_calls'] = get_coalescing_stats()
+    stats['hf_models'] = get_hf_stats()
+    stats['handlers'] = ai_bridge.get_handler_stats()
+    stats['warm_up'] = warm_up.get_stats()
+    return jsonify({'success': True, 'stats': stats}), 200
+
+
+@app.route('/api/admin/maintenance', methods=['GET'])
+@admin_required
+def admin_get_maintenance(current_user):
+    """Get maintenance worker status and retention settings (admin only)"""
+    retention = {key: db.get_setting(key) for key in RETENTION_SETTINGS}
+    return jsonify({'success': True, 'maintenance': maintenance.get_stats(), 'retention': retention}), 200
+
+
+@app.route('/api/admin/maintenance', methods=['POST'])
+@admin_required
+def admin_run_maintenance(current_user):
+    """Run session expiry, retention and compaction now (admin only)"""
+    summary = maintenance.run_once()
+    db.log_activity(current_user['id'], 'RUN_MAINTENANCE', f"Expired sessions removed: {summary['expired_sessions']}")
+    return jsonify({'success': True, 'summary': summary}), 200
+
+
+@app.route('/api/admin/sentiment-backfill', methods=['GET'])
+@admin_required
+def admin_get_sentiment_backfill(current_user):
+    """Get sentiment backfill progress (admin only)"""
+    return jsonify({'success': True, 'sentiment_backfill': sentiment_backfill.get_stats()}), 200
+
+
+@app.route('/api/admin/sentiment-backfill', methods=['POST'])
+@admin_required
+def admin_run_sentiment_backfill(current_user):
+    """Score unscored chat messages now (admin only)"""
+    summary = sentiment_backfill.run_once()
+    db.log_activity(current_user['id'], 'RUN_SENTIMENT_BACKFILL', f"Messages scored: {summary['scored']}")
+    return jsonify({'success': True, 'summary': summary}), 200
+
+
+@app.route('/api/admin/batch-process', methods=['POST'])
+@admin_required
+def admin_batch_process(current_user):
+    """
+    Run many messages through the AI bridge (admin only)
+    Body: JSONL - one {"message", "mode"?, "language"?} object (or a JSON string) per line
+    Returns: JSONL - one result per input line, in input order
+    """
+    messages = []
+    for line_number, line in enumerate(request.get_data(as_text=True).splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError:
+            return jsonify({'success': False, 'message': f'Line {line_number} is not valid JSON'}), 400
+        if isinstance(item, str):
+            item = {'message': item}
+        if not isinstance(item, dict) or not isinstance(item.get('message'), str):
+            return jsonify({'success': False, 'message': f'Line {line_number} has no message'}), 400
+        messages.append(item)
+    
+    if not messages:
+        return jsonify({'success': False, 'message': 'No messages provided'}), 400
+    if len(messages) > MAX_BATCH_SIZE:
+        return jsonify({'success': False, 'message': f'At most {MAX_BATCH_SIZE} messages per batch'}), 400
+    
+    workers = min(max(request.args.get('workers', 8, type=int), 1), MAX_BATCH_WORKERS)
+    results = ai_bridge.process_commands(messages, max_workers=workers)
+    db.log_activity(current_user['id'], 'BATCH_PROCESS', f'Processed {len(messages)} messages')
+    
+    lines = [json.dumps(dict(result, message=item['message']), ensure_ascii=False)
+             for item, result in zip(messages, results)]
+    return Response('\n'.join(lines) + '\n', mimetype='application/x-ndjson'), 200
+
+
+# ============================================================================
+# Admin Export API (streaming)
+# ============================================================================
+
+def _export_response(name, columns, batches):
+    """Build a streaming CSV/JSONL response, gzipped when the client accepts it"""
+    export_format = request.args.get('format', 'csv').lower()
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({
+            'success': False,
+            'message': f"Unsupported export format '{export_format}'. Use: {', '.join(EXPORT_FORMATS)}"
+        }), 400
+    
+    mimetype, extension = EXPORT_FORMATS[export_format]
+    filename = f"{name.replace('-', '_')}_{datetime.datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    headers = {'Content-Disposition': f'attachment; filename="{filename}"'}
+    
+    body = stream_rows(export_format, columns, batches)
+    if 'gzip' in request.headers.get('Accept-Encoding', '').lower():
+        body = gzip_stream(body)
+        headers['Content-Encoding'] = 'gzip'
+        headers['Vary'] = 'Accept-Encoding'
+    
+    return Response(body, mimetype=mimetype, headers=headers)
+
+
+@app.route('/api/admin/export/<any("users", "chat-history", "activity-logs"):name>', methods=['GET'])
+@admin_required
+def admin_export_table(current_user, name):
+    """Stream users, chat history or activity logs as CSV/JSONL (admin only)"""
+    columns, batches = db.iter_export(name)
+    db.log_activity(current_user['id'], 'EXPORT_DATA', f'Exported {name}')
+    return _export_response(name, columns, batches)
+
+
+@app.route('/api/admin/export/analytics', methods=['GET'])
+@admin_required
+def admin_export_analytics(current_user):
+    """Export dashboard analytics as section/key/count rows (admin only)"""
+    analytics = db.get_admin_analytics()
+    
+    rows = [('overview', key, value) for key, value in analytics['overview'].items()]
+    for section, key in [('language_stats', 'language'), ('mode_stats', 'mode'),
+                         ('popular_commands', 'command'), ('registration_trend', 'date'),
+                         ('message_trend', 'date')]:
+        rows.extend((section, item[key], item['count']) for item in analytics[section])
+    
+    db.log_activity(current_user['id'], 'EXPORT_DATA', 'Exported analytics')
+    return _export_response('analytics', ['section', 'key', 'count'], iter([rows]))
+
 
 # ============================================================================
 # Contact Form API
@@ -687,30 +1076,27 @@ Received at: {ist_time_str} (IST)
         # Log to activity log if user is logged in (optional)
         # Store in database as backup (optional but recommended)
         try:
-            conn = db.db_path
-            import sqlite3
-            connection = sqlite3.connect(conn)
-            cursor = connection.cursor()
-            
-            # Create contact_messages table if not exists (simple inline check)
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS contact_messages (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    email TEXT NOT NULL,
-                    message TEXT NOT NULL,
-                    timestamp DATETIME,
-                    status TEXT DEFAULT 'unread'
-                )
-            ''')
-            
-            cursor.execute('''
-                INSERT INTO contact_messages (name, email, message, timestamp)
-                VALUES (?, ?, ?, ?)
-            ''', (name, email, message, ist_now))
-            
-            connection.commit()
-            connection.close()
+            with db.connection() as connection:
+                cursor = connection.cursor()
+                
+                # Create contact_messages table if not exists (simple inline check)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS contact_messages (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        name TEXT NOT NULL,
+                        email TEXT NOT NULL,
+                        message TEXT NOT NULL,
+                        timestamp DATETIME,
+                        status TEXT DEFAULT 'unread'
+                    )
+                ''')
+                
+                cursor.execute('''
+                    INSERT INTO contact_messages (name, email, message, timestamp)
+                    VALUES (?, ?, ?, ?)
+                ''', (name, email, message, ist_now))
+                
+                connection.commit()
         except Exception as db_error:
             print(f"Database backup error: {db_error}")
             # Don't fail the request if just DB storage fails, since email worked
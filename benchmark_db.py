@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Database Benchmark for Axon AI
+Measures requests per second for /api/history and /api/admin/users
+with and without the pooled WebDatabase connections
+
+Usage:
+    python benchmark_db.py --requests 2000 --threads 8
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# The benchmark chdirs into a scratch directory, so make the repo importable
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, REPO_DIR)
+
+
+def seed_database(database, users=200, messages_per_user=50):
+    """Create an admin, regular users and chat history; return the admin token"""
+    database.create_user('bench_admin', 'bench_admin@example.com', 'benchpass')
+    admin = database.verify_user('bench_admin', 'benchpass')['user']
+
+    conn = database.get_connection()
+    cursor = conn.cursor()
+    cursor.executemany('''
+        INSERT INTO users (username, email, password_hash, created_at)
+        VALUES (?, ?, ?, datetime('now'))
+    ''', [(f'bench_user_{i}', f'bench_user_{i}@example.com', 'x') for i in range(users)])
+    cursor.executemany('''
+        INSERT INTO chat_history (user_id, message, response, mode, language, timestamp)
+        VALUES (?, ?, ?, 'text', 'en', datetime('now'))
+    ''', [(admin['id'], f'message {i}', f'response {i}') for i in range(messages_per_user)])
+    conn.commit()
+    conn.close()
+
+    return database.create_session(admin['id'])
+
+
+def run_endpoint(app, path, token, total_requests, threads):
+    """Hit an endpoint from several threads and return requests per second"""
+    per_thread = max(total_requests // threads, 1)
+    errors = []
+
+    def worker():
+        client = app.test_client()
+        headers = {'Authorization': token}
+        for _ in range(per_thread):
+            response = client.get(path, headers=headers)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    if errors:
+        print(f"[WARNING] {len(errors)} failed requests on {path} (status {errors[0]})")
+    return (per_thread * threads) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pooled vs unpooled WebDatabase')
+    parser.add_argument('--requests', type=int, default=2000, help='Requests per endpoint')
+    parser.add_argument('--threads', type=int, default=8, help='Concurrent client threads')
+    parser.add_argument('--users', type=int, default=200, help='Users to seed')
+    args = parser.parse_args()
+
+    # Import the app from a scratch directory so its default databases
+    # (web_axon.db, contacts.db) are not touched by the benchmark
+    scratch = tempfile.mkdtemp(prefix='axon_bench_')
+    os.chdir(scratch)
+
+    import app as app_module
+    from web_database import WebDatabase
+
+    endpoints = ['/api/history', '/api/admin/users']
+    results = {}
+
+    for label, use_pool in (('before (connect per call)', False), ('after (pooled)', True)):
+        database = WebDatabase(os.path.join(scratch, f'bench_{int(use_pool)}.db'), use_pool=use_pool)
+        token = seed_database(database, users=args.users)
+        app_module.db = database
+
+        # Warm up
+        run_endpoint(app_module.app, endpoints[0], token, args.threads, args.threads)
+
+        results[label] = {
+            path: run_endpoint(app_module.app, path, token, args.requests, args.threads)
+            for path in endpoints
+        }
+        database.close()
+
+    print("\n" + "=" * 70)
+    print(f"{'Mode':<30} " + " ".join(f"{path:>18}" for path in endpoints))
+    print("-" * 70)
+    for label, row in results.items():
+        print(f"{label:<30} " + " ".join(f"{row[path]:>14.0f} rps" for path in endpoints))
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
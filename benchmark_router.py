@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Intent Router Benchmark for Axon AI
+Measures the per-message dispatch cost of the compiled IntentRouter against a
+linear scan that tests each intent's keywords in turn (the old elif chain),
+checks that both pick the same intent, and checks that every unit alias in
+unit_registry is reachable from chat
+
+Usage:
+    python benchmark_router.py --iterations 20000
+"""
+
+import argparse
+import random
+import time
+
+from ai_integration import INTENTS, INTENT_ROUTER
+from unit_registry import ALIASES, UNITS, UNIT_TABLE, ConversionError, parse_conversion
+
+SAMPLE_MESSAGES = [
+    "hello",
+    "how are you?",
+    "what is your name?",
+    "who created you?",
+    "thank you so much",
+    "what is python?",
+    "search artificial intelligence",
+    "search youtube for kesariya song",
+    "play kesariya song",
+    "open youtube",
+    "what's the time?",
+    "weather in mumbai",
+    "tell me a joke",
+    "latest news",
+    "calculate 5 plus 3",
+    "10 times 5",
+    "square root of 16",
+    "convert 10 km to miles",
+    "recommend a good book to read",
+    "flip a coin",
+    "mummy ko whatsapp pe message bhej do",
+    "generate code to reverse a string in python",
+    "i wonder if this sentence matches nothing at all in the table",
+]
+
+
+def _whole_word(keyword, query):
+    """Whole-word substring test, mirroring IntentRouter.scan"""
+    start = query.find(keyword)
+    while start != -1:
+        end = start + len(keyword)
+        if (start == 0 or not query[start - 1].isalnum()) and (end == len(query) or not query[end].isalnum()):
+            return True
+        start = query.find(keyword, start + 1)
+    return False
+
+
+def linear_route(query):
+    """Reference router: test every intent in order with substring scans"""
+    for intent in INTENTS:
+        triggered = (any(keyword in query for keyword in intent.get('any', ()))
+                     or any(_whole_word(keyword, query) for keyword in intent.get('any_words', ())))
+        if not triggered:
+            continue
+        if not all(any(keyword in query for keyword in group) for group in intent.get('all', ())):
+            continue
+        if any(keyword in query for keyword in intent.get('none', ())):
+            continue
+        return intent
+    return None
+
+
+def check_unit_aliases():
+    """Route and parse 'convert 1 <alias> to <unit>' for every alias; returns failing queries"""
+    failures = []
+    for alias, unit in sorted(ALIASES.items()):
+        names = [row[0] for row in UNIT_TABLE[unit.dimension]]
+        target = UNITS[names[1] if names[0] == unit.name else names[0]]
+        query = f"convert 1 {alias} to {target.name}"
+        intent = INTENT_ROUTER.route(query)
+        try:
+            parsed = parse_conversion(query)
+        except ConversionError:
+            parsed = None
+        if intent is None or intent['name'] != 'convert_units' or parsed != (1.0, unit, target):
+            failures.append(query)
+    return failures
+
+
+def time_per_message(route, messages, iterations):
+    """Average microseconds per routed message"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for message in messages:
+            route(message)
+    elapsed = time.perf_counter() - start
+    return elapsed / (iterations * len(messages)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark intent dispatch cost')
+    parser.add_argument('--iterations', type=int, default=20000, help='Passes over the sample messages')
+    parser.add_argument('--fuzz', type=int, default=5000, help='Random messages checked against the linear router')
+    args = parser.parse_args()
+
+    # Random keyword soups exercise priority and whole-word edge cases
+    keywords = sorted({keyword for intent in INTENTS
+                       for key in ('any', 'any_words', 'none')
+                       for keyword in intent.get(key, ())})
+    fillers = ['a', 'the', 'please', 'xyz', 'document', 'todo', 'paris']
+    rng = random.Random(42)
+    mismatches = 0
+    for _ in range(args.fuzz):
+        words = rng.sample(keywords, 2) + rng.sample(fillers, 2)
+        rng.shuffle(words)
+        query = rng.choice(['', ' ']).join(words)
+        if INTENT_ROUTER.route(query) is not linear_route(query):
+            mismatches += 1
+            print(f"[WARNING] Routers disagree on: {query!r}")
+    print(f"Checked {args.fuzz} random messages: {mismatches} mismatches")
+
+    unreachable = check_unit_aliases()
+    for query in unreachable:
+        print(f"[WARNING] Unit alias not reachable: {query!r}")
+    print(f"Checked {len(ALIASES)} unit aliases: {len(unreachable)} unreachable")
+
+    messages = [message.lower() for message in SAMPLE_MESSAGES]
+    linear_us = time_per_message(linear_route, messages, args.iterations)
+    compiled_us = time_per_message(INTENT_ROUTER.route, messages, args.iterations)
+
+    print(f"{'router':<12}{'us/message':>12}")
+    print(f"{'linear':<12}{linear_us:>12.2f}")
+    print(f"{'compiled':<12}{compiled_us:>12.2f}")
+    print(f"Speedup: {linear_us / compiled_us:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
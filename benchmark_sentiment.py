@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Sentiment Throughput Benchmark for Axon AI
+Streams chat_history through SentimentAnalyzer.analyze_chat_history and
+compares the vectorised batch scorer with per-message VADER: rows per
+second and how often the two agree
+
+Usage:
+    python benchmark_sentiment.py --messages 200000
+    python benchmark_sentiment.py --db web_axon.db --batch-size 5000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, REPO_DIR)
+
+from advanced_ai import SentimentAnalyzer  # noqa: E402
+
+SAMPLE_MESSAGES = [
+    "I love this app, it is really helpful!",
+    "This is not working at all, very frustrating",
+    "Can you tell me the weather in Mumbai?",
+    "thanks a lot",
+    "what is python",
+    "I am so sad today :(",
+    "Worst answer ever!!!",
+    "The food was good but the service was terrible",
+    "I don't hate it",
+    "Not bad, kind of nice",
+    "At least it works",
+    "You are the best 😁",
+    "calculate 5 plus 3",
+    "play kesariya song",
+]
+
+
+def seed_database(path, messages):
+    """Create a scratch chat_history with sample messages"""
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        CREATE TABLE chat_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            message TEXT NOT NULL,
+            response TEXT NOT NULL,
+            timestamp TIMESTAMP
+        )
+    ''')
+    rng = random.Random(42)
+    conn.executemany(
+        "INSERT INTO chat_history (user_id, message, response, timestamp) VALUES (?, ?, '', datetime('now'))",
+        ((rng.randint(1, 500), rng.choice(SAMPLE_MESSAGES)) for _ in range(messages))
+    )
+    conn.commit()
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark bulk sentiment scoring over chat_history')
+    parser.add_argument('--db', help='Existing web database (default: a seeded scratch database)')
+    parser.add_argument('--messages', type=int, default=100000, help='Messages to seed when --db is not given')
+    parser.add_argument('--batch-size', type=int, default=5000, help='Rows per chunk')
+    parser.add_argument('--exact-sample', type=int, default=20000, help='Messages also scored with plain VADER')
+    args = parser.parse_args()
+
+    db_path = args.db
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix='axon_sentiment_'), 'bench.db')
+        seed_database(db_path, args.messages)
+
+    analyzer = SentimentAnalyzer()
+
+    start = time.perf_counter()
+    scores = {}
+    for chunk in analyzer.analyze_chat_history(db_path, batch_size=args.batch_size):
+        scores.update(chunk)
+    elapsed = time.perf_counter() - start
+    print(f"Vectorised: {len(scores)} messages in {elapsed:.2f}s ({len(scores) / elapsed:,.0f}/s)")
+
+    conn = sqlite3.connect(db_path)
+    sample = conn.execute('SELECT id, message FROM chat_history ORDER BY id LIMIT ?', (args.exact_sample,)).fetchall()
+    conn.close()
+    start = time.perf_counter()
+    exact = {row_id: analyzer.analyze_sentiment(text)['score'] for row_id, text in sample}
+    elapsed = time.perf_counter() - start
+    print(f"Per-message VADER: {len(exact)} messages in {elapsed:.2f}s ({len(exact) / elapsed:,.0f}/s)")
+
+    def label(score):
+        return 'positive' if score >= 0.05 else 'negative' if score <= -0.05 else 'neutral'
+
+    same_score = sum(1 for row_id, score in exact.items() if abs(score - scores[row_id]) < 1e-3)
+    same_label = sum(1 for row_id, score in exact.items() if label(score) == label(scores[row_id]))
+    print(f"Agreement on {len(exact)} messages: scores {same_score / len(exact):.2%}, labels {same_label / len(exact):.2%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+TextRank Latency Benchmark for Axon AI
+Times the extractive summarizer on generated documents from 1 KB to 1 MB,
+with the default caps and (up to --uncapped-max bytes) with every sentence
+in the graph and dense edges, to show how the caps keep latency flat
+
+Usage:
+    python benchmark_textrank.py
+    python benchmark_textrank.py --file article.txt --repeat 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, REPO_DIR)
+
+from textrank import TextRankSummarizer, split_sentences  # noqa: E402
+
+SIZES = [1024, 10 * 1024, 100 * 1024, 1024 * 1024]
+
+TOPICS = {
+    'weather': ['rain', 'monsoon', 'forecast', 'humidity', 'temperature', 'clouds', 'storm', 'Mumbai'],
+    'music': ['song', 'album', 'playlist', 'singer', 'melody', 'concert', 'guitar', 'chorus'],
+    'python': ['python', 'function', 'module', 'import', 'database', 'query', 'thread', 'cache'],
+    'travel': ['flight', 'hotel', 'train', 'ticket', 'booking', 'airport', 'luggage', 'visa'],
+}
+FILLER = ['the', 'a', 'really', 'then', 'also', 'about', 'with', 'for', 'because', 'and', 'new', 'old']
+
+
+def generate_document(size, seed=7):
+    """Topic-clustered filler text of roughly size bytes"""
+    rng = random.Random(seed)
+    topics = list(TOPICS.values())
+    parts = []
+    length = 0
+    while length < size:
+        topic = rng.choice(topics)
+        words = [rng.choice(topic if rng.random() < 0.5 else FILLER) for _ in range(rng.randint(6, 22))]
+        sentence = ' '.join(words).capitalize() + rng.choice('..!?')
+        parts.append(sentence)
+        length += len(sentence) + 1
+    return ' '.join(parts)
+
+
+def time_summary(summarizer, text, repeat):
+    """Best-of-repeat milliseconds for one summary"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        summarizer.summarize(text, sentences=3, max_chars=520)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark TextRank summarization latency by input size')
+    parser.add_argument('--file', help='Summarize this file (truncated/repeated to each size) instead of generated text')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per size (best is reported)')
+    parser.add_argument('--uncapped-max', type=int, default=100 * 1024,
+                        help='Largest size also timed without the sentence and edge caps')
+    args = parser.parse_args()
+
+    capped = TextRankSummarizer()
+    uncapped = TextRankSummarizer(max_sentences=10 ** 9, top_k=10 ** 9, max_features=10 ** 9)
+
+    if args.file:
+        with open(args.file, encoding='utf-8') as f:
+            source = f.read()
+
+    print(f"{'size':>10}{'sentences':>11}{'capped ms':>12}{'uncapped ms':>14}")
+    for size in SIZES:
+        if args.file:
+            text = (source * (size // max(len(source), 1) + 1))[:size]
+        else:
+            text = generate_document(size)
+        count = len(split_sentences(text))
+        capped_ms = time_summary(capped, text, args.repeat)
+        uncapped_ms = f"{time_summary(uncapped, text, args.repeat):.1f}" if size <= args.uncapped_max else '-'
+        print(f"{size // 1024:>7} KB{count:>11}{capped_ms:>12.1f}{uncapped_ms:>14}")
+
+    print(f"\nSample summary (100 KB):\n{capped.summarize(generate_document(100 * 1024), max_chars=520)}")
+
+
+if __name__ == '__main__':
+    main()
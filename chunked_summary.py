@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+Chunked (Map-Reduce) Summarization for Axon AI
+Texts longer than the model window are split on sentence boundaries into
+token-budgeted chunks, the chunks are summarized concurrently on a bounded
+pool (map) and the partial summaries are summarized again until they fit one
+call (reduce).
+
+Partial summaries are cached by chunk hash. Chunk boundaries are content
+defined (a chunk may also end after a sentence whose hash matches, once it is
+half full), so they line up again shortly after text is dropped from the
+front, and appending text only leaves the last chunk and the new ones to
+summarize - re-summarizing a growing conversation only processes its tail.
+Only real model output is cached: a call that raises is answered by the
+fallback summarizer for that chunk and tried again next time.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from singleflight import request_key
+from textrank import split_sentences
+
+CHARS_PER_TOKEN = 4         # Rough characters per BART token
+CHUNK_TOKENS = 700          # Per-call budget, below BART's 1024 token window
+BOUNDARY_EVERY = 4          # Expected sentences between content-defined boundaries
+MAX_REDUCE_ROUNDS = 4
+
+
+def estimate_tokens(text):
+    """Cheap token estimate from the character count"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _split_long(sentence, budget):
+    """Cut a sentence longer than the budget into word-aligned pieces"""
+    pieces = []
+    current = []
+    used = 0
+    for word in sentence.split():
+        cost = estimate_tokens(word) + 1
+        if current and used + cost > budget:
+            pieces.append(' '.join(current))
+            current, used = [], 0
+        current.append(word)
+        used += cost
+    if current:
+        pieces.append(' '.join(current))
+    return pieces
+
+
+def split_chunks(text, budget=CHUNK_TOKENS):
+    """
+    Split text into chunks of whole sentences within a token budget
+
+    A chunk closes when the next sentence would overflow it, or once it is half
+    full and its last sentence hashes to a boundary.
+    """
+    chunks = []
+    current = []
+    used = 0
+    for sentence in split_sentences(text):
+        for piece in ([sentence] if estimate_tokens(sentence) <= budget else _split_long(sentence, budget)):
+            cost = estimate_tokens(piece) + 1
+            if current and used + cost > budget:
+                chunks.append(' '.join(current))
+                current, used = [], 0
+            current.append(piece)
+            used += cost
+            if used * 2 >= budget and int(request_key(piece)[:8], 16) % BOUNDARY_EVERY == 0:
+                chunks.append(' '.join(current))
+                current, used = [], 0
+    if current:
+        chunks.append(' '.join(current))
+    return chunks
+
+
+class ChunkedSummarizer:
+    """Map-reduce summarization over a single-call summarizer, with a chunk cache"""
+
+    def __init__(self, summarize_fn, chunk_tokens=CHUNK_TOKENS, max_workers=4, cache_size=1024, fallback_fn=None):
+        """
+        Args:
+            summarize_fn: fn(text, max_length, min_length) -> summary for one
+                model call; must be thread-safe and raise when the model fails
+            chunk_tokens: Token budget of each call's input
+            max_workers: Chunks summarized at once (shared by all callers)
+            cache_size: Partial summaries kept (LRU)
+            fallback_fn: fn(text, max_length, min_length) -> summary used
+                (never cached) when summarize_fn raises; None lets it raise
+        """
+        self.summarize_fn = summarize_fn
+        self.fallback_fn = fallback_fn
+        self.chunk_tokens = chunk_tokens
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+
+        self._cache = OrderedDict()  # chunk key -> summary
+        self._lock = threading.Lock()
+        self._executor = None
+        self.stats = {
+            'documents': 0,
+            'chunks': 0,
+            'cache_hits': 0,
+            'cache_misses': 0,
+            'fallbacks': 0,
+            'map_rounds': 0
+        }
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='axon-summarize')
+            return self._executor
+
+    def _cached(self, key):
+        with self._lock:
+            summary = self._cache.get(key)
+            if summary is not None:
+                self._cache.move_to_end(key)
+                self.stats['cache_hits'] += 1
+            else:
+                self.stats['cache_misses'] += 1
+            return summary
+
+    def _store(self, key, summary):
+        with self._lock:
+            self._cache[key] = summary
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _call(self, text, max_length, min_length):
+        """
+        One summarize_fn call, answered by fallback_fn if it raises
+
+        Returns:
+            (summary, from_model)
+        """
+        try:
+            return self.summarize_fn(text, max_length, min_length), True
+        except Exception as e:
+            if self.fallback_fn is None:
+                raise
+            print(f"[WARNING] Summarization call failed, using fallback: {e}")
+            with self._lock:
+                self.stats['fallbacks'] += 1
+            return self.fallback_fn(text, max_length, min_length), False
+
+    def _map(self, chunks, max_length, min_length):
+        """Summarize chunks concurrently, reusing cached partials; returns summaries in order"""
+        keys = [request_key('chunk', max_length, min_length, chunk) for chunk in chunks]
+        summaries = [self._cached(key) for key in keys]
+        misses = [i for i, summary in enumerate(summaries) if summary is None]
+
+        if len(misses) == 1:
+            outcomes = {misses[0]: self._call(chunks[misses[0]], max_length, min_length)}
+        elif misses:
+            executor = self._get_executor()
+            futures = {i: executor.submit(self._call, chunks[i], max_length, min_length) for i in misses}
+            outcomes = {i: future.result() for i, future in futures.items()}
+        else:
+            outcomes = {}
+
+        for i, (summary, from_model) in outcomes.items():
+            summaries[i] = summary
+            if from_model:
+                self._store(keys[i], summary)
+        with self._lock:
+            self.stats['chunks'] += len(chunks)
+        return summaries
+
+    def summarize(self, text, max_length=130, min_length=30):
+        """
+        Summarize text of any length
+
+        Args:
+            text: Text to summarize
+            max_length: Final summary length (model tokens)
+            min_length: Final summary minimum length (model tokens)
+
+        Returns:
+            Summary string
+        """
+        with self._lock:
+            self.stats['documents'] += 1
+        if estimate_tokens(text) <= self.chunk_tokens:
+            return self._call(text, max_length, min_length)[0]
+
+        # Partials only need to carry their chunk's key points into the reduce step
+        partial_length = max(min(max_length, self.chunk_tokens // 4), min_length)
+        partial_min = min(min_length, partial_length // 2)
+
+        for _ in range(MAX_REDUCE_ROUNDS):
+            with self._lock:
+                self.stats['map_rounds'] += 1
+            partials = self._map(split_chunks(text, self.chunk_tokens), partial_length, partial_min)
+            text = '\n\n'.join(partials)
+            if estimate_tokens(text) <= self.chunk_tokens:
+                break
+
+        # Reduce: one call over the combined partials (cut to the window if rounds ran out)
+        return self._call(text[:self.chunk_tokens * CHARS_PER_TOKEN], max_length, min_length)[0]
+
+    def get_stats(self):
+        """Get chunk, cache and reduce statistics"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['cached_partials'] = len(self._cache)
+        return stats
+
+    def shutdown(self):
+        """Stop the worker pool"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
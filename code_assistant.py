@@ -4,10 +4,14 @@ Provides: Code Generation, Code Explanation, Bug Detection, Code Optimization
 Uses: Free Hugging Face CodeGen models
 """
 
-import requests
 import json
 import re
 from datetime import datetime
+from singleflight import get_group, request_key
+from hf_client import get_client
+
+# Concurrent identical generation requests share one upstream call
+CODEGEN_CALLS = get_group('hf_codegen')
 
 
 class CodeGenerator:
@@ -16,7 +20,7 @@ class CodeGenerator:
     def __init__(self, REMOVED_HF_TOKEN=None):
         self.REMOVED_HF_TOKEN = REMOVED_HF_TOKEN
         # Using Salesforce CodeGen model (free)
-        self.api_url = "https://api-inference.huggingface.co/models/Salesforce/codegen-350M-mono"
+        self.model = "Salesforce/codegen-350M-mono"
         
     def generate_code(self, description, language='python', max_length=200):
         """
@@ -25,11 +29,15 @@ class CodeGenerator:
         if not self.REMOVED_HF_TOKEN:
             return self._template_based_generation(description, language)
         
+        key = request_key(self.model, language, max_length, description.lower())
+        return CODEGEN_CALLS.do(key, self._generate_with_hf, description, language, max_length)
+    
+    def _generate_with_hf(self, description, language, max_length):
+        """Call the CodeGen endpoint (falls back to templates)"""
         try:
             # Create prompt
             prompt = f"# {description}\n# Language: {language}\n"
             
-            headers = {"Authorization": f"Bearer {self.REMOVED_HF_TOKEN}"}
             payload = {
                 "inputs": prompt,
                 "parameters": {
@@ -37,22 +45,18 @@ class CodeGenerator:
                     "temperature": 0.7,
                     "top_p": 0.95,
                     "return_full_text": False
-                },
-                "options": {"wait_for_model": True}
+                }
             }
             
-            response = requests.post(self.api_url, headers=headers, json=payload, timeout=30)
-            
-            if response.status_code == 200:
-                result = response.json()
-                if isinstance(result, list) and len(result) > 0:
-                    code = result[0].get('generated_text', '')
-                    return {
-                        'success': True,
-                        'code': code,
-                        'language': language,
-                        'method': 'ai_generated'
-                    }
+            result = get_client().infer(self.model, payload, self.REMOVED_HF_TOKEN)
+            if isinstance(result, list) and len(result) > 0:
+                code = result[0].get('generated_text', '')
+                return {
+                    'success': True,
+                    'code': code,
+                    'language': language,
+                    'method': 'ai_generated'
+                }
             
             # Fallback
             return self._template_based_generation(description, language)
@@ -8,21 +8,60 @@ import sqlite3
 import os
 import json
 from datetime import datetime, timedelta
+from db_pool import ConnectionPool, resolve_profile, apply_pragmas, read_pragmas, managed
 
 def get_ist_now():
     """Get current time in Indian Standard Time (UTC+5:30)"""
     return datetime.utcnow() + timedelta(hours=5, minutes=30)
 
 class ContactDatabase:
-    def __init__(self, db_path='contacts.db'):
+    def __init__(self, db_path='contacts.db', use_pool=True, profile='performance'):
         """Initialize the contact database"""
         self.db_path = db_path
+        self.profile = profile
+        self.pragmas = resolve_profile(profile)
+        self.pool = ConnectionPool(db_path, on_connect=self._configure_connection) if use_pool else None
         self.create_tables()
         self.populate_default_contacts()
     
+    def _configure_connection(self, conn):
+        """Apply the performance profile to a new connection"""
+        apply_pragmas(conn, self.pragmas)
+    
+    def get_connection(self):
+        """Get a connection (this thread's pooled connection when pooling is on)"""
+        if self.pool:
+            return self.pool.get_connection()
+        conn = sqlite3.connect(self.db_path)
+        self._configure_connection(conn)
+        return conn
+    
+    def connection(self):
+        """Context manager for a connection that is released (and rolled back) even on error"""
+        return managed(self.get_connection())
+    
+    def get_pragmas(self):
+        """Get the configured profile and the pragmas actually in effect"""
+        conn = self.get_connection()
+        effective = read_pragmas(conn)
+        conn.close()
+        
+        return {
+            'database': self.db_path,
+            'profile': self.profile if isinstance(self.profile, str) else 'custom',
+            'configured': self.pragmas,
+            'effective': effective,
+            'pool': self.pool.get_stats() if self.pool else None
+        }
+    
+    def close(self):
+        """Close all pooled connections (call at shutdown)"""
+        if self.pool:
+            self.pool.close_all()
+    
     def create_tables(self):
         """Create the contacts table if it doesn't exist"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.get_connection()
         cursor = conn.cursor()
         
         # Create contacts table
@@ -47,7 +86,7 @@ class ContactDatabase:
     
     def populate_default_contacts(self):
         """Populate database with default contacts if empty"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.get_connection()
         cursor = conn.cursor()
         
         # Check if database is empty
@@ -97,28 +136,25 @@ class ContactDatabase:
     
     def add_contact(self, name, phone_number, variations=None):
         """Add a new contact to the database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         # Convert variations list to JSON string
         variations_json = json.dumps(variations) if variations else json.dumps([])
         
         timestamp = get_ist_now()
         
-        cursor.execute('''
-            INSERT INTO contacts (name, phone_number, variations, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (name, phone_number, variations_json, timestamp, timestamp))
-        
-        conn.commit()
-        contact_id = cursor.lastrowid
-        conn.close()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO contacts (name, phone_number, variations, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (name, phone_number, variations_json, timestamp, timestamp))
+            conn.commit()
+            contact_id = cursor.lastrowid
         
         return contact_id
     
     def get_contact_by_name(self, search_name):
         """Get contact by name or variation"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.get_connection()
         cursor = conn.cursor()
         
         # Get all contacts
@@ -144,42 +180,37 @@ class ContactDatabase:
     
     def update_contact(self, name, phone_number=None, variations=None):
         """Update an existing contact"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         timestamp = get_ist_now()
         
-        if phone_number:
-            cursor.execute('''
-                UPDATE contacts 
-                SET phone_number = ?, updated_at = ?
-                WHERE name = ?
-            ''', (phone_number, timestamp, name))
-        
-        if variations:
-            variations_json = json.dumps(variations)
-            cursor.execute('''
-                UPDATE contacts 
-                SET variations = ?, updated_at = ?
-                WHERE name = ?
-            ''', (variations_json, timestamp, name))
-        
-        conn.commit()
-        conn.close()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            if phone_number:
+                cursor.execute('''
+                    UPDATE contacts 
+                    SET phone_number = ?, updated_at = ?
+                    WHERE name = ?
+                ''', (phone_number, timestamp, name))
+            
+            if variations:
+                variations_json = json.dumps(variations)
+                cursor.execute('''
+                    UPDATE contacts 
+                    SET variations = ?, updated_at = ?
+                    WHERE name = ?
+                ''', (variations_json, timestamp, name))
+            
+            conn.commit()
     
     def delete_contact(self, name):
         """Delete a contact from the database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('DELETE FROM contacts WHERE name = ?', (name,))
-        
-        conn.commit()
-        conn.close()
+        with self.connection() as conn:
+            conn.execute('DELETE FROM contacts WHERE name = ?', (name,))
+            conn.commit()
     
     def list_all_contacts(self):
         """List all contacts in the database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.get_connection()
         cursor = conn.cursor()
         
         cursor.execute('SELECT name, phone_number, variations FROM contacts ORDER BY name')
@@ -199,7 +230,7 @@ class ContactDatabase:
     
     def search_contacts(self, query):
         """Search contacts by name or variation"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.get_connection()
         cursor = conn.cursor()
         
         cursor.execute('SELECT name, phone_number, variations FROM contacts')
@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""
+SQLite Connection Pool for Axon AI
+Keeps one long-lived connection per worker thread and reuses it across requests,
+and applies a performance profile (WAL, synchronous, cache pragmas) to each one
+"""
+
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Pragmas applied to every connection, keyed by profile name.
+# Order matters: busy_timeout first so the journal_mode switch can wait on locks.
+PERFORMANCE_PROFILES = {
+    # SQLite defaults - rollback journal, fully synchronous
+    'safe': {
+        'busy_timeout': 5000,
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+    },
+    # WAL lets readers run while add_chat_message commits
+    'performance': {
+        'busy_timeout': 5000,
+        'auto_vacuum': 'INCREMENTAL',  # only takes effect on new (or VACUUMed) files
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,        # KiB (negative = size, not pages)
+        'mmap_size': 134217728,      # 128 MiB
+        'temp_store': 'MEMORY',
+    },
+}
+
+REPORTED_PRAGMAS = ['journal_mode', 'synchronous', 'cache_size', 'mmap_size', 'temp_store', 'busy_timeout',
+                    'auto_vacuum']
+
+PRAGMA_VALUES = {
+    'journal_mode': {'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'},
+    'synchronous': {'OFF', 'NORMAL', 'FULL', 'EXTRA'},
+    'temp_store': {'DEFAULT', 'FILE', 'MEMORY'},
+    'auto_vacuum': {'NONE', 'FULL', 'INCREMENTAL'},
+}
+
+SYNCHRONOUS_NAMES = {0: 'OFF', 1: 'NORMAL', 2: 'FULL', 3: 'EXTRA'}
+TEMP_STORE_NAMES = {0: 'DEFAULT', 1: 'FILE', 2: 'MEMORY'}
+AUTO_VACUUM_NAMES = {0: 'NONE', 1: 'FULL', 2: 'INCREMENTAL'}
+
+
+def resolve_profile(profile):
+    """
+    Resolve a performance profile to a dict of pragmas
+
+    Args:
+        profile: Profile name from PERFORMANCE_PROFILES, a dict of pragma
+            overrides (optionally with a 'base' profile name), or None
+    """
+    if profile is None:
+        return {}
+    if isinstance(profile, str):
+        if profile not in PERFORMANCE_PROFILES:
+            raise ValueError(f"Unknown database profile: {profile}")
+        return dict(PERFORMANCE_PROFILES[profile])
+
+    overrides = dict(profile)
+    pragmas = resolve_profile(overrides.pop('base', None))
+    pragmas.update(overrides)
+    return pragmas
+
+
+def apply_pragmas(conn, pragmas):
+    """Apply a dict of pragmas to a connection"""
+    for name, value in pragmas.items():
+        if name in PRAGMA_VALUES:
+            value = str(value).upper()
+            if value not in PRAGMA_VALUES[name]:
+                raise ValueError(f"Invalid value for PRAGMA {name}: {value}")
+        elif name in REPORTED_PRAGMAS:
+            value = int(value)
+        else:
+            raise ValueError(f"Unsupported PRAGMA: {name}")
+        conn.execute(f'PRAGMA {name} = {value}').fetchall()
+
+
+def read_pragmas(conn):
+    """Read the pragmas currently in effect on a connection"""
+    result = {}
+    for name in REPORTED_PRAGMAS:
+        value = conn.execute(f'PRAGMA {name}').fetchone()[0]
+        if name == 'synchronous':
+            value = SYNCHRONOUS_NAMES.get(value, value)
+        elif name == 'temp_store':
+            value = TEMP_STORE_NAMES.get(value, value)
+        elif name == 'auto_vacuum':
+            value = AUTO_VACUUM_NAMES.get(value, value)
+        elif name == 'journal_mode':
+            value = value.upper()
+        result[name] = value
+    return result
+
+
+@contextmanager
+def managed(conn):
+    """
+    Use a checked-out connection and always hand it back
+
+    Rolls back on an exception so a half-done write never stays open (and
+    holds the write lock) on the thread's connection.
+    """
+    try:
+        yield conn
+    except BaseException:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+class PooledConnection:
+    """Wrapper around a pooled connection - close() hands it back to the pool"""
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._conn.__exit__(exc_type, exc_value, traceback)
+
+    def close(self):
+        """Release the connection back to the pool (does not close it)"""
+        if self._conn is not None:
+            self._pool.release(self._conn)
+            self._conn = None
+    
+    def __del__(self):
+        # Safety net for callers that raised before close(): release the
+        # checkout (rolling back its transaction) once the wrapper is dropped
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """Thread-local SQLite connection pool with idle health checks"""
+
+    def __init__(self, db_path, health_check_interval=30.0, on_connect=None):
+        """
+        Args:
+            db_path: Path to the SQLite database file
+            health_check_interval: Seconds a connection may sit idle before it
+                is pinged with SELECT 1 on the next checkout
+            on_connect: Optional callable(conn) run once on every new connection
+        """
+        self.db_path = db_path
+        self.health_check_interval = health_check_interval
+        self.on_connect = on_connect
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = {}  # thread ident -> (thread, connection)
+        self._closed = False
+        self.stats = {
+            'connects': 0,
+            'reuses': 0,
+            'health_check_failures': 0,
+            'stale_rollbacks': 0
+        }
+
+    def _connect(self):
+        """Open a new connection for the current thread"""
+        # Connections never leave their owning thread; check_same_thread is
+        # disabled only so close_all() can close them from the shutdown thread
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        if self.on_connect:
+            self.on_connect(conn)
+
+        current = threading.current_thread()
+        with self._lock:
+            self._prune_dead_threads()
+            self._connections[current.ident] = (current, conn)
+            self.stats['connects'] += 1
+
+        self._local.conn = conn
+        self._local.depth = 0
+        self._local.last_used = time.monotonic()
+        return conn
+
+    def _prune_dead_threads(self):
+        """Close connections owned by threads that have exited (lock held)"""
+        for ident, (thread, conn) in list(self._connections.items()):
+            if not thread.is_alive():
+                del self._connections[ident]
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+
+    def _discard(self, conn):
+        """Drop the current thread's connection"""
+        with self._lock:
+            self._connections.pop(threading.get_ident(), None)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        self._local.conn = None
+
+    def _is_healthy(self, conn):
+        """Ping a connection"""
+        try:
+            conn.execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def get_connection(self):
+        """Check out this thread's connection, opening it on first use"""
+        if self._closed:
+            raise sqlite3.ProgrammingError('Connection pool is closed')
+
+        conn = getattr(self._local, 'conn', None)
+
+        if conn is not None and self._local.depth == 0:
+            idle = time.monotonic() - self._local.last_used
+            if idle > self.health_check_interval and not self._is_healthy(conn):
+                self.stats['health_check_failures'] += 1
+                self._discard(conn)
+                conn = None
+            elif conn.in_transaction:
+                # Left open by a checkout that was never released - never let
+                # this caller's commit() publish someone else's partial writes
+                self.stats['stale_rollbacks'] += 1
+                conn.rollback()
+
+        if conn is None:
+            conn = self._connect()
+        else:
+            self.stats['reuses'] += 1
+
+        self._local.depth += 1
+        return PooledConnection(self, conn)
+
+    def connection(self):
+        """Context manager: check out this thread's connection, released even on error"""
+        return managed(self.get_connection())
+
+    def release(self, conn):
+        """Return a connection; roll back anything left uncommitted"""
+        if getattr(self._local, 'conn', None) is not conn:
+            # Pool was closed or the connection was discarded meanwhile
+            return
+
+        self._local.depth = max(self._local.depth - 1, 0)
+        if self._local.depth == 0:
+            if conn.in_transaction:
+                conn.rollback()
+            self._local.last_used = time.monotonic()
+
+    def close_all(self):
+        """Close every pooled connection (call at shutdown)"""
+        with self._lock:
+            self._closed = True
+            connections = list(self._connections.values())
+            self._connections.clear()
+
+        for thread, conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    def get_stats(self):
+        """Get pool statistics"""
+        with self._lock:
+            open_connections = len(self._connections)
+        return dict(self.stats, open_connections=open_connections)
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming Export Helpers for Axon AI
+Turn batches of database rows into CSV / JSONL byte chunks (optionally gzipped)
+so admin exports use constant memory and start sending immediately
+"""
+
+import csv
+import io
+import json
+import zlib
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+}
+
+
+def _json_default(value):
+    """Serialize values json does not know (e.g. bytes, datetimes)"""
+    return str(value)
+
+
+def stream_csv(columns, batches):
+    """Yield CSV-encoded chunks: a header line, then one chunk per batch of rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(columns)
+    yield buffer.getvalue().encode('utf-8')
+
+    for rows in batches:
+        buffer.seek(0)
+        buffer.truncate(0)
+        writer.writerows(rows)
+        yield buffer.getvalue().encode('utf-8')
+
+
+def stream_jsonl(columns, batches):
+    """Yield JSON Lines chunks, one object per row"""
+    for rows in batches:
+        lines = [json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=_json_default) for row in rows]
+        yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def stream_rows(export_format, columns, batches):
+    """Encode row batches in the requested format ('csv' or 'jsonl')"""
+    if export_format == 'jsonl':
+        return stream_jsonl(columns, batches)
+    return stream_csv(columns, batches)
+
+
+def gzip_stream(chunks, level=6):
+    """Gzip a stream of byte chunks on the fly"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 = gzip container
+    for chunk in chunks:
+        # Sync-flush per batch so the client receives data as each batch is read
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,488 @@
+# -*- coding: utf-8 -*-
+"""
+Arithmetic Expression Engine for Axon AI
+Turns spoken or typed maths ("5 plus 3 times 2", "square root of 16",
+"10 guna 4", "12 ane 8 no saravalo") into a Python expression, checks its
+AST against a whitelist and evaluates it with limits on exponent size,
+result size and evaluation steps. Compiled expressions are cached.
+"""
+
+import ast
+import math
+import re
+from functools import lru_cache
+
+MAX_QUERY_LENGTH = 500      # Longer inputs are not treated as maths
+MAX_TOKENS = 200
+MAX_NUMBER_DIGITS = 1000    # Digits in a single literal
+MAX_RESULT_BITS = 100000    # ~30,000 decimal digits
+MAX_FACTORIAL = 2000
+MAX_ROUND_DIGITS = 100      # round(x, n) needs |n| <= this
+MAX_STEPS = 2000            # AST nodes evaluated per expression
+MAX_DISPLAY_DIGITS = 60     # Longer integers are shown in scientific notation
+
+
+class ExpressionError(ValueError):
+    """The query is maths, but it can't (or mustn't) be evaluated"""
+
+
+# Spoken words and phrases -> operator tokens, matched longest first on whole words.
+# Hindi and Gujarati are listed in both romanised and native script.
+SPOKEN_OPERATORS = {
+    # English
+    'plus': '+', 'add': '+', 'added to': '+', 'and': '+',
+    'minus': '-', 'subtract': '-', 'take away': '-',
+    'times': '*', 'multiplied by': '*', 'multiply by': '*', 'multiply': '*', 'x': '*', 'into': '*',
+    'divided by': '/', 'divide by': '/', 'divide': '/', 'over': '/',
+    'mod': '%', 'modulo': '%',
+    'to the power of': '**', 'to the power': '**', 'raised to the power of': '**', 'raised to': '**',
+    'power of': '**', 'power': '**',
+    'squared': '** 2', 'cubed': '** 3',
+    'percent of': '/ 100 *', 'percent': '/ 100',
+    'open bracket': '(', 'close bracket': ')', 'open parenthesis': '(', 'close parenthesis': ')',
+    # Hindi (romanised / Devanagari)
+    'jod': '+', 'jodo': '+', 'jama': '+', 'जोड़': '+', 'जोड़ो': '+', 'जमा': '+', 'धन': '+',
+    'ghata': '-', 'ghatao': '-', 'घटा': '-', 'घटाओ': '-', 'ऋण': '-',
+    'guna': '*', 'gunaa': '*', 'गुणा': '*',
+    'bhag': '/', 'bhaag': '/', 'भाग': '/',
+    'ki ghat': '**', 'की घात': '**',
+    # Gujarati (romanised / Gujarati script)
+    'vatta': '+', 'વત્તા': '+', 'saravalo': '+', 'સરવાળો': '+',
+    'ochha': '-', 'ઓછા': '-', 'bad': '-', 'બાદ': '-',
+    'gunya': '*', 'ગુણ્યા': '*', 'guno': '*', 'ગુણો': '*',
+    'bhagya': '/', 'ભાગ્યા': '/', 'bhago': '/', 'ભાગો': '/',
+}
+
+# Spoken function names -> function tokens
+SPOKEN_FUNCTIONS = {
+    'square root of': 'sqrt', 'square root': 'sqrt', 'root of': 'sqrt', 'sqrt': 'sqrt',
+    'cube root of': 'cbrt', 'cube root': 'cbrt', 'cbrt': 'cbrt',
+    'log of': 'log', 'log': 'log', 'logarithm of': 'log', 'ln': 'ln', 'natural log of': 'ln',
+    'exp': 'exp', 'abs': 'abs', 'absolute value of': 'abs',
+    'sin': 'sin', 'sine of': 'sin', 'cos': 'cos', 'cosine of': 'cos', 'tan': 'tan', 'tangent of': 'tan',
+    'pow': 'pow', 'round': 'round', 'factorial of': 'factorial', 'factorial': 'factorial',
+    'vargmool': 'sqrt', 'vargmul': 'sqrt', 'वर्गमूल': 'sqrt', 'વર્ગમૂળ': 'sqrt',
+}
+
+CONSTANTS = {'pi': math.pi, 'e': math.e, 'tau': math.tau}
+
+# Binary verb forms whose operand order differs from the infix reading
+_NUM = r'(-?\d+(?:\.\d+)?)'
+VERB_PATTERNS = [
+    (re.compile(rf'\b(?:add|sum of)\s+{_NUM}\s+(?:and|to|with)\s+{_NUM}'), '{0} + {1}'),
+    (re.compile(rf'\bsubtract\s+{_NUM}\s+from\s+{_NUM}'), '{1} - {0}'),
+    (re.compile(rf'\b(?:multiply|product of)\s+{_NUM}\s+(?:and|by|with)\s+{_NUM}'), '{0} * {1}'),
+    (re.compile(rf'\bdivide\s+{_NUM}\s+by\s+{_NUM}'), '{0} / {1}'),
+    (re.compile(rf'{_NUM}\s+(?:aur|और)\s+{_NUM}\s+(?:jodo|jod|जोड़ो|जोड़)'), '{0} + {1}'),
+    (re.compile(rf'{_NUM}\s+(?:mein se|में से)\s+{_NUM}\s+(?:ghatao|ghata|घटाओ|घटा)'), '{0} - {1}'),
+    (re.compile(rf'{_NUM}\s+(?:ane|અને)\s+{_NUM}\s+(?:no|નો)\s+(?:saravalo|સરવાળો)'), '{0} + {1}'),
+    (re.compile(rf'{_NUM}\s+(?:mathi|માંથી)\s+{_NUM}\s+(?:bad|ochha|બાદ|ઓછા)'), '{0} - {1}'),
+    (re.compile(rf'{_NUM}\s+(?:ka|का|nu|નું)\s+(?:vargmool|vargmul|वर्गमूल|વર્ગમૂળ)'), 'sqrt({0})'),
+]
+
+# Numbers (any script's digits), words (including Devanagari/Gujarati marks) or single symbols
+_TOKEN_RE = re.compile(r'(\d+(?:\.\d+)?(?:e[+-]?\d+)?)|((?:[^\W\d_]|[ऀ-૿])+)|(\*\*|[-+*/^%()×÷,!])')
+
+_SYMBOLS = {'^': '**', '×': '*', '÷': '/'}
+_MAX_PHRASE_WORDS = max(len(phrase.split()) for phrase in list(SPOKEN_OPERATORS) + list(SPOKEN_FUNCTIONS))
+
+
+def _to_number(text):
+    """Parse a numeric literal (int when it has no fraction or exponent)"""
+    if re.fullmatch(r'\d+', text):
+        if len(text) > MAX_NUMBER_DIGITS:
+            raise ExpressionError("That number is too large")
+        return int(text)
+    return float(text)
+
+
+def _lex(text):
+    """Split normalised text into ('num' | 'word' | 'sym', value) tokens (unknown characters are dropped)"""
+    tokens = []
+    for match in _TOKEN_RE.finditer(text):
+        number, word, symbol = match.groups()
+        if number is not None:
+            tokens.append(('num', _to_number(number)))
+        elif word is not None:
+            tokens.append(('word', word))
+        elif symbol == '%':
+            # A typed '%' is percent ('10% of 50'); modulo is spelled 'mod' / 'modulo'
+            tokens.append(('pct', symbol))
+        else:
+            tokens.append(('sym', _SYMBOLS.get(symbol, symbol)))
+    return tokens
+
+
+def _translate(tokens):
+    """Map words to operators, functions and constants; drop filler words"""
+    out = []
+    i = 0
+    while i < len(tokens):
+        kind, value = tokens[i]
+        if kind == 'pct':
+            # 'N%' -> N / 100, 'N% of M' -> N / 100 * M
+            out.extend([('sym', '/'), ('num', 100)])
+            i += 1
+            if i < len(tokens) and tokens[i] == ('word', 'of'):
+                out.append(('sym', '*'))
+                i += 1
+            continue
+        if kind != 'word':
+            out.append((kind, value))
+            i += 1
+            continue
+
+        # Longest spoken phrase starting here
+        for size in range(min(_MAX_PHRASE_WORDS, len(tokens) - i), 0, -1):
+            words = tokens[i:i + size]
+            if any(k != 'word' for k, _ in words):
+                continue
+            phrase = ' '.join(v for _, v in words)
+            if phrase in SPOKEN_FUNCTIONS:
+                out.append(('func', SPOKEN_FUNCTIONS[phrase]))
+                break
+            if phrase in SPOKEN_OPERATORS:
+                operator = SPOKEN_OPERATORS[phrase]
+                # 'x' / 'and' / 'into' are only operators between operands
+                if phrase in ('x', 'and', 'into') and not (out and out[-1][0] in ('num', 'const', 'close')):
+                    size = 0
+                    break
+                for part in operator.split():
+                    out.append(('num', int(part)) if part.isdigit() else ('sym', part))
+                break
+        else:
+            size = 0
+
+        if size == 0:
+            if value in CONSTANTS:
+                out.append(('const', value))
+            size = 1
+        i += size
+
+    # Tag brackets, mark symbols that close an operand
+    return [('open', v) if (k, v) == ('sym', '(') else ('close', v) if (k, v) == ('sym', ')') else (k, v)
+            for k, v in out]
+
+
+def _to_source(tokens):
+    """
+    Render tokens as Python source parts, adding the implicit '*' in '2 pi',
+    '3(4 + 5)', '(1 + 2)(3 + 4)'
+
+    Two numbers in a row are not multiplied ('3 apples at 2 each'); the
+    expression then fails to parse and the query is not treated as maths.
+    """
+    parts = []
+    previous = None
+    for kind, value in tokens:
+        if kind in ('num', 'const', 'func', 'open') and previous in ('num', 'const', 'close', '!') \
+                and not (kind == 'num' and previous == 'num'):
+            parts.append('*')
+        parts.append(repr(value) if kind == 'num' else value)
+        previous = value if value == '!' else kind
+    return parts
+
+
+def _bracket_functions(parts):
+    """Give bare function calls brackets: 'sqrt 16 + 9' -> 'sqrt(16) + 9', 'sin - 30' -> 'sin(-30)'"""
+    functions = set(SPOKEN_FUNCTIONS.values())
+
+    def operand(i):
+        """Parse one operand starting at i; returns (parts, next index)"""
+        if i >= len(parts):
+            raise ExpressionError("Missing a number after a function")
+        token = parts[i]
+        if token in ('-', '+'):
+            inner, j = operand(i + 1)
+            return [token] + inner, j
+        if token in functions:
+            if i + 1 < len(parts) and parts[i + 1] == '(':
+                group, j = bracket_group(i + 1)
+                return [token] + group, j
+            inner, j = operand(i + 1)
+            return [token, '('] + inner + [')'], j
+        if token == '(':
+            return bracket_group(i)
+        return [token], i + 1
+
+    def bracket_group(i):
+        """Copy a bracketed group starting at parts[i] == '(' (functions inside are bracketed too)"""
+        out = ['(']
+        j = i + 1
+        while j < len(parts) and parts[j] != ')':
+            inner, j = operand(j) if parts[j] in functions or parts[j] == '(' else ([parts[j]], j + 1)
+            out.extend(inner)
+        if j >= len(parts):
+            raise ExpressionError("Unbalanced brackets")
+        out.append(')')
+        return out, j + 1
+
+    out = []
+    i = 0
+    while i < len(parts):
+        if parts[i] in functions or parts[i] == '(':
+            inner, i = operand(i)
+        else:
+            inner, i = [parts[i]], i + 1
+        out.extend(inner)
+    return out
+
+
+def _postfix_factorials(parts):
+    """Rewrite 'n !' / '( ... ) !' as factorial(n) / factorial(...)"""
+    out = []
+    for token in parts:
+        if token != '!':
+            out.append(token)
+            continue
+        if not out:
+            raise ExpressionError("'!' needs a number before it")
+        if out[-1] == ')':
+            depth = 0
+            for start in range(len(out) - 1, -1, -1):
+                depth += out[start] == ')'
+                depth -= out[start] == '('
+                if depth == 0:
+                    break
+            if start > 0 and out[start - 1] not in ('(', '+', '-', '*', '/', '%', '**'):
+                start -= 1  # Include the function name
+        else:
+            start = len(out) - 1
+        out[start:] = ['factorial', '('] + out[start:] + [')']
+    return out
+
+
+_BIN_OPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod, ast.Pow)
+_UNARY_OPS = (ast.UAdd, ast.USub)
+_ARITY = {'sqrt': (1, 1), 'cbrt': (1, 1), 'log': (1, 2), 'ln': (1, 1), 'exp': (1, 1), 'abs': (1, 1),
+          'sin': (1, 1), 'cos': (1, 1), 'tan': (1, 1), 'pow': (2, 2), 'round': (1, 2), 'factorial': (1, 1)}
+
+
+def _validate(node):
+    """Reject anything but numbers, whitelisted names/functions and arithmetic"""
+    if isinstance(node, ast.Expression):
+        _validate(node.body)
+    elif isinstance(node, ast.Constant):
+        if type(node.value) not in (int, float):
+            raise ExpressionError("Only numbers are allowed")
+    elif isinstance(node, ast.Name):
+        if node.id not in CONSTANTS:
+            raise ExpressionError(f"Unknown name '{node.id}'")
+    elif isinstance(node, ast.BinOp):
+        if not isinstance(node.op, _BIN_OPS):
+            raise ExpressionError("Unsupported operator")
+        _validate(node.left)
+        _validate(node.right)
+    elif isinstance(node, ast.UnaryOp):
+        if not isinstance(node.op, _UNARY_OPS):
+            raise ExpressionError("Unsupported operator")
+        _validate(node.operand)
+    elif isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in _ARITY or node.keywords:
+            raise ExpressionError("Unsupported function")
+        low, high = _ARITY[node.func.id]
+        if not low <= len(node.args) <= high:
+            raise ExpressionError(f"{node.func.id} takes {low} argument{'s' if low > 1 else ''}"
+                                  if low == high else f"{node.func.id} takes {low} or {high} arguments")
+        for arg in node.args:
+            _validate(arg)
+    else:
+        raise ExpressionError("Unsupported expression")
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(query):
+    """
+    Turn a query into a validated expression tree
+
+    Returns:
+        ast.Expression, or None when the query contains no maths or its words
+        and numbers don't form an expression
+
+    Raises:
+        ExpressionError: The query is maths but is malformed or not allowed
+    """
+    if len(query) > MAX_QUERY_LENGTH:
+        return None
+    text = query.lower()
+    for pattern, template in VERB_PATTERNS:
+        text = pattern.sub(lambda m: ' ' + template.format(*m.groups()) + ' ', text)
+
+    tokens = _translate(_lex(text))
+    if len(tokens) > MAX_TOKENS:
+        raise ExpressionError("That expression is too long")
+    if not any(kind in ('num', 'const') for kind, _ in tokens):
+        return None
+    # Leading/trailing operators left over from filler words ("what is 5 + 3 ?")
+    while tokens and tokens[-1][0] == 'sym' and tokens[-1][1] != '!':
+        tokens.pop()
+    while tokens and tokens[0][0] == 'sym' and tokens[0][1] not in ('-', '+'):
+        tokens.pop(0)
+
+    parts = _postfix_factorials(_bracket_functions(_to_source(tokens)))
+    try:
+        tree = ast.parse(' '.join(parts), mode='eval')
+    except SyntaxError:
+        return None
+    except (ValueError, RecursionError):
+        raise ExpressionError("I couldn't make sense of that expression")
+    _validate(tree)
+    return tree
+
+
+class _Evaluator:
+    """Evaluates a validated tree, counting steps and bounding big-number growth"""
+
+    def __init__(self, max_steps=MAX_STEPS):
+        self.steps = 0
+        self.max_steps = max_steps
+
+    def _check_size(self, value):
+        if isinstance(value, int) and value.bit_length() > MAX_RESULT_BITS:
+            raise ExpressionError("The result is too large to calculate")
+        if isinstance(value, float) and math.isinf(value):
+            raise ExpressionError("The result is too large to calculate")
+        return value
+
+    def eval(self, node):
+        self.steps += 1
+        if self.steps > self.max_steps:
+            raise ExpressionError("That expression is too complex")
+
+        if isinstance(node, ast.Expression):
+            return self.eval(node.body)
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Name):
+            return CONSTANTS[node.id]
+        if isinstance(node, ast.UnaryOp):
+            value = self.eval(node.operand)
+            return -value if isinstance(node.op, ast.USub) else value
+        if isinstance(node, ast.BinOp):
+            left, right = self.eval(node.left), self.eval(node.right)
+            try:
+                return self._check_size(self._binary(node.op, left, right))
+            except OverflowError:
+                # e.g. a huge int mixed with a float
+                raise ExpressionError("The result is too large to calculate")
+        return self._check_size(self._call(node.func.id, [self.eval(arg) for arg in node.args]))
+
+    def _binary(self, op, left, right):
+        if isinstance(op, ast.Add):
+            return left + right
+        if isinstance(op, ast.Sub):
+            return left - right
+        if isinstance(op, ast.Mult):
+            if isinstance(left, int) and isinstance(right, int) \
+                    and left.bit_length() + right.bit_length() > MAX_RESULT_BITS:
+                raise ExpressionError("The result is too large to calculate")
+            return left * right
+        if isinstance(op, (ast.Div, ast.Mod)):
+            if right == 0:
+                raise ZeroDivisionError
+            if isinstance(op, ast.Mod):
+                return left % right
+            if isinstance(left, int) and isinstance(right, int) and left % right == 0:
+                return left // right  # Exact division stays an (arbitrarily large) int
+            return left / right
+        return self._power(left, right)
+
+    def _power(self, base, exponent):
+        if isinstance(base, int) and isinstance(exponent, int) and exponent >= 0:
+            if abs(base) > 1 and exponent * (abs(base).bit_length() - 1) > MAX_RESULT_BITS:
+                raise ExpressionError("The result is too large to calculate")
+            return base ** exponent
+        try:
+            result = float(base) ** float(exponent)
+        except OverflowError:
+            raise ExpressionError("The result is too large to calculate")
+        except ZeroDivisionError:
+            raise
+        if isinstance(result, complex):
+            raise ExpressionError("The result isn't a real number")
+        return result
+
+    def _call(self, name, args):
+        try:
+            if name == 'sqrt':
+                if isinstance(args[0], int) and args[0] >= 0:
+                    root = math.isqrt(args[0])
+                    if root * root == args[0]:
+                        return root
+                return math.sqrt(args[0])
+            if name == 'cbrt':
+                return math.copysign(abs(args[0]) ** (1 / 3), args[0])
+            if name == 'log':
+                return math.log(args[0], args[1]) if len(args) == 2 else math.log10(args[0])
+            if name == 'ln':
+                return math.log(args[0])
+            if name == 'exp':
+                return math.exp(args[0])
+            if name == 'abs':
+                return abs(args[0])
+            if name in ('sin', 'cos', 'tan'):
+                # Angles are in degrees, as people say them
+                return getattr(math, name)(math.radians(args[0]))
+            if name == 'pow':
+                return self._power(args[0], args[1])
+            if name == 'round':
+                if len(args) == 1:
+                    return round(args[0])
+                digits = int(args[1])
+                if abs(digits) > MAX_ROUND_DIGITS:
+                    raise ExpressionError(f"round() can keep at most {MAX_ROUND_DIGITS} digits")
+                return round(args[0], digits)
+            # factorial
+            if not isinstance(args[0], int) or args[0] < 0:
+                raise ExpressionError("Factorial needs a whole number that is not negative")
+            if args[0] > MAX_FACTORIAL:
+                raise ExpressionError("The result is too large to calculate")
+            return math.factorial(args[0])
+        except OverflowError:
+            raise ExpressionError("The result is too large to calculate")
+        except ValueError as e:
+            if isinstance(e, ExpressionError):
+                raise
+            raise ExpressionError(f"{name} isn't defined for that value")
+
+
+def evaluate(tree, max_steps=MAX_STEPS):
+    """Evaluate a tree from compile_expression (raises ExpressionError or ZeroDivisionError)"""
+    return _Evaluator(max_steps).eval(tree)
+
+
+def format_number(value):
+    """Render a result for chat: exact ints, huge ints in scientific notation, tidy floats"""
+    if isinstance(value, int):
+        digits = len(str(abs(value))) if value.bit_length() < 4000 else int(value.bit_length() * math.log10(2)) + 1
+        if digits <= MAX_DISPLAY_DIGITS:
+            return str(value)
+        exponent = math.log10(abs(value))
+        mantissa = 10 ** (exponent - math.floor(exponent))
+        return f"≈ {'-' if value < 0 else ''}{mantissa:.6f}e+{math.floor(exponent)} ({digits} digits)"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return f"{value:.12g}"
+
+
+def format_expression(tree):
+    """Render a compiled tree the way it was understood"""
+    return (ast.unparse(tree).replace(' ** ', '^').replace(' * ', ' × ').replace(' / ', ' ÷ '))
+
+
+def calculate(query):
+    """
+    Evaluate the maths in a query
+
+    Returns:
+        (expression, result) strings, or None when the query contains no maths
+        (or none that parses)
+
+    Raises:
+        ExpressionError: Malformed, disallowed or too expensive expression
+        ZeroDivisionError: Division by zero
+    """
+    tree = compile_expression(query)
+    if tree is None:
+        return None
+    return format_expression(tree), format_number(evaluate(tree))
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Handler Executor for Axon AI
+Runs blocking command handlers (Wikipedia, Hugging Face, psutil, ...) on a
+bounded thread pool with a per-intent deadline, so a slow upstream costs a
+fallback reply instead of a request thread
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+
+class HandlerExecutor:
+    """Bounded executor with deadlines, fallbacks and saturation metrics"""
+
+    def __init__(self, max_workers=8, max_queue=16):
+        """
+        Args:
+            max_workers: Handler threads
+            max_queue: Handlers allowed to wait for a thread; beyond
+                max_workers + max_queue new work is refused immediately
+        """
+        self.max_workers = max_workers
+        self.capacity = max_workers + max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='axon-handler')
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.stats = {}  # intent name -> counters
+
+    def _counters(self, name):
+        """Get a handler's counters (lock held)"""
+        counters = self.stats.get(name)
+        if counters is None:
+            counters = self.stats[name] = {
+                'calls': 0,
+                'completed': 0,
+                'timeouts': 0,
+                'rejected': 0,
+                'errors': 0,
+                'total_ms': 0.0,
+                'max_ms': 0.0
+            }
+        return counters
+
+    def _finished(self, name, start, future):
+        """Release a slot and record latency when a handler returns (even after its deadline)"""
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self.in_flight -= 1
+            counters = self._counters(name)
+            if future.exception() is not None:
+                counters['errors'] += 1
+            else:
+                counters['completed'] += 1
+            counters['total_ms'] += elapsed_ms
+            if elapsed_ms > counters['max_ms']:
+                counters['max_ms'] = elapsed_ms
+        self._slots.release()
+
+    def submit(self, name, fn, args):
+        """
+        Start fn(*args) on the pool without waiting for it
+
+        Returns:
+            A Future, or None if the pool is saturated
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                counters = self._counters(name)
+                counters['calls'] += 1
+                counters['rejected'] += 1
+            return None
+
+        with self._lock:
+            self._counters(name)['calls'] += 1
+            self.in_flight += 1
+            if self.in_flight > self.max_in_flight:
+                self.max_in_flight = self.in_flight
+
+        start = time.perf_counter()
+        future = self._pool.submit(fn, *args)
+        future.add_done_callback(lambda f: self._finished(name, start, f))
+        return future
+
+    def run(self, name, fn, args, deadline, fallback):
+        """
+        Run fn(*args) and wait at most deadline seconds for it
+
+        Returns:
+            The handler's result, or fallback if the pool is saturated or the
+            deadline passes (the handler keeps its slot until it finishes)
+
+        Raises:
+            Whatever the handler raised before its deadline
+        """
+        future = self.submit(name, fn, args)
+        if future is None:
+            return fallback
+
+        try:
+            return future.result(timeout=deadline)
+        except FutureTimeoutError:
+            with self._lock:
+                self._counters(name)['timeouts'] += 1
+            return fallback
+
+    def shutdown(self):
+        """Stop accepting work (running handlers are not interrupted)"""
+        self._pool.shutdown(wait=False)
+
+    def get_stats(self):
+        """Get pool saturation and per-handler metrics"""
+        with self._lock:
+            handlers = {}
+            for name, counters in self.stats.items():
+                finished = counters['completed'] + counters['errors']
+                handler = dict(counters, avg_ms=round(counters['total_ms'] / finished, 1) if finished else 0.0)
+                handler['max_ms'] = round(handler['max_ms'], 1)
+                del handler['total_ms']
+                handlers[name] = handler
+            return {
+                'max_workers': self.max_workers,
+                'capacity': self.capacity,
+                'in_flight': self.in_flight,
+                'max_in_flight': self.max_in_flight,
+                'utilization': round(self.in_flight / self.capacity, 3),
+                'rejected': sum(c['rejected'] for c in self.stats.values()),
+                'timeouts': sum(c['timeouts'] for c in self.stats.values()),
+                'handlers': handlers
+            }
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+Hugging Face Inference Client for Axon AI
+One pooled requests.Session shared by every model call, with separate
+connect/read timeouts, jittered retries while a model is loading (503) and a
+per-model circuit breaker so callers fall back to local answers immediately
+while an endpoint is unhealthy
+
+Set HF_API_BASE to point the client at a local stub server (see hf_stub_server.py)
+"""
+
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+HF_API_BASE = os.environ.get('HF_API_BASE', 'https://api-inference.huggingface.co')
+
+
+class HFError(Exception):
+    """Inference call failed; callers should use their local fallback"""
+
+
+class CircuitOpenError(HFError):
+    """Endpoint is marked unhealthy; the call was not attempted"""
+
+
+class CircuitBreaker:
+    """Closed -> open after N consecutive failures -> half-open after a cool-down"""
+
+    def __init__(self, failure_threshold=3, reset_timeout=30.0):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before one trial call is let through
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Check whether a call may go out"""
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open' and time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Let a single trial call through
+                self.state = 'half_open'
+                return True
+            return False
+
+    def record_success(self):
+        """Close the circuit"""
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+
+    def record_failure(self):
+        """Count a failure; opens the circuit at the threshold or after a failed trial call"""
+        with self._lock:
+            self.failures += 1
+            if self.state == 'half_open' or self.failures >= self.failure_threshold:
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+
+
+class HFClient:
+    """Pooled, retrying, circuit-breaking client for the Inference API"""
+
+    def __init__(self, base_url=None, connect_timeout=3.05, read_timeout=20.0, max_retries=2,
+                 backoff=1.0, max_backoff=8.0, failure_threshold=3, reset_timeout=30.0, pool_size=20):
+        """
+        Args:
+            base_url: API root (defaults to HF_API_BASE)
+            connect_timeout: Seconds to establish a connection
+            read_timeout: Seconds to wait for the response
+            max_retries: Extra attempts after a 503 (model loading), connection error or
+                connect timeout (read timeouts are not retried)
+            backoff: Base delay for retries; doubles per attempt, randomised (full jitter)
+            max_backoff: Upper bound for a single retry delay
+            failure_threshold: Consecutive failures before a model's circuit opens
+            reset_timeout: Seconds before an open circuit allows a trial call
+            pool_size: Keep-alive connections kept per host
+        """
+        self.base_url = (base_url or HF_API_BASE).rstrip('/')
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._breakers = {}  # model -> CircuitBreaker
+        self._lock = threading.Lock()
+        self.stats = {}      # model -> counters
+
+    def _model_state(self, model):
+        """Get (and create on first use) a model's breaker and counters"""
+        with self._lock:
+            breaker = self._breakers.get(model)
+            if breaker is None:
+                breaker = self._breakers[model] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                self.stats[model] = {
+                    'requests': 0,
+                    'successes': 0,
+                    'failures': 0,
+                    'retries': 0,
+                    'short_circuited': 0
+                }
+            return breaker, self.stats[model]
+
+    def _count(self, counters, key):
+        """Increment a model counter"""
+        with self._lock:
+            counters[key] += 1
+
+    def _retry_delay(self, attempt, response=None):
+        """Jittered exponential backoff, capped by the model's estimated load time"""
+        delay = min(self.backoff * (2 ** attempt), self.max_backoff)
+        if response is not None:
+            try:
+                estimated = float(response.json().get('estimated_time', delay))
+                delay = min(delay, max(estimated, 0.1))
+            except (ValueError, AttributeError):
+                pass
+        return random.uniform(0, delay)
+
+    def infer(self, model, payload, token):
+        """
+        Run an inference request
+
+        Args:
+            model: Model id, e.g. 'facebook/bart-large-cnn'
+            payload: JSON body ('inputs', 'parameters', ...)
+            token: Hugging Face API token
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            CircuitOpenError: The model's circuit is open (nothing was sent)
+            HFError: The call failed after retries
+        """
+        breaker, counters = self._model_state(model)
+        if not breaker.allow():
+            self._count(counters, 'short_circuited')
+            raise CircuitOpenError(f"{model} is unavailable, using fallback")
+
+        url = f"{self.base_url}/models/{model}"
+        headers = {"Authorization": f"Bearer {token}"}
+
+        error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._count(counters, 'retries')
+            self._count(counters, 'requests')
+            try:
+                response = self.session.post(url, headers=headers, json=payload, timeout=self.timeout)
+            except requests.RequestException as e:
+                error = HFError(f"{model} request failed: {e}")
+                if isinstance(e, requests.ReadTimeout):
+                    # A read timeout already held the thread for the full budget; a
+                    # connect timeout (ConnectTimeout) is short and retried like other connection errors
+                    break
+                if attempt < self.max_retries:
+                    time.sleep(self._retry_delay(attempt))
+                continue
+
+            if response.status_code == 200:
+                try:
+                    result = response.json()
+                except ValueError:
+                    error = HFError(f"{model} returned invalid JSON")
+                    break
+                breaker.record_success()
+                self._count(counters, 'successes')
+                return result
+
+            if response.status_code == 503 and attempt < self.max_retries:
+                # Model loading - wait a little instead of pinning the thread with wait_for_model
+                time.sleep(self._retry_delay(attempt, response))
+                error = HFError(f"{model} is loading")
+                continue
+
+            if 400 <= response.status_code < 500 and response.status_code != 429:
+                # Bad request or token - the endpoint itself is healthy
+                breaker.record_success()
+                raise HFError(f"{model} rejected the request (HTTP {response.status_code})")
+
+            error = HFError(f"{model} returned HTTP {response.status_code}")
+            break
+
+        breaker.record_failure()
+        self._count(counters, 'failures')
+        raise error
+
+    def get_stats(self):
+        """Get per-model counters and circuit state"""
+        with self._lock:
+            models = list(self._breakers.items())
+            stats = {model: dict(self.stats[model]) for model, _ in models}
+        for model, breaker in models:
+            stats[model]['circuit'] = breaker.state
+        return stats
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Get the process-wide HFClient"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HFClient()
+        return _client
+
+
+def get_stats():
+    """Get stats of the shared client ({} until the first call)"""
+    return _client.get_stats() if _client is not None else {}
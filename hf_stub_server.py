@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Hugging Face Inference API Stub for Axon AI
+A local stand-in for api-inference.huggingface.co so the HF client's retries
+and circuit breaker can be exercised offline
+
+Usage:
+    python hf_stub_server.py --port 8765 --loading 2 --latency 0.2
+    HF_API_BASE=http://127.0.0.1:8765 python app.py
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubState:
+    """Behaviour shared by all request handlers"""
+
+    def __init__(self, loading=0, fail=False, latency=0.0):
+        self.loading = loading    # 503 responses per model before it is "loaded"
+        self.fail = fail          # Always answer 500
+        self.latency = latency    # Seconds to sleep before answering
+        self.requests = {}        # model -> requests received
+        self.lock = threading.Lock()
+
+
+def make_handler(state):
+    """Build a request handler class bound to a StubState"""
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive, like the real API
+
+        def _send(self, status, body):
+            data = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            payload = json.loads(self.rfile.read(length) or b'{}')
+
+            if not self.path.startswith('/models/'):
+                self._send(404, {'error': 'Not found'})
+                return
+            model = self.path[len('/models/'):]
+
+            with state.lock:
+                count = state.requests[model] = state.requests.get(model, 0) + 1
+
+            if state.latency:
+                time.sleep(state.latency)
+            if state.fail:
+                self._send(500, {'error': 'Internal error'})
+                return
+            if count <= state.loading:
+                self._send(503, {'error': f'Model {model} is currently loading', 'estimated_time': 0.5})
+                return
+
+            text = str(payload.get('inputs', ''))
+            if 'bart' in model:
+                self._send(200, [{'summary_text': ' '.join(text.split()[:30])}])
+            else:
+                self._send(200, [{'generated_text': f"Assistant: stub reply from {model}"}])
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def start_stub_server(port=0, **behaviour):
+    """Start the stub on a background thread; returns (server, base_url)"""
+    state = StubState(**behaviour)
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(state))
+    server.state = state
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local Hugging Face Inference API stub')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on')
+    parser.add_argument('--loading', type=int, default=0, help='503 responses per model before it loads')
+    parser.add_argument('--fail', action='store_true', help='Answer every request with HTTP 500')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds to wait before answering')
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(args.port, loading=args.loading, fail=args.fail, latency=args.latency)
+    print(f"Hugging Face stub listening on {base_url} (set HF_API_BASE={base_url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
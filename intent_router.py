@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Intent Router for Axon AI
+Compiles a declarative intent table into one combined regex that finds every
+keyword in a single pass over the message, then picks the winning intent by
+table order (earlier entries win)
+"""
+
+import re
+
+
+class IntentRouter:
+    """Matches messages against an intent table in one pass"""
+
+    def __init__(self, intents):
+        """
+        Args:
+            intents: List of intent dicts, highest priority first. Keys:
+                name: Intent name
+                any: Keywords - matching any one (as a substring) triggers the intent
+                any_words: Like 'any', but the keyword must be a whole word
+                all: List of keyword groups; each group must also have a match
+                none: Keywords that must not appear
+                Any other keys (e.g. 'requires_ai_modules') are passed through
+        """
+        self.intents = list(intents)
+
+        keywords = set()
+        self._candidates = {}        # substring keyword -> intent indices
+        self._word_candidates = {}   # whole-word keyword -> intent indices
+        for index, intent in enumerate(self.intents):
+            if not intent.get('any') and not intent.get('any_words'):
+                raise ValueError(f"Intent {intent.get('name')} has no trigger keywords")
+            for keyword in intent.get('any', ()):
+                self._candidates.setdefault(keyword, []).append(index)
+            for keyword in intent.get('any_words', ()):
+                self._word_candidates.setdefault(keyword, []).append(index)
+            keywords.update(intent.get('any', ()))
+            keywords.update(intent.get('any_words', ()))
+            for group in intent.get('all', ()):
+                keywords.update(group)
+            keywords.update(intent.get('none', ()))
+
+        # The combined pattern reports the longest keyword starting at each
+        # position; shorter keywords that are prefixes of it match there too
+        self._prefixes = {
+            keyword: [other for other in keywords if keyword.startswith(other)]
+            for keyword in keywords
+        }
+        self._pattern = re.compile('(?=(' + _trie_pattern(_build_trie(keywords)) + '))')
+
+    def scan(self, query):
+        """
+        Find every keyword in a (lowercased) query
+
+        Returns:
+            (found, found_words): keywords present as substrings, and those
+            present as whole words
+        """
+        found = set()
+        found_words = set()
+        length = len(query)
+        for match in self._pattern.finditer(query):
+            start = match.start()
+            whole_start = start == 0 or not query[start - 1].isalnum()
+            for keyword in self._prefixes[match.group(1)]:
+                found.add(keyword)
+                end = start + len(keyword)
+                if whole_start and (end == length or not query[end].isalnum()):
+                    found_words.add(keyword)
+        return found, found_words
+
+    def _accepts(self, intent, found):
+        """Check the 'all' and 'none' conditions of a triggered intent"""
+        for group in intent.get('all', ()):
+            if not any(keyword in found for keyword in group):
+                return False
+        return not any(keyword in found for keyword in intent.get('none', ()))
+
+    def _triggered(self, query):
+        """Scan a query; returns (indices of triggered intents in priority order, found keywords)"""
+        found, found_words = self.scan(query)
+
+        triggered = set()
+        for keyword in found:
+            triggered.update(self._candidates.get(keyword, ()))
+        for keyword in found_words:
+            triggered.update(self._word_candidates.get(keyword, ()))
+        return sorted(triggered), found
+
+    def matches(self, query):
+        """Get every intent matching a query, highest priority first"""
+        triggered, found = self._triggered(query)
+        return [self.intents[index] for index in triggered
+                if self._accepts(self.intents[index], found)]
+
+    def route(self, query, is_enabled=None):
+        """
+        Get the highest priority intent for a query, or None
+
+        Args:
+            query: Lowercased message
+            is_enabled: Optional callable(intent) -> bool; disabled intents are skipped
+        """
+        triggered, found = self._triggered(query)
+        for index in triggered:
+            intent = self.intents[index]
+            if self._accepts(intent, found) and (is_enabled is None or is_enabled(intent)):
+                return intent
+        return None
+
+
+def _build_trie(keywords):
+    """Build a character trie; '' marks the end of a keyword"""
+    root = {}
+    for keyword in keywords:
+        node = root
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True
+    return root
+
+
+def _trie_pattern(node):
+    """Turn a trie into a regex that matches the longest keyword it contains"""
+    branches = [re.escape(char) + _trie_pattern(child)
+                for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        # A keyword ends here - longer keywords are optional (greedy, so longest wins)
+        return '(?:' + body + ')?'
+    return body
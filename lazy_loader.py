@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""
+Lazy Imports and Warm-up for Axon AI
+Heavy optional modules (TextBlob/NLTK, Wikipedia, NumPy, the AI modules) are
+bound as LazyModule proxies and imported on first attribute access, so a
+worker can serve logins before they are loaded. A WarmUp thread can preload
+them in the background once the worker is up, and every load is timed.
+
+The CLI profiles imports in a fresh interpreter (python -X importtime) and
+measures cold start to first response:
+    python lazy_loader.py
+    python lazy_loader.py ai_integration advanced_ai --top 15
+    python lazy_loader.py --first-response
+"""
+
+import argparse
+import importlib
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_registry = {}  # module name -> LazyModule
+_registry_lock = threading.Lock()
+
+
+def module_available(name):
+    """Whether a module can be found, without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyModule:
+    """Stand-in for a module that imports it on first attribute access"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+        self.load_ms = None
+        self.loaded_by = None
+
+    def _load(self):
+        module = self._module
+        if module is None:
+            with self._lock:
+                if self._module is None:
+                    start = time.perf_counter()
+                    self._module = importlib.import_module(self._name)
+                    self.load_ms = round((time.perf_counter() - start) * 1000, 1)
+                    self.loaded_by = threading.current_thread().name
+                module = self._module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def __repr__(self):
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name):
+    """Get the shared lazy proxy for a module (nothing is imported yet)"""
+    with _registry_lock:
+        proxy = _registry.get(name)
+        if proxy is None:
+            proxy = _registry[name] = LazyModule(name)
+        return proxy
+
+
+def preload(name):
+    """Import a lazily bound module now (used by warm-up); returns the real module"""
+    return lazy_import(name)._load()
+
+
+def get_load_stats():
+    """Which lazy modules are loaded, how long each import took and which thread paid for it"""
+    with _registry_lock:
+        proxies = dict(_registry)
+    return {name: {'loaded': proxy.loaded, 'load_ms': proxy.load_ms, 'loaded_by': proxy.loaded_by}
+            for name, proxy in sorted(proxies.items())}
+
+
+class WarmUp:
+    """Background thread that runs preload tasks once, after an optional delay"""
+
+    def __init__(self, tasks, delay=2.0):
+        """
+        Args:
+            tasks: List of (name, callable) run in order
+            delay: Seconds to wait first, so the worker is already serving
+        """
+        self.tasks = tasks
+        self.delay = delay
+
+        self._stop = threading.Event()
+        self._thread = None
+        self.results = {}  # task name -> {'ms', 'error'}
+        self.finished = False
+
+    def start(self):
+        """Start the warm-up thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='axon-warm-up', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Skip the remaining tasks (the one in progress finishes)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        if self._stop.wait(self.delay):
+            return
+        start = time.perf_counter()
+        for name, task in self.tasks:
+            if self._stop.is_set():
+                return
+            task_start = time.perf_counter()
+            error = None
+            try:
+                task()
+            except Exception as e:
+                error = str(e)
+                print(f"[WARNING] Warm-up of {name} failed: {e}")
+            self.results[name] = {'ms': round((time.perf_counter() - task_start) * 1000, 1), 'error': error}
+        self.finished = True
+        print(f"[OK] Warm-up finished in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    def get_stats(self):
+        """Get warm-up progress, per-task timings and lazy import state"""
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'finished': self.finished,
+            'tasks': dict(self.results),
+            'modules': get_load_stats()
+        }
+
+
+def profile_imports(module):
+    """
+    Import a module in a fresh interpreter under -X importtime
+
+    Returns:
+        List of (self_us, cumulative_us, depth, name) in import order
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=REPO_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'import failed')
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Header line
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(fields[0]), int(fields[1]), depth, name.strip()))
+    return rows
+
+
+_FIRST_RESPONSE_SCRIPT = '''
+import json, time
+start = time.perf_counter()
+import ai_integration
+imported = time.perf_counter()
+bridge = ai_integration.AIBridge()
+ready = time.perf_counter()
+bridge.process_command('hello')
+greeted = time.perf_counter()
+bridge.process_command('analyze sentiment I love this app')
+analyzed = time.perf_counter()
+bridge.handler_executor.shutdown()
+print(json.dumps({'import_ms': (imported - start) * 1000, 'init_ms': (ready - imported) * 1000,
+                  'first_response_ms': (greeted - ready) * 1000,
+                  'first_ai_response_ms': (analyzed - greeted) * 1000}))
+'''
+
+
+def measure_first_response():
+    """Cold start in a fresh interpreter: import, AIBridge(), first reply, first AI-module reply (ms)"""
+    result = subprocess.run([sys.executable, '-c', _FIRST_RESPONSE_SCRIPT], cwd=REPO_DIR,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'run failed')
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def print_profile(module, rows, top):
+    """Print an import profile: totals, direct imports by cumulative time and top modules by self time"""
+    if not rows:
+        print(f"{module}: already imported by the interpreter")
+        return
+    total = next((cumulative for _, cumulative, depth, name in rows if depth == 0 and name == module),
+                 rows[-1][1])
+    print("=" * 60)
+    print(f"import {module}: {total / 1000:.1f} ms, {len(rows)} modules")
+    print("=" * 60)
+
+    print(f"\n{'direct imports':<40}{'cumulative ms':>16}")
+    direct = [row for row in rows if row[2] == 1]
+    for _, cumulative, _, name in sorted(direct, key=lambda row: -row[1])[:top]:
+        print(f"{name:<40}{cumulative / 1000:>16.1f}")
+
+    print(f"\n{'slowest modules':<40}{'self ms':>16}")
+    for self_us, _, _, name in sorted(rows, key=lambda row: -row[0])[:top]:
+        print(f"{name:<40}{self_us / 1000:>16.1f}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Profile Axon import times and cold start')
+    parser.add_argument('modules', nargs='*', default=['ai_integration'], help='Modules to profile')
+    parser.add_argument('--top', type=int, default=10, help='Rows per table')
+    parser.add_argument('--first-response', action='store_true',
+                        help='Also time import -> AIBridge() -> first replies in a fresh interpreter')
+    parser.add_argument('--json', action='store_true', help='Print raw results as JSON')
+    args = parser.parse_args()
+
+    report = {}
+    for module in args.modules:
+        try:
+            report[module] = profile_imports(module)
+        except RuntimeError as e:
+            print(f"[ERROR] Could not import {module}: {e}")
+            sys.exit(1)
+    first_response = measure_first_response() if args.first_response else None
+
+    if args.json:
+        print(json.dumps({
+            'imports': {module: [{'self_us': s, 'cumulative_us': c, 'depth': d, 'module': n}
+                                 for s, c, d, n in rows] for module, rows in report.items()},
+            'first_response': first_response
+        }, indent=2))
+        return
+
+    for module, rows in report.items():
+        print_profile(module, rows, args.top)
+    if first_response:
+        print("Cold start (ms): " + ', '.join(f"{key[:-3]} {value:.1f}" for key, value in first_response.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Database Maintenance Worker for Axon AI
+Periodically removes expired sessions, applies retention policies from
+system_settings and keeps the database compact and its statistics fresh
+"""
+
+import threading
+import time
+from datetime import timedelta
+
+from web_database import get_ist_now
+
+# system_settings keys -> table they prune (value = days to keep; empty/0 = forever)
+RETENTION_SETTINGS = {
+    'retention_days_chat_history': 'chat_history',
+    'retention_days_activity_logs': 'activity_logs',
+}
+
+
+class MaintenanceWorker:
+    """Background thread that runs small, batched maintenance jobs"""
+
+    def __init__(self, db, interval=900, batch_size=500, batch_pause=0.05,
+                 vacuum_pages=1000, analyze_every=24):
+        """
+        Args:
+            db: WebDatabase instance
+            interval: Seconds between maintenance runs
+            batch_size: Rows deleted per transaction, so the write lock is
+                only ever held for a few milliseconds
+            batch_pause: Seconds to sleep between batches, letting chat writes in
+            vacuum_pages: Free pages returned to the OS per run (incremental vacuum)
+            analyze_every: Run ANALYZE on every Nth maintenance run
+        """
+        self.db = db
+        self.interval = interval
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.vacuum_pages = vacuum_pages
+        self.analyze_every = analyze_every
+
+        self._stop = threading.Event()
+        self._run_lock = threading.Lock()
+        self._thread = None
+        self.runs = 0
+        self.last_run = None
+
+    def start(self):
+        """Start the background thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='axon-maintenance', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background thread (waits for a run in progress)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"[WARNING] Database maintenance failed: {e}")
+
+    def _delete_in_batches(self, table, where, params):
+        """Delete matching rows batch_size at a time; returns rows deleted"""
+        total = 0
+        while not self._stop.is_set():
+            # Rolled back and released if the batch fails part-way
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f'''
+                    DELETE FROM {table} WHERE id IN (
+                        SELECT id FROM {table} WHERE {where} ORDER BY id LIMIT ?
+                    )
+                ''', (*params, self.batch_size))
+                deleted = cursor.rowcount
+                conn.commit()
+
+            total += deleted
+            if deleted < self.batch_size:
+                break
+            time.sleep(self.batch_pause)
+        return total
+
+    def purge_expired_sessions(self):
+        """Delete sessions past their expiry"""
+        return self._delete_in_batches('sessions', 'expires_at <= ?', (get_ist_now(),))
+
+    def apply_retention(self):
+        """Delete rows older than the retention configured in system_settings"""
+        deleted = {}
+        for key, table in RETENTION_SETTINGS.items():
+            try:
+                days = int(self.db.get_setting(key) or 0)
+            except ValueError:
+                print(f"[WARNING] Ignoring non-numeric retention setting {key}")
+                continue
+            if days <= 0:
+                continue
+
+            # Rows are appended in time order, so the oldest sit at the lowest ids
+            cutoff = get_ist_now() - timedelta(days=days)
+            deleted[table] = self._delete_in_batches(table, 'timestamp < ?', (cutoff,))
+        return deleted
+
+    def compact(self, analyze=False):
+        """Run an incremental vacuum step and, optionally, a bounded ANALYZE"""
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        # Only effective once the file was created/vacuumed with auto_vacuum=INCREMENTAL
+        cursor.execute('PRAGMA auto_vacuum')
+        vacuumed = False
+        if cursor.fetchone()[0] == 2:
+            cursor.execute(f'PRAGMA incremental_vacuum({int(self.vacuum_pages)})').fetchall()
+            vacuumed = True
+
+        if analyze:
+            # analysis_limit keeps ANALYZE to a sample of each index
+            cursor.execute('PRAGMA analysis_limit = 1000').fetchall()
+            cursor.execute('ANALYZE')
+            conn.commit()
+
+        conn.close()
+        return vacuumed
+
+    def run_once(self):
+        """Run every maintenance job once; returns a summary"""
+        with self._run_lock:
+            start = time.perf_counter()
+            self.runs += 1
+            analyze = self.analyze_every > 0 and (self.runs - 1) % self.analyze_every == 0
+
+            summary = {
+                'expired_sessions': self.purge_expired_sessions(),
+                'retention': self.apply_retention(),
+                'incremental_vacuum': self.compact(analyze=analyze),
+                'analyzed': analyze,
+                'finished_at': str(get_ist_now()),
+            }
+            summary['duration_ms'] = round((time.perf_counter() - start) * 1000, 1)
+            self.last_run = summary
+            return summary
+
+    def get_stats(self):
+        """Get worker status and the last run summary"""
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'interval': self.interval,
+            'runs': self.runs,
+            'last_run': self.last_run
+        }
@@ -0,0 +1,44 @@
+"""
+Utility script to rebuild the admin analytics rollup tables
+(and optionally the chat history search index)
+Use this after bulk edits made outside the app, or if the dashboard counts drift
+"""
+
+import argparse
+import time
+
+from web_database import WebDatabase
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rebuild Axon AI analytics rollups from scratch')
+    parser.add_argument('--db', default='web_axon.db', help='Path to the web database (default: web_axon.db)')
+    parser.add_argument('--search-index', action='store_true', help='Also rebuild the chat history search index')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Axon AI - Analytics Rollup Rebuild")
+    print("=" * 60)
+
+    db = WebDatabase(args.db)
+
+    start = time.perf_counter()
+    result = db.rebuild_analytics_rollups()
+    elapsed = time.perf_counter() - start
+
+    if args.search_index:
+        start = time.perf_counter()
+        search_result = db.rebuild_search_index()
+        print(f"\n[+] {search_result['message']} in {time.perf_counter() - start:.2f}s")
+
+    analytics = db.get_admin_analytics()
+    db.close()
+
+    print(f"\n[+] {result['message']} in {elapsed:.2f}s")
+    print(f"    Users: {analytics['overview']['total_users']}")
+    print(f"    Messages: {analytics['overview']['total_messages']}")
+    print(f"    Languages: {len(analytics['language_stats'])}, Modes: {len(analytics['mode_stats'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+"""
+Replay / Load Generator for Axon AI
+Replays real messages from chat_history (or a JSONL file) against AIBridge
+in-process or against a running app over HTTP, at a fixed rate and
+concurrency, and reports p50/p95/p99 latency per intent, throughput and
+error rates
+
+In-process runs are offline by default: Hugging Face calls go to the local
+stub (hf_stub_server.py) and Wikipedia lookups to a canned answer. Their
+contacts and Wikipedia cache databases go to a temporary directory (removed
+afterwards) unless --data-dir is given. For HTTP
+runs, start the app against the stub yourself:
+    python hf_stub_server.py --port 8765
+    HF_API_BASE=http://127.0.0.1:8765 HF_TOKEN=stub python app.py
+
+Usage:
+    python replay_load.py --db web_axon.db --limit 2000 --concurrency 8
+    python replay_load.py --jsonl messages.jsonl --rate 50 --duration 60
+    python replay_load.py --db web_axon.db --url http://127.0.0.1:5000 --token <session token>
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Runs from anywhere, so make the repo importable
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, REPO_DIR)
+
+
+def load_history(db_path, limit=None, user_id=None):
+    """Read messages from chat_history, oldest first (the database is opened read-only)"""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    sql = 'SELECT user_id, message, mode, language FROM chat_history'
+    params = []
+    if user_id is not None:
+        sql += ' WHERE user_id = ?'
+        params.append(user_id)
+    sql += ' ORDER BY id'
+    if limit:
+        sql += ' LIMIT ?'
+        params.append(limit)
+    rows = conn.execute(sql, params).fetchall()
+    conn.close()
+    return [{'user_id': row[0], 'message': row[1], 'mode': row[2] or 'text', 'language': row[3] or 'en'}
+            for row in rows]
+
+
+def load_jsonl(path, limit=None):
+    """Read messages from JSONL - {"message", "mode"?, "language"?, "user_id"?} or a JSON string per line"""
+    messages = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if isinstance(item, str):
+                item = {'message': item}
+            messages.append({'user_id': item.get('user_id'), 'message': item['message'],
+                             'mode': item.get('mode', 'text'), 'language': item.get('language', 'en')})
+            if limit and len(messages) >= limit:
+                break
+    return messages
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class InProcessTarget:
+    """Calls AIBridge.process_command directly"""
+
+    def __init__(self, offline=True, stub_latency=0.0, data_dir=None):
+        """
+        Args:
+            offline: Use the HF stub server and canned Wikipedia answers
+            stub_latency: Seconds each stubbed call takes
+            data_dir: Directory for contacts.db and wiki_cache.db (default: a
+                temporary directory, removed on close)
+        """
+        self._stub_server = None
+        if offline:
+            # Must happen before hf_client builds its shared client
+            from hf_stub_server import start_stub_server
+            self._stub_server, base_url = start_stub_server(latency=stub_latency)
+            os.environ['HF_API_BASE'] = base_url
+            os.environ['HF_TOKEN'] = 'replay-stub'
+
+        self._scratch = None
+        if data_dir is None:
+            data_dir = self._scratch = tempfile.mkdtemp(prefix='axon_replay_')
+        else:
+            os.makedirs(data_dir, exist_ok=True)
+
+        from ai_integration import AIBridge
+        self.bridge = AIBridge(contacts_db_path=os.path.join(data_dir, 'contacts.db'),
+                               wiki_cache_path=os.path.join(data_dir, 'wiki_cache.db'))
+
+        if offline:
+            def fetch(query):
+                if stub_latency:
+                    time.sleep(stub_latency)
+                return {'found': True, 'title': query, 'summary': f"{query.title()} is a stub Wikipedia summary."}
+
+            self.bridge.wiki_cache._fetch = fetch
+
+    def send(self, item):
+        """Returns (ok, error message or None)"""
+        result = self.bridge.process_command(item['message'], item['mode'], item['language'],
+                                             user_id=item['user_id'])
+        return result['success'], result.get('error')
+
+    def close(self):
+        self.bridge.handler_executor.shutdown()
+        self.bridge.contacts_db.close()
+        self.bridge.wiki_cache.close()
+        if self._stub_server is not None:
+            self._stub_server.shutdown()
+        if self._scratch is not None:
+            shutil.rmtree(self._scratch, ignore_errors=True)
+
+
+class HttpTarget:
+    """Posts to /api/chat on a running app"""
+
+    def __init__(self, base_url, token, timeout=30.0):
+        import requests
+        self.url = base_url.rstrip('/') + '/api/chat'
+        self.session = requests.Session()
+        self.session.headers['Authorization'] = token
+        self.timeout = timeout
+
+    def send(self, item):
+        """Returns (ok, error message or None)"""
+        try:
+            response = self.session.post(self.url, json={'message': item['message'], 'mode': item['mode'],
+                                                         'language': item['language']}, timeout=self.timeout)
+        except Exception as e:
+            return False, type(e).__name__
+        if response.status_code != 200:
+            return False, f"HTTP {response.status_code}"
+        body = response.json()
+        return bool(body.get('success')), body.get('message')
+
+    def close(self):
+        self.session.close()
+
+
+def replay(target, messages, concurrency=8, rate=None, duration=None):
+    """
+    Send messages to the target and time each one
+
+    Args:
+        target: InProcessTarget or HttpTarget
+        messages: Messages to send (cycled when duration outlasts them)
+        concurrency: Requests in flight at once
+        rate: Requests per second (None = as fast as the workers allow). Latency
+            is measured from each request's scheduled start, so queueing behind
+            a saturated pool is counted
+        duration: Stop scheduling after this many seconds (None = one pass)
+
+    Returns:
+        (samples, elapsed seconds) - samples are (intent, latency_ms, ok, error)
+    """
+    from ai_integration import INTENT_ROUTER
+
+    intents = {}
+    for item in messages:
+        query = item['message'].lower()
+        if query not in intents:
+            intent = INTENT_ROUTER.route(query)
+            intents[query] = intent['name'] if intent else 'fallback'
+
+    samples = []
+    lock = threading.Lock()
+    slots = threading.BoundedSemaphore(concurrency)
+
+    def run(item, scheduled):
+        try:
+            try:
+                ok, error = target.send(item)
+            except Exception as e:
+                ok, error = False, type(e).__name__
+            latency_ms = (time.perf_counter() - scheduled) * 1000
+            with lock:
+                samples.append((intents[item['message'].lower()], latency_ms, ok, error))
+        finally:
+            if rate is None:
+                slots.release()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='axon-replay') as pool:
+        sent = 0
+        while True:
+            if duration is None and sent >= len(messages):
+                break
+            if duration is not None and time.perf_counter() - start >= duration:
+                break
+            if rate is not None:
+                scheduled = start + sent / rate
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            else:
+                # Closed loop: wait for a free worker before starting the clock
+                slots.acquire()
+                scheduled = time.perf_counter()
+            pool.submit(run, messages[sent % len(messages)], scheduled)
+            sent += 1
+    return samples, time.perf_counter() - start
+
+
+def summarize(samples, elapsed):
+    """Aggregate samples into per-intent and overall latency/error figures"""
+    by_intent = {}
+    for intent, latency_ms, ok, error in samples:
+        by_intent.setdefault(intent, []).append((latency_ms, ok, error))
+
+    def figures(rows):
+        latencies = sorted(row[0] for row in rows)
+        errors = sum(1 for row in rows if not row[1])
+        return {
+            'requests': len(rows),
+            'errors': errors,
+            'error_rate': round(errors / len(rows), 4) if rows else 0.0,
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+            'max_ms': round(latencies[-1], 2) if latencies else 0.0
+        }
+
+    error_kinds = {}
+    for _, _, ok, error in samples:
+        if not ok:
+            error_kinds[error or 'unsuccessful'] = error_kinds.get(error or 'unsuccessful', 0) + 1
+
+    overall = figures([(latency_ms, ok, error) for _, latency_ms, ok, error in samples])
+    overall['elapsed_s'] = round(elapsed, 3)
+    overall['throughput_rps'] = round(len(samples) / elapsed, 2) if elapsed else 0.0
+    return {
+        'overall': overall,
+        'intents': {intent: figures(rows) for intent, rows in sorted(by_intent.items())},
+        'error_kinds': error_kinds
+    }
+
+
+def print_report(report):
+    """Print the summary as a table"""
+    header = f"{'intent':<20}{'requests':>10}{'errors':>8}{'err%':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+    print(header)
+    print('-' * len(header))
+    rows = list(report['intents'].items()) + [('ALL', report['overall'])]
+    for intent, f in rows:
+        print(f"{intent:<20}{f['requests']:>10}{f['errors']:>8}{f['error_rate'] * 100:>7.1f}%"
+              f"{f['p50_ms']:>10.2f}{f['p95_ms']:>10.2f}{f['p99_ms']:>10.2f}{f['max_ms']:>10.2f}")
+    overall = report['overall']
+    print(f"\nThroughput: {overall['throughput_rps']} requests/s over {overall['elapsed_s']} s")
+    for kind, count in sorted(report['error_kinds'].items(), key=lambda kv: -kv[1]):
+        print(f"[WARNING] {count} x {kind}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay chat traffic against Axon and report latency')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--db', help='Read messages from this database\'s chat_history')
+    source.add_argument('--jsonl', help='Read messages from a JSONL file')
+    parser.add_argument('--limit', type=int, help='Messages to load')
+    parser.add_argument('--user-id', type=int, help='Only replay this user\'s history (--db)')
+    parser.add_argument('--url', help='Replay over HTTP against this app (default: in-process)')
+    parser.add_argument('--token', help='Session token for --url')
+    parser.add_argument('--concurrency', type=int, default=8, help='Requests in flight at once')
+    parser.add_argument('--rate', type=float, help='Requests per second (default: as fast as possible)')
+    parser.add_argument('--duration', type=float, help='Seconds to run, cycling messages (default: one pass)')
+    parser.add_argument('--online', action='store_true', help='In-process: call the real Hugging Face and Wikipedia APIs')
+    parser.add_argument('--stub-latency', type=float, default=0.0, help='Seconds each stubbed call takes')
+    parser.add_argument('--data-dir', help='In-process: keep contacts.db and wiki_cache.db here (default: a temp dir)')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    if args.db:
+        messages = load_history(args.db, args.limit, args.user_id)
+    else:
+        messages = load_jsonl(args.jsonl, args.limit)
+    if not messages:
+        print('[ERROR] No messages to replay')
+        sys.exit(1)
+
+    if args.url:
+        if not args.token:
+            parser.error('--url needs --token')
+        target = HttpTarget(args.url, args.token)
+    else:
+        target = InProcessTarget(offline=not args.online, stub_latency=args.stub_latency, data_dir=args.data_dir)
+
+    try:
+        samples, elapsed = replay(target, messages, args.concurrency, args.rate, args.duration)
+    finally:
+        target.close()
+
+    report = summarize(samples, elapsed)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+Batch Sentiment Scoring for Axon AI
+Scores many texts at once with VADER's lexicon and its main rules (boosters,
+negation, ALL CAPS emphasis, 'but', punctuation emphasis) evaluated on flat
+NumPy arrays instead of word by word. Tokens are featurised once per
+distinct word and cached, so the per-text Python work is a split and a few
+dict lookups.
+
+Scores track vaderSentiment closely but skip its slang special cases ('the
+bomb', 'yeah right') and its quirk of reweighting only the first of repeated
+equal scores around 'but'; use SentimentAnalyzer.analyze_sentiment where exact
+VADER output matters.
+"""
+
+import string
+import threading
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from vaderSentiment.vaderSentiment import (
+        BOOSTER_DICT, NEGATE, B_DECR, C_INCR, N_SCALAR, SentimentIntensityAnalyzer
+    )
+    VADER_AVAILABLE = True
+except ImportError:
+    VADER_AVAILABLE = False
+
+_PUNCTUATION = string.punctuation
+_NEGATE = frozenset(NEGATE) if VADER_AVAILABLE else frozenset()
+_DECAY = (1.0, 0.95, 0.9)   # Booster weight by distance from the sentiment word
+_SO_THIS, _NEVER, _WITHOUT, _DOUBT, _KIND, _SORT, _OF, _JUST, _ENOUGH, _LEAST, _AT, _VERY = range(1, 13)
+_MARKERS = {'so': _SO_THIS, 'this': _SO_THIS, 'never': _NEVER, 'without': _WITHOUT, 'doubt': _DOUBT,
+            'kind': _KIND, 'sort': _SORT, 'of': _OF, 'just': _JUST, 'enough': _ENOUGH,
+            'least': _LEAST, 'at': _AT, 'very': _VERY}
+# Two-word dampeners ('kind of good') as marker pairs
+_BIGRAM_BOOSTERS = ((_KIND, _OF), (_SORT, _OF), (_JUST, _ENOUGH))
+MAX_CACHED_WORDS = 200000
+
+_shared_vader = None
+_shared_vader_lock = threading.Lock()
+
+
+def get_vader():
+    """Process-wide VADER analyzer (the lexicon is parsed once)"""
+    global _shared_vader
+    if not VADER_AVAILABLE:
+        return None
+    with _shared_vader_lock:
+        if _shared_vader is None:
+            _shared_vader = SentimentIntensityAnalyzer()
+        return _shared_vader
+
+
+def _strip_punctuation(token):
+    """VADER's token cleanup: strip surrounding punctuation unless that leaves an emoticon-sized stub"""
+    stripped = token.strip(_PUNCTUATION)
+    return token if len(stripped) <= 2 else stripped
+
+
+class BatchScorer:
+    """Vectorised VADER scoring over lists of texts"""
+
+    def __init__(self, vader=None):
+        """
+        Args:
+            vader: SentimentIntensityAnalyzer whose lexicon to use (defaults to the shared one)
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError('numpy is not installed')
+        self.vader = vader or get_vader()
+        if self.vader is None:
+            raise RuntimeError('vaderSentiment is not installed')
+        self.lexicon = self.vader.lexicon
+        self.emojis = self.vader.emojis
+        self._features = {}  # lowercase word -> (valence, in_lexicon, booster, negator, is_no, is_but, marker)
+        self._lock = threading.Lock()
+
+    def _feature(self, word):
+        """Features of a lowercase word (cached)"""
+        feature = self._features.get(word)
+        if feature is None:
+            in_lexicon = word in self.lexicon
+            booster = BOOSTER_DICT.get(word, 0.0)
+            # Boosters score 0 themselves, even when they are also lexicon words
+            valence = self.lexicon[word] if in_lexicon and not booster else 0.0
+            feature = (valence, in_lexicon, booster, word in _NEGATE or "n't" in word, word == 'no', word == 'but',
+                       _MARKERS.get(word, 0))
+            with self._lock:
+                if len(self._features) >= MAX_CACHED_WORDS:
+                    self._features.clear()
+                self._features[word] = feature
+        return feature
+
+    def _replace_emojis(self, text):
+        """Swap emojis for their descriptions, as polarity_scores does"""
+        out = []
+        prev_space = True
+        for char in text:
+            description = self.emojis.get(char)
+            if description is not None:
+                if not prev_space:
+                    out.append(' ')
+                out.append(description)
+                prev_space = False
+            else:
+                out.append(char)
+                prev_space = char == ' '
+        return ''.join(out).strip()
+
+    def score(self, texts):
+        """
+        Score a list of texts
+
+        Returns:
+            dict of float arrays 'compound', 'pos', 'neg', 'neu' (one entry per text)
+        """
+        count = len(texts)
+        words = []          # Flat list of cleaned tokens, all texts back to back
+        lengths = np.zeros(count, dtype=np.int64)
+        cap_diff = np.zeros(count, dtype=bool)
+        emphasis = np.zeros(count, dtype=np.float64)
+
+        for index, text in enumerate(texts):
+            text = text or ''
+            if not text.isascii():
+                text = self._replace_emojis(text)
+            tokens = [_strip_punctuation(token) for token in text.split()]
+            words.extend(tokens)
+            lengths[index] = len(tokens)
+            if tokens:
+                upper = sum(1 for token in tokens if token.isupper())
+                cap_diff[index] = 0 < len(tokens) - upper < len(tokens)
+            # Punctuation emphasis: '!' up to 4, and 2+ '?'
+            exclamations = min(text.count('!'), 4) * 0.292
+            questions = text.count('?')
+            emphasis[index] = exclamations + (0.0 if questions <= 1 else questions * 0.18 if questions <= 3 else 0.96)
+
+        total = len(words)
+        if total == 0:
+            zeros = np.zeros(count)
+            return {'compound': zeros, 'pos': zeros.copy(), 'neg': zeros.copy(), 'neu': zeros.copy()}
+
+        features = np.array([self._feature(word.lower()) for word in words], dtype=np.float64)
+        valence, in_lexicon, booster, negator, is_no, is_but, marker = features.T
+        in_lexicon = in_lexicon.astype(bool)
+        negator = negator.astype(bool)
+        is_no = is_no.astype(bool)
+        upper = np.fromiter((word.isupper() for word in words), dtype=bool, count=total)
+
+        doc = np.repeat(np.arange(count), lengths)
+        starts = np.cumsum(lengths) - lengths
+        position = np.arange(total) - np.repeat(starts, lengths)
+        caps = cap_diff[doc] & upper
+
+        def previous(array, k, fill):
+            """array shifted so index i holds the value at i - k (fill at the start of each text)"""
+            shifted = np.full_like(array, fill)
+            shifted[k:] = array[:-k]
+            shifted[position < k] = fill
+            return shifted
+
+        next_marker = np.zeros(total)
+        next_marker[:-1] = marker[1:]
+        next_marker[np.cumsum(lengths)[lengths > 0] - 1] = 0
+
+        # 'kind' in 'kind of' is a dampener, not the lexicon word
+        scored = in_lexicon & (booster == 0) & ~((marker == _KIND) & (next_marker == _OF))
+        v = np.where(scored, valence, 0.0)
+
+        # "no" as a stand-alone word before another lexicon word negates it instead of scoring
+        next_in_lexicon = np.zeros(total, dtype=bool)
+        next_in_lexicon[:-1] = in_lexicon[1:]
+        next_in_lexicon[np.cumsum(lengths)[lengths > 0] - 1] = False
+        v = np.where(is_no & next_in_lexicon, 0.0, v)
+        v = np.where(scored & (previous(is_no, 1, False) | previous(is_no, 2, False)), valence * N_SCALAR, v)
+
+        # ALL CAPS sentiment word in mixed-case text
+        v = np.where(scored & caps, v + np.where(v > 0, C_INCR, -C_INCR), v)
+
+        # Boosters and negation from up to three preceding non-lexicon words
+        for k in range(3):
+            prev_in_lexicon = previous(in_lexicon, k + 1, True)
+            applies = scored & ~prev_in_lexicon
+            prev_booster = previous(booster, k + 1, 0.0)
+            prev_caps = previous(caps, k + 1, False)
+            scalar = np.where(v < 0, -prev_booster, prev_booster)
+            scalar = np.where((prev_booster != 0) & prev_caps, scalar + np.where(v > 0, C_INCR, -C_INCR), scalar)
+            v = np.where(applies, v + scalar * _DECAY[k], v)
+            negated = previous(negator, k + 1, False)
+            if k == 0:
+                v = np.where(applies & negated, v * N_SCALAR, v)
+                continue
+            # 'never so/this good' intensifies, 'without doubt' is not a negation
+            prev1, prev2, prev3 = (previous(marker, j, 0.0) for j in (1, 2, 3))
+            if k == 1:
+                intensified = (prev2 == _NEVER) & (prev1 == _SO_THIS)
+                kept = (prev2 == _WITHOUT) & (prev1 == _DOUBT)
+            else:
+                intensified = ((prev3 == _NEVER) & (prev2 == _SO_THIS)) | (prev1 == _SO_THIS)
+                kept = (prev3 == _WITHOUT) & ((prev2 == _DOUBT) | (prev1 == _DOUBT))
+            v = np.where(applies & intensified, v * 1.25,
+                         np.where(applies & ~kept & negated, v * N_SCALAR, v))
+            if k == 2:
+                for first, second in _BIGRAM_BOOSTERS:
+                    bigram = ((prev3 == first) & (prev2 == second)) | ((prev2 == first) & (prev1 == second))
+                    v = np.where(applies & bigram, v + B_DECR, v)
+
+        # 'least good' negates, 'at least' / 'very least' don't
+        prev1, prev2 = previous(marker, 1, 0.0), previous(marker, 2, 0.0)
+        least = scored & (prev1 == _LEAST) & ~previous(in_lexicon, 1, True) & (prev2 != _AT) & (prev2 != _VERY)
+        v = np.where(least, v * N_SCALAR, v)
+
+        # 'but': words before the first 'but' count half, words after count 1.5x
+        but_position = np.full(count, np.iinfo(np.int64).max)
+        but_tokens = np.flatnonzero(is_but)
+        np.minimum.at(but_position, doc[but_tokens], position[but_tokens])
+        first_but = but_position[doc]
+        v = np.where(position < first_but, np.where(first_but < np.iinfo(np.int64).max, v * 0.5, v),
+                     np.where(position > first_but, v * 1.5, v))
+
+        sum_s = np.bincount(doc, weights=v, minlength=count)
+        sum_s = sum_s + np.sign(sum_s) * emphasis
+        compound = np.clip(sum_s / np.sqrt(sum_s * sum_s + 15), -1.0, 1.0)
+
+        pos_sum = np.bincount(doc, weights=np.where(v > 0, v + 1, 0.0), minlength=count)
+        neg_sum = np.bincount(doc, weights=np.where(v < 0, v - 1, 0.0), minlength=count)
+        neu_count = np.bincount(doc, weights=(v == 0).astype(np.float64), minlength=count)
+        pos_sum, neg_sum = (np.where(pos_sum > -neg_sum, pos_sum + emphasis, pos_sum),
+                            np.where(pos_sum < -neg_sum, neg_sum - emphasis, neg_sum))
+
+        denominator = pos_sum - neg_sum + neu_count
+        has_words = lengths > 0
+        safe = np.where(has_words, denominator, 1.0)
+        return {
+            'compound': np.where(has_words, np.round(compound, 4), 0.0),
+            'pos': np.where(has_words, np.round(np.abs(pos_sum / safe), 3), 0.0),
+            'neg': np.where(has_words, np.round(np.abs(neg_sum / safe), 3), 0.0),
+            'neu': np.where(has_words, np.round(np.abs(neu_count / safe), 3), 0.0)
+        }
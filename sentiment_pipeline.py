@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Sentiment Backfill Pipeline for Axon AI
+Scores chat_history messages off the request path: a background thread reads
+unscored rows after a checkpoint in chunks, scores each chunk with the
+vectorised sentiment scorer and writes the scores and the new checkpoint in
+one transaction. The analytics_daily_sentiment rollup is kept current by
+triggers on the sentiment column, so admin analytics never recompute scores.
+
+Usage:
+    python sentiment_pipeline.py --db web_axon.db
+    python sentiment_pipeline.py --db web_axon.db --restart --batch-size 2000
+"""
+
+import argparse
+import threading
+import time
+
+from web_database import get_ist_now
+
+
+class SentimentBackfill:
+    """Background thread that scores new chat messages in checkpointed chunks"""
+
+    def __init__(self, db, interval=60, batch_size=5000, batch_pause=0.05, analyzer=None):
+        """
+        Args:
+            db: WebDatabase instance
+            interval: Seconds between backfill runs
+            batch_size: Messages read, scored and written per transaction
+            batch_pause: Seconds to sleep between chunks, letting chat writes in
+            analyzer: SentimentAnalyzer to score with (default: the shared one,
+                loaded on first use)
+        """
+        self.db = db
+        self.interval = interval
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self._analyzer = analyzer
+
+        self._stop = threading.Event()
+        self._run_lock = threading.Lock()
+        self._thread = None
+        self.runs = 0
+        self.scored = 0
+        self.last_run = None
+
+    def start(self):
+        """Start the background thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='axon-sentiment', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background thread (finishes the chunk in progress)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"[WARNING] Sentiment backfill failed: {e}")
+
+    def _get_analyzer(self):
+        if self._analyzer is None:
+            from advanced_ai import get_sentiment_analyzer
+            self._analyzer = get_sentiment_analyzer()
+        return self._analyzer
+
+    def run_once(self, limit=None):
+        """
+        Score every unscored message after the checkpoint
+
+        Args:
+            limit: Stop after this many messages (None = until caught up)
+
+        Returns:
+            Summary dict (messages scored, chunks, checkpoint, duration)
+        """
+        with self._run_lock:
+            start = time.perf_counter()
+            self.runs += 1
+            analyzer = self._get_analyzer()
+            checkpoint = self.db.get_sentiment_checkpoint()
+            scored = chunks = 0
+
+            while not self._stop.is_set() and (limit is None or scored < limit):
+                size = self.batch_size if limit is None else min(self.batch_size, limit - scored)
+                rows = self.db.get_unscored_messages(checkpoint, size)
+                if not rows:
+                    break
+
+                scores = analyzer.score_batch([message for _, message in rows])
+                checkpoint = rows[-1][0]
+                self.db.store_sentiment_scores(zip((row_id for row_id, _ in rows), scores), checkpoint)
+
+                scored += len(rows)
+                chunks += 1
+                if len(rows) < size:
+                    break
+                time.sleep(self.batch_pause)
+
+            self.scored += scored
+            summary = {
+                'scored': scored,
+                'chunks': chunks,
+                'checkpoint': checkpoint,
+                'finished_at': str(get_ist_now()),
+                'duration_ms': round((time.perf_counter() - start) * 1000, 1)
+            }
+            self.last_run = summary
+            return summary
+
+    def get_stats(self):
+        """Get worker status, progress and the last run summary"""
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'interval': self.interval,
+            'runs': self.runs,
+            'scored': self.scored,
+            'checkpoint': self.db.get_sentiment_checkpoint(),
+            'backlog': self.db.get_sentiment_backlog(),
+            'last_run': self.last_run
+        }
+
+
+def main():
+    from web_database import WebDatabase, SENTIMENT_CHECKPOINT_KEY
+
+    parser = argparse.ArgumentParser(description='Score chat_history sentiment in checkpointed chunks')
+    parser.add_argument('--db', default='web_axon.db', help='Path to the web database')
+    parser.add_argument('--batch-size', type=int, default=5000, help='Messages per chunk')
+    parser.add_argument('--limit', type=int, help='Stop after this many messages')
+    parser.add_argument('--restart', action='store_true', help='Reset the checkpoint and rescore unscored rows from the start')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"Backfilling sentiment in {args.db}")
+    print("=" * 60)
+
+    db = WebDatabase(args.db)
+    if args.restart:
+        db.set_setting(SENTIMENT_CHECKPOINT_KEY, '0')
+
+    backfill = SentimentBackfill(db, batch_size=args.batch_size, batch_pause=0)
+    summary = backfill.run_once(limit=args.limit)
+    print(f"Scored {summary['scored']} messages in {summary['chunks']} chunks "
+          f"({summary['duration_ms']} ms), checkpoint at id {summary['checkpoint']}")
+    print(f"Still waiting: {db.get_sentiment_backlog()}")
+    db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Session Cache for Axon AI
+In-process TTL + LRU cache of verified sessions, keyed by session token
+
+Every invalidate_user() bumps a generation counter and records it for that
+user. Callers take generation() before reading a user row and pass it to
+put(), which drops the row if the user was invalidated in between, so a ban
+or role change racing a cache miss can't re-cache the old row.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class SessionCache:
+    """Caches the user row behind a session token so verify_session can skip SQLite"""
+
+    def __init__(self, max_size=10000, ttl=60):
+        """
+        Args:
+            max_size: Maximum number of cached sessions (least recently used are evicted)
+            ttl: Seconds an entry is trusted before it is re-read from the database.
+                 Each gunicorn worker has its own cache, so this also bounds how long
+                 a change made through another worker can go unnoticed.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # token -> (user, deadline)
+        self._tokens_by_user = {}      # user id -> set of tokens
+        self._generation = 0
+        self._invalidated_at = {}      # user id -> generation of their last invalidation
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'invalidations': 0,
+            'stale_puts': 0
+        }
+
+    def generation(self):
+        """Current invalidation generation (take it before reading the row you will put)"""
+        with self._lock:
+            return self._generation
+
+    def get(self, token):
+        """Get the cached user for a token, or None"""
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+
+            user, deadline = entry
+            if time.monotonic() >= deadline:
+                self._remove(token)
+                self.stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(token)
+            self.stats['hits'] += 1
+            return dict(user)
+
+    def put(self, token, user, expires_in, generation=None):
+        """
+        Cache a verified session
+
+        Args:
+            token: Session token
+            user: User dict as returned by verify_session
+            expires_in: Seconds until the session itself expires
+            generation: generation() taken before the row was read; the row is
+                not cached if the user has been invalidated since
+        """
+        lifetime = min(self.ttl, expires_in)
+        if lifetime <= 0:
+            return
+
+        with self._lock:
+            if generation is not None and self._invalidated_at.get(user['id'], -1) >= generation:
+                self.stats['stale_puts'] += 1
+                return
+
+            if token in self._entries:
+                self._remove(token)
+
+            self._entries[token] = (dict(user), time.monotonic() + lifetime)
+            self._tokens_by_user.setdefault(user['id'], set()).add(token)
+
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.stats['evictions'] += 1
+
+    def _remove(self, token):
+        """Remove a token (lock held)"""
+        user, _ = self._entries.pop(token)
+        tokens = self._tokens_by_user.get(user['id'])
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[user['id']]
+
+    def invalidate(self, token):
+        """Drop a single session (logout)"""
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+                self.stats['invalidations'] += 1
+
+    def invalidate_user(self, user_id):
+        """Drop every session belonging to a user (ban, role change, delete, password change)"""
+        with self._lock:
+            self._invalidated_at[user_id] = self._generation
+            self._generation += 1
+            for token in list(self._tokens_by_user.get(user_id, ())):
+                self._remove(token)
+                self.stats['invalidations'] += 1
+
+    def clear(self):
+        """Drop all cached sessions"""
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def get_stats(self):
+        """Get cache statistics"""
+        with self._lock:
+            size = len(self._entries)
+        lookups = self.stats['hits'] + self.stats['misses']
+        hit_rate = self.stats['hits'] / lookups if lookups else 0.0
+        return dict(self.stats, size=size, hit_rate=round(hit_rate, 4))
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Request Coalescing for Axon AI
+While an outbound call (Wikipedia, Hugging Face) for a key is in flight, other
+threads asking for the same key wait for it and share its result instead of
+making their own call
+"""
+
+import hashlib
+import threading
+
+
+def request_key(*parts):
+    """Build a coalescing key from request parts (whitespace-normalised and hashed)"""
+    normalized = '\x1f'.join(' '.join(str(part).split()) for part in parts)
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+class _Call:
+    """One in-flight call and the threads waiting on it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key"""
+
+    def __init__(self, name):
+        self.name = name
+        self._calls = {}  # key -> _Call
+        self._lock = threading.Lock()
+        self.stats = {
+            'calls': 0,
+            'executions': 0,
+            'coalesced': 0,
+            'errors': 0
+        }
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) unless a call for key is already running,
+        in which case wait for it and return (or raise) its outcome.
+        Callers share the same result object and must not mutate it.
+        """
+        with self._lock:
+            self.stats['calls'] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self.stats['coalesced'] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.stats['executions'] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except Exception as e:
+            call.error = e
+            with self._lock:
+                self.stats['errors'] += 1
+            raise
+        finally:
+            # Forget the key before waking waiters so later callers start a fresh call
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def get_stats(self):
+        """Get call counts; 'coalesced' is the number of upstream calls saved"""
+        with self._lock:
+            return dict(self.stats, in_flight=len(self._calls))
+
+
+_groups = {}
+_groups_lock = threading.Lock()
+
+
+def get_group(name):
+    """Get (or create) the process-wide SingleFlight group for a kind of call"""
+    with _groups_lock:
+        group = _groups.get(name)
+        if group is None:
+            group = _groups[name] = SingleFlight(name)
+        return group
+
+
+def get_all_stats():
+    """Get stats for every group, keyed by name"""
+    with _groups_lock:
+        groups = list(_groups.values())
+    return {group.name: group.get_stats() for group in groups}
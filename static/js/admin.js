@@ -1068,25 +1068,27 @@ async function createNewAdmin() {
 // ============================================================================
 
 async function exportData(type, format) {
+    // Exports stream as CSV or JSON Lines (gzip is negotiated by the browser)
+    const exportFormat = format === 'jsonl' ? 'jsonl' : 'csv';
     let endpoint = '';
     let filename = '';
 
     switch (type) {
         case 'users':
-            endpoint = `/api/admin/export/users?format=${format}`;
-            filename = `users_${Date.now()}.${format === 'excel' ? 'xlsx' : 'csv'}`;
+            endpoint = `/api/admin/export/users?format=${exportFormat}`;
+            filename = `users_${Date.now()}.${exportFormat}`;
             break;
         case 'chat':
-            endpoint = '/api/admin/export/chat-history';
-            filename = `chat_history_${Date.now()}.xlsx`;
+            endpoint = `/api/admin/export/chat-history?format=${exportFormat}`;
+            filename = `chat_history_${Date.now()}.${exportFormat}`;
             break;
         case 'logs':
-            endpoint = `/api/admin/export/activity-logs?format=${format}`;
-            filename = `activity_logs_${Date.now()}.${format === 'excel' ? 'xlsx' : 'csv'}`;
+            endpoint = `/api/admin/export/activity-logs?format=${exportFormat}`;
+            filename = `activity_logs_${Date.now()}.${exportFormat}`;
             break;
         case 'analytics':
-            endpoint = '/api/admin/export/analytics';
-            filename = `analytics_report_${Date.now()}.pdf`;
+            endpoint = `/api/admin/export/analytics?format=${exportFormat}`;
+            filename = `analytics_report_${Date.now()}.${exportFormat}`;
             break;
         default:
             alert('Invalid export type');
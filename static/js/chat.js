@@ -1,6 +1,5 @@
-// Modern Chat JavaScript with WebSocket
+// Modern Chat JavaScript with Server-Sent Events
 const API_URL = '/api';
-const SOCKET_URL = window.location.origin;
 
 // Check authentication
 const sessionToken = localStorage.getItem('session_token');
@@ -10,9 +9,6 @@ if (!sessionToken) {
     window.location.href = 'index.html';
 }
 
-// Initialize Socket.IO
-const socket = io(SOCKET_URL);
-
 // DOM Elements
 const chatMessages = document.getElementById('chatMessages');
 const chatInput = document.getElementById('chatInput');
@@ -38,6 +34,8 @@ let currentMode = 'text';
 let isRecording = false;
 let recognition = null;
 let messageCount = 0;
+let historyCursor = null;
+let loadingOlderHistory = false;
 
 // Initialize
 init();
@@ -56,30 +54,6 @@ function init() {
         }
     }
 
-    // Connect to WebSocket
-    socket.on('connect', () => {
-        console.log('Connected to server');
-        socket.emit('authenticate', { session_token: sessionToken });
-    });
-
-    socket.on('authenticated', (data) => {
-        if (!data.success) {
-            localStorage.removeItem('session_token');
-            localStorage.removeItem('user');
-            window.location.href = 'index.html';
-        }
-    });
-
-    socket.on('receive_message', (data) => {
-        hideTypingIndicator();
-        addMessage(data.response, 'ai');
-
-        // Speak response in voice mode
-        if (currentMode === 'voice') {
-            speakText(data.response);
-        }
-    });
-
     // Load chat history
     loadChatHistory();
 
@@ -325,7 +299,7 @@ async function sendMessage() {
             const data = await response.json();
 
             if (data.success) {
-                // If there's a text message too, send it via socket
+                // If there's a text message too, send it to the chat API
                 // But for now, let's just use the analysis result as the AI response
 
                 const analysisSummary = data.analysis.summary;
@@ -359,11 +333,87 @@ async function sendMessage() {
         showTypingIndicator();
 
         // Send to server
-        socket.emit('send_message', {
-            session_token: sessionToken,
-            message: message,
-            mode: currentMode
+        await streamChatResponse(message);
+    }
+}
+
+async function streamChatResponse(message) {
+    let bubbleDiv = null;
+    let streamedText = '';
+
+    try {
+        const response = await fetch(`${API_URL}/chat/stream`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Authorization': sessionToken
+            },
+            body: JSON.stringify({ message: message, mode: currentMode })
         });
+
+        if (response.status === 401) {
+            localStorage.removeItem('session_token');
+            localStorage.removeItem('user');
+            window.location.href = 'index.html';
+            return;
+        }
+
+        if (!response.ok || !response.body) {
+            throw new Error(`Chat request failed (${response.status})`);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+
+            buffer += decoder.decode(value, { stream: true });
+
+            // Events are separated by a blank line
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const rawEvent = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+
+                let eventName = 'message';
+                let eventData = '';
+                rawEvent.split('\n').forEach(line => {
+                    if (line.startsWith('event: ')) eventName = line.slice(7);
+                    else if (line.startsWith('data: ')) eventData += line.slice(6);
+                });
+
+                if (!eventData) continue; // keep-alive comment
+
+                const data = JSON.parse(eventData);
+
+                if (eventName === 'chunk') {
+                    if (!bubbleDiv) {
+                        hideTypingIndicator();
+                        bubbleDiv = addMessage('', 'ai');
+                    }
+                    streamedText += data.text;
+                    bubbleDiv.innerHTML = formatMessageText(streamedText);
+                } else if (eventName === 'done') {
+                    hideTypingIndicator();
+                    if (!bubbleDiv) {
+                        bubbleDiv = addMessage('', 'ai');
+                    }
+                    bubbleDiv.innerHTML = formatMessageText(data.response);
+
+                    // Speak response in voice mode
+                    if (currentMode === 'voice') {
+                        speakText(data.response);
+                    }
+                }
+            }
+        }
+    } catch (error) {
+        hideTypingIndicator();
+        console.error('Chat error:', error);
+        showToast('Failed to get a response', 'error');
     }
 }
 
@@ -434,7 +484,7 @@ function addUserMessageWithImage(text, file) {
     return messageDiv;
 }
 
-function addMessage(text, sender) {
+function addMessage(text, sender, prepend = false) {
     messageCount++;
 
     const messageDiv = document.createElement('div');
@@ -479,19 +529,7 @@ function addMessage(text, sender) {
     const bubbleDiv = document.createElement('div');
     bubbleDiv.className = 'message-bubble';
 
-    // Process text (URLs, line breaks, code blocks)
-    let processedText = text;
-
-    // Convert URLs to clickable links
-    const urlRegex = /(https?:\/\/[^\s]+)/g;
-    processedText = processedText.replace(urlRegex, (url) => {
-        return `<a href="${url}" target="_blank" style="color: var(--accent-primary); text-decoration: underline;">${url}</a>`;
-    });
-
-    // Preserve line breaks
-    processedText = processedText.replace(/\n/g, '<br>');
-
-    bubbleDiv.innerHTML = processedText;
+    bubbleDiv.innerHTML = formatMessageText(text);
 
     contentDiv.appendChild(headerDiv);
     contentDiv.appendChild(bubbleDiv);
@@ -499,6 +537,12 @@ function addMessage(text, sender) {
     messageDiv.appendChild(avatarDiv);
     messageDiv.appendChild(contentDiv);
 
+    if (prepend) {
+        // Older history goes above what is already shown; keep the view still
+        chatMessages.insertBefore(messageDiv, chatMessages.firstChild);
+        return bubbleDiv;
+    }
+
     chatMessages.appendChild(messageDiv);
 
     // Scroll to bottom smoothly
@@ -508,6 +552,24 @@ function addMessage(text, sender) {
             behavior: 'smooth'
         });
     }, 100);
+
+    return bubbleDiv;
+}
+
+function formatMessageText(text) {
+    // Process text (URLs, line breaks, code blocks)
+    let processedText = text;
+
+    // Convert URLs to clickable links
+    const urlRegex = /(https?:\/\/[^\s]+)/g;
+    processedText = processedText.replace(urlRegex, (url) => {
+        return `<a href="${url}" target="_blank" style="color: var(--accent-primary); text-decoration: underline;">${url}</a>`;
+    });
+
+    // Preserve line breaks
+    processedText = processedText.replace(/\n/g, '<br>');
+
+    return processedText;
 }
 
 function showTypingIndicator() {
@@ -567,12 +629,55 @@ async function loadChatHistory() {
                 addMessage(msg.message, 'user');
                 addMessage(msg.response, 'ai');
             });
+
+            historyCursor = data.next_cursor;
+            chatMessages.addEventListener('scroll', onChatScroll);
         }
     } catch (error) {
         console.error('Failed to load chat history:', error);
     }
 }
 
+function onChatScroll() {
+    if (chatMessages.scrollTop < 50) {
+        loadOlderHistory();
+    }
+}
+
+async function loadOlderHistory() {
+    if (!historyCursor || loadingOlderHistory) {
+        return;
+    }
+    loadingOlderHistory = true;
+
+    try {
+        const response = await fetch(`${API_URL}/history?limit=20&cursor=${encodeURIComponent(historyCursor)}`, {
+            headers: {
+                'Authorization': sessionToken
+            }
+        });
+
+        const data = await response.json();
+
+        if (data.success) {
+            const previousHeight = chatMessages.scrollHeight;
+
+            // Page is newest first; prepending each pair leaves the oldest on top
+            data.history.forEach(msg => {
+                addMessage(msg.response, 'ai', true);
+                addMessage(msg.message, 'user', true);
+            });
+
+            chatMessages.scrollTop += chatMessages.scrollHeight - previousHeight;
+            historyCursor = data.next_cursor;
+        }
+    } catch (error) {
+        console.error('Failed to load older chat history:', error);
+    } finally {
+        loadingOlderHistory = false;
+    }
+}
+
 async function clearChat() {
     if (messageCount > 0 && !confirm('Are you sure you want to clear this chat?')) {
         return;
@@ -599,6 +704,7 @@ async function clearChat() {
             }
 
             messageCount = 0;
+            historyCursor = null;
             showToast('Chat cleared successfully', 'success');
         }
     } catch (error) {
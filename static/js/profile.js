@@ -96,12 +96,20 @@ async function loadChatStats() {
     }
 }
 
-async function loadChatHistory() {
+let historyCursor = null;
+
+async function loadChatHistory(cursor = null) {
     const historyList = document.getElementById('historyList');
-    historyList.innerHTML = '<p class="loading">Loading...</p>';
+    const url = cursor
+        ? `${API_URL}/history?limit=50&cursor=${encodeURIComponent(cursor)}`
+        : `${API_URL}/history?limit=50`;
+
+    if (!cursor) {
+        historyList.innerHTML = '<p class="loading">Loading...</p>';
+    }
 
     try {
-        const response = await fetch(`${API_URL}/history?limit=50`, {
+        const response = await fetch(url, {
             headers: {
                 'Authorization': sessionToken
             }
@@ -110,7 +118,15 @@ async function loadChatHistory() {
         const data = await response.json();
 
         if (data.success && data.history.length > 0) {
-            historyList.innerHTML = '';
+            if (!cursor) {
+                historyList.innerHTML = '';
+            }
+
+            const loadMoreBtn = document.getElementById('loadMoreHistory');
+            if (loadMoreBtn) {
+                loadMoreBtn.remove();
+            }
+
             data.history.forEach(msg => {
                 const historyItem = document.createElement('div');
                 historyItem.className = 'history-item';
@@ -128,11 +144,24 @@ async function loadChatHistory() {
                 `;
                 historyList.appendChild(historyItem);
             });
-        } else {
+
+            // Older pages are fetched by id cursor instead of re-reading the newest rows
+            historyCursor = data.next_cursor;
+            if (historyCursor) {
+                const moreBtn = document.createElement('button');
+                moreBtn.id = 'loadMoreHistory';
+                moreBtn.className = 'btn btn-secondary';
+                moreBtn.textContent = 'Load more';
+                moreBtn.addEventListener('click', () => loadChatHistory(historyCursor));
+                historyList.appendChild(moreBtn);
+            }
+        } else if (!cursor) {
             historyList.innerHTML = '<p class="no-data">No chat history yet</p>';
         }
     } catch (error) {
-        historyList.innerHTML = '<p class="error">Failed to load history</p>';
+        if (!cursor) {
+            historyList.innerHTML = '<p class="error">Failed to load history</p>';
+        }
     }
 }
 
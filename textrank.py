@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+Extractive Summarization for Axon AI
+Offline TextRank: sentences become TF-IDF vectors, a cosine similarity graph
+is built with NumPy and sentences are ranked by PageRank (power iteration).
+The best-ranked sentences that fit the length budget are returned in their
+original order.
+
+Latency is kept flat on large inputs by capping the sentences that enter the
+graph (evenly spaced across the text), the characters read per sentence and
+the vocabulary size, and by keeping only each sentence's top-k most similar
+neighbours as edges.
+"""
+
+import math
+import re
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+MAX_SENTENCES = 400         # Sentences ranked per document (evenly sampled beyond this)
+MAX_SENTENCE_CHARS = 600    # Characters of a sentence read when building its vector
+MIN_SENTENCE_WORDS = 4      # Shorter fragments ('Thanks.', 'Hi there!') are not candidates
+MAX_FEATURES = 4000         # Vocabulary kept in the similarity matrix (most widespread terms)
+TOP_K = 10                  # Edges kept per sentence
+DAMPING = 0.85
+TOLERANCE = 1e-6
+MAX_ITERATIONS = 100
+
+_SENTENCE_RE = re.compile(r'(?<=[.!?])["\')\]]*\s+|\n\s*\n')
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9']*")
+
+STOPWORDS = frozenset('''
+a about above after again against all am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have
+having he her here hers herself him himself his how i if in into is it its itself just me more most
+my myself no nor not now of off on once only or other our ours ourselves out over own same she should
+so some such than that the their theirs them themselves then there these they this those through to
+too under until up very was we were what when where which while who whom why will with would you your
+yours yourself yourselves user assistant
+'''.split())
+
+
+def split_sentences(text):
+    """Split text on sentence-ending punctuation and blank lines"""
+    return [s.strip() for s in _SENTENCE_RE.split(text) if s and s.strip()]
+
+
+def _lead(sentences, count, max_chars):
+    """The first sentences that fit the budget (used when ranking isn't possible)"""
+    return _fit(sentences, range(len(sentences)), count, max_chars)
+
+
+def _fit(sentences, order, count, max_chars):
+    """
+    Take sentences in the given order until count or the character budget is
+    reached, then restore document order
+
+    A sentence that doesn't fit is skipped in favour of a shorter one further
+    down; if nothing fits, the best sentence is cut at a word boundary.
+    """
+    chosen = []
+    used = 0
+    for index in order:
+        if len(chosen) >= count:
+            break
+        length = len(sentences[index]) + (1 if chosen else 0)
+        if max_chars is not None and used + length > max_chars:
+            continue
+        chosen.append(index)
+        used += length
+
+    if not chosen:
+        order = list(order)
+        if not order:
+            return ''
+        best = sentences[order[0]]
+        cut = best[:max_chars].rsplit(' ', 1)[0] if max_chars else best
+        return cut.rstrip(',;: ') + '...'
+    return ' '.join(sentences[index] for index in sorted(chosen))
+
+
+class TextRankSummarizer:
+    """TF-IDF + cosine similarity + PageRank sentence ranking"""
+
+    def __init__(self, max_sentences=MAX_SENTENCES, top_k=TOP_K, max_features=MAX_FEATURES,
+                 damping=DAMPING, tolerance=TOLERANCE, max_iterations=MAX_ITERATIONS):
+        """
+        Args:
+            max_sentences: Sentences ranked per document; longer documents are
+                sampled evenly so every part of the text is represented
+            top_k: Most similar neighbours kept as edges per sentence
+            max_features: Terms kept in the TF-IDF matrix
+            damping: PageRank damping factor
+            tolerance: Stop iterating once scores move less than this (L1)
+            max_iterations: Hard cap on power iterations
+        """
+        self.max_sentences = max_sentences
+        self.top_k = top_k
+        self.max_features = max_features
+        self.damping = damping
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+
+    def _candidates(self, sentences):
+        """Indices of the sentences that enter the graph"""
+        candidates = [i for i, s in enumerate(sentences) if s.count(' ') + 1 >= MIN_SENTENCE_WORDS]
+        if len(candidates) < 2:
+            candidates = list(range(len(sentences)))
+        if len(candidates) > self.max_sentences:
+            picks = np.linspace(0, len(candidates) - 1, self.max_sentences).round().astype(int)
+            candidates = [candidates[i] for i in picks]
+        return candidates
+
+    def _tfidf(self, sentences):
+        """L2-normalised TF-IDF rows (sublinear tf, smoothed idf) over the most widespread terms"""
+        counts = []
+        document_frequency = {}
+        for sentence in sentences:
+            terms = {}
+            for word in _WORD_RE.findall(sentence[:MAX_SENTENCE_CHARS].lower()):
+                if len(word) > 1 and word not in STOPWORDS:
+                    terms[word] = terms.get(word, 0) + 1
+            counts.append(terms)
+            for word in terms:
+                document_frequency[word] = document_frequency.get(word, 0) + 1
+
+        n = len(sentences)
+        idf = {word: math.log((1 + n) / (1 + df)) + 1 for word, df in document_frequency.items()}
+        # Terms in a single sentence can't create edges; they only count towards its norm
+        shared = sorted((w for w, df in document_frequency.items() if df > 1),
+                        key=lambda w: -document_frequency[w])[:self.max_features]
+        columns = {word: j for j, word in enumerate(shared)}
+
+        matrix = np.zeros((n, len(columns)), dtype=np.float64)
+        for i, terms in enumerate(counts):
+            norm = 0.0
+            for word, count in terms.items():
+                weight = (1 + math.log(count)) * idf[word]
+                norm += weight * weight
+                j = columns.get(word)
+                if j is not None:
+                    matrix[i, j] = weight
+            if norm:
+                matrix[i] /= math.sqrt(norm)
+        return matrix
+
+    def _graph(self, matrix):
+        """Symmetric cosine similarity graph keeping each row's top-k edges"""
+        similarity = matrix @ matrix.T
+        np.fill_diagonal(similarity, 0.0)
+        n = similarity.shape[0]
+        if n > self.top_k + 1:
+            keep = np.argpartition(-similarity, self.top_k, axis=1)[:, :self.top_k]
+            sparse = np.zeros_like(similarity)
+            rows = np.arange(n)[:, None]
+            sparse[rows, keep] = similarity[rows, keep]
+            # An edge survives if either endpoint ranks it in its top-k
+            similarity = np.maximum(sparse, sparse.T)
+        return similarity
+
+    def _pagerank(self, graph):
+        """Stationary scores of the weighted graph by power iteration"""
+        n = graph.shape[0]
+        out_weight = graph.sum(axis=1)
+        dangling = out_weight == 0
+        transition = graph / np.where(dangling, 1.0, out_weight)[:, None]
+
+        scores = np.full(n, 1.0 / n)
+        for _ in range(self.max_iterations):
+            # Sentences with no edges spread their score evenly
+            updated = (1 - self.damping) / n + self.damping * (
+                transition.T @ scores + scores[dangling].sum() / n)
+            converged = np.abs(updated - scores).sum() < self.tolerance
+            scores = updated
+            if converged:
+                break
+        return scores
+
+    def rank(self, sentences):
+        """
+        Rank sentences by centrality
+
+        Returns:
+            Sentence indices, most central first (only graph candidates)
+        """
+        candidates = self._candidates(sentences)
+        if len(candidates) < 3:
+            return candidates
+        matrix = self._tfidf([sentences[i] for i in candidates])
+        scores = self._pagerank(self._graph(matrix))
+        # Stable sort: ties go to the earlier sentence
+        return [candidates[i] for i in np.argsort(-scores, kind='stable')]
+
+    def summarize(self, text, sentences=3, max_chars=None):
+        """
+        Extract the most central sentences of a text
+
+        Args:
+            text: Text to summarize
+            sentences: Most sentences to return
+            max_chars: Character budget for the summary (None = no limit)
+
+        Returns:
+            Summary string, sentences in their original order
+        """
+        sentence_list = split_sentences(text or '')
+        if len(sentence_list) <= sentences:
+            return _lead(sentence_list, sentences, max_chars)
+        if not NUMPY_AVAILABLE:
+            return _lead(sentence_list, sentences, max_chars)
+        return _fit(sentence_list, self.rank(sentence_list), sentences, max_chars)
+
+
+_default_summarizer = TextRankSummarizer()
+
+
+def summarize(text, sentences=3, max_chars=None):
+    """Quick TextRank summary with the default settings"""
+    return _default_summarizer.summarize(text, sentences=sentences, max_chars=max_chars)
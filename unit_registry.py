@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Conversion Registry for Axon AI
+Table-driven conversions for length, mass, temperature, volume, speed, data
+size and time. Every unit is an affine map to its dimension's base unit
+(value * factor + offset), and the (from, to) scale/shift for every pair in a
+dimension is precomputed, so a conversion is one dict lookup and one
+multiply-add. Queries are parsed in a single pass over their tokens.
+"""
+
+import math
+import re
+
+from lazy_loader import lazy_import, module_available
+
+# Only bulk conversions need NumPy, so it is imported on first use
+np = lazy_import('numpy')
+NUMPY_AVAILABLE = module_available('numpy')
+
+
+class ConversionError(ValueError):
+    """The query or request doesn't describe a conversion we can do"""
+
+
+class Unit:
+    """A unit: base = value * factor + offset"""
+
+    __slots__ = ('name', 'label', 'dimension', 'factor', 'offset')
+
+    def __init__(self, name, label, dimension, factor, offset=0.0):
+        self.name = name
+        self.label = label
+        self.dimension = dimension
+        self.factor = factor
+        self.offset = offset
+
+
+# dimension -> [(name, label, factor to base, offset, aliases)]
+# Base units: metre, kilogram, kelvin, litre, metre/second, byte, second
+UNIT_TABLE = {
+    'length': [
+        ('millimeter', 'mm', 0.001, 0.0, ['mm', 'millimetre']),
+        ('centimeter', 'cm', 0.01, 0.0, ['cm', 'centimetre']),
+        ('meter', 'meters', 1.0, 0.0, ['m', 'metre']),
+        ('kilometer', 'km', 1000.0, 0.0, ['km', 'kms', 'kilometre']),
+        ('inch', 'inches', 0.0254, 0.0, ['inches', '"']),
+        ('foot', 'feet', 0.3048, 0.0, ['feet', 'ft']),
+        ('yard', 'yards', 0.9144, 0.0, ['yd', 'yds']),
+        ('mile', 'miles', 1609.344, 0.0, ['mi']),
+        ('nautical mile', 'nautical miles', 1852.0, 0.0, ['nmi']),
+    ],
+    'mass': [
+        ('milligram', 'mg', 1e-6, 0.0, ['mg', 'milligramme']),
+        ('gram', 'g', 0.001, 0.0, ['g', 'gm', 'gms', 'gramme']),
+        ('kilogram', 'kg', 1.0, 0.0, ['kg', 'kgs', 'kilo', 'kilos', 'kilogramme']),
+        ('tonne', 'tonnes', 1000.0, 0.0, ['t', 'ton', 'tons', 'metric ton']),
+        ('ounce', 'oz', 0.028349523125, 0.0, ['oz']),
+        ('pound', 'pounds', 0.45359237, 0.0, ['lb', 'lbs']),
+        ('stone', 'stone', 6.35029318, 0.0, ['st']),
+    ],
+    'temperature': [
+        ('celsius', '°C', 1.0, 273.15, ['c', '°c', 'centigrade', 'degree celsius', 'degrees celsius',
+                                       'degree c', 'degrees c']),
+        ('fahrenheit', '°F', 5 / 9, 273.15 - 32 * 5 / 9, ['f', '°f', 'degree fahrenheit', 'degrees fahrenheit',
+                                                          'degree f', 'degrees f']),
+        ('kelvin', 'K', 1.0, 0.0, ['kelvins']),
+    ],
+    'volume': [
+        ('milliliter', 'ml', 0.001, 0.0, ['ml', 'millilitre']),
+        ('liter', 'liters', 1.0, 0.0, ['l', 'litre', 'litres', 'ltr']),
+        ('cubic meter', 'm³', 1000.0, 0.0, ['m3', 'm³', 'cubic metre']),
+        ('gallon', 'gallons', 3.785411784, 0.0, ['gal', 'us gallon']),
+        ('quart', 'quarts', 0.946352946, 0.0, ['qt']),
+        ('pint', 'pints', 0.473176473, 0.0, ['pt']),
+        ('cup', 'cups', 0.2365882365, 0.0, []),
+        ('fluid ounce', 'fl oz', 0.0295735295625, 0.0, ['fl oz', 'floz']),
+        ('tablespoon', 'tbsp', 0.01478676478125, 0.0, ['tbsp']),
+        ('teaspoon', 'tsp', 0.00492892159375, 0.0, ['tsp']),
+    ],
+    'speed': [
+        ('meter per second', 'm/s', 1.0, 0.0, ['m/s', 'mps', 'meters per second', 'metres per second']),
+        ('kilometer per hour', 'km/h', 1 / 3.6, 0.0, ['km/h', 'kmh', 'kph', 'kmph', 'km per hour',
+                                                     'kms per hour', 'kilometers per hour',
+                                                     'kilometres per hour']),
+        ('mile per hour', 'mph', 0.44704, 0.0, ['mph', 'miles per hour', 'mi/h']),
+        ('knot', 'knots', 1852 / 3600, 0.0, ['kn', 'kt']),
+        ('foot per second', 'ft/s', 0.3048, 0.0, ['ft/s', 'fps', 'feet per second']),
+    ],
+    'data': [
+        ('bit', 'bits', 0.125, 0.0, []),
+        ('byte', 'bytes', 1.0, 0.0, ['b']),
+        ('kilobyte', 'KB', 1e3, 0.0, ['kb']),
+        ('megabyte', 'MB', 1e6, 0.0, ['mb']),
+        ('gigabyte', 'GB', 1e9, 0.0, ['gb']),
+        ('terabyte', 'TB', 1e12, 0.0, ['tb']),
+        ('petabyte', 'PB', 1e15, 0.0, ['pb']),
+        ('kibibyte', 'KiB', 1024.0, 0.0, ['kib']),
+        ('mebibyte', 'MiB', 1024.0 ** 2, 0.0, ['mib']),
+        ('gibibyte', 'GiB', 1024.0 ** 3, 0.0, ['gib']),
+        ('tebibyte', 'TiB', 1024.0 ** 4, 0.0, ['tib']),
+        ('megabit', 'Mbit', 1e6 / 8, 0.0, ['mbit', 'mbits']),
+        ('gigabit', 'Gbit', 1e9 / 8, 0.0, ['gbit', 'gbits']),
+    ],
+    'time': [
+        ('millisecond', 'ms', 0.001, 0.0, ['ms', 'msec']),
+        ('second', 'seconds', 1.0, 0.0, ['s', 'sec', 'secs']),
+        ('minute', 'minutes', 60.0, 0.0, ['min', 'mins']),
+        ('hour', 'hours', 3600.0, 0.0, ['h', 'hr', 'hrs']),
+        ('day', 'days', 86400.0, 0.0, []),
+        ('week', 'weeks', 604800.0, 0.0, ['wk', 'wks']),
+        ('month', 'months', 2629746.0, 0.0, []),   # Average Gregorian month
+        ('year', 'years', 31556952.0, 0.0, ['yr', 'yrs']),  # Average Gregorian year
+    ],
+}
+
+
+def _build_registry():
+    """Index units by every alias and precompute (scale, shift) for each same-dimension pair"""
+    units = {}
+    aliases = {}
+    for dimension, rows in UNIT_TABLE.items():
+        for name, label, factor, offset, extra in rows:
+            unit = units[name] = Unit(name, label, dimension, factor, offset)
+            names = [name] + extra
+            # Regular plurals ('mile' -> 'miles', 'nautical mile' -> 'nautical miles')
+            if len(name) > 2 and not name.endswith(('s', 'h')) and ' per ' not in name:
+                names.append(name + 's')
+            for alias in names:
+                aliases[alias.lower()] = unit
+
+    conversions = {}
+    for dimension, rows in UNIT_TABLE.items():
+        members = [units[row[0]] for row in rows]
+        for source in members:
+            for target in members:
+                # target = (value * f1 + o1 - o2) / f2
+                scale = source.factor / target.factor
+                shift = (source.offset - target.offset) / target.factor
+                conversions[(source.name, target.name)] = (scale, shift)
+    return units, aliases, conversions
+
+
+UNITS, ALIASES, CONVERSIONS = _build_registry()
+_MAX_ALIAS_WORDS = max(len(alias.split()) for alias in ALIASES)
+
+# Significant digits kept in bulk results (hides float noise like 31.999999999999986
+# without flattening tiny results such as 1 ms in years)
+SIGNIFICANT_DIGITS = 12
+
+# Unit words may contain digits after the first letter ('m3'); a number must come first.
+# Apostrophes and hyphens stay inside a word, so "what's" or "t-shirt" never yield 's' or 't'
+_TOKEN_RE = re.compile(r'(-?\d+(?:,\d{3})*(?:\.\d+)?(?:e[+-]?\d+)?)|(°\s*[a-z]+|[a-z³][a-z³/0-9\'’-]*|")')
+
+
+def get_unit(name):
+    """Resolve a unit name, symbol or alias (raises ConversionError)"""
+    unit = ALIASES.get(' '.join(str(name).lower().split()))
+    if unit is None:
+        raise ConversionError(f"Unknown unit '{name}'")
+    return unit
+
+
+def conversion_factors(source, target):
+    """(scale, shift) with target = value * scale + shift (raises ConversionError across dimensions)"""
+    factors = CONVERSIONS.get((source.name, target.name))
+    if factors is None:
+        raise ConversionError(f"Can't convert {source.dimension} ({source.label}) to "
+                              f"{target.dimension} ({target.label})")
+    return factors
+
+
+def convert(value, source, target):
+    """Convert one value between units (Unit objects or names; raises ConversionError on overflow)"""
+    source = source if isinstance(source, Unit) else get_unit(source)
+    target = target if isinstance(target, Unit) else get_unit(target)
+    scale, shift = conversion_factors(source, target)
+    result = value * scale + shift
+    if not math.isfinite(result):
+        raise ConversionError("The result is too large to represent")
+    return result
+
+
+def _round_significant(result, magnitude):
+    """
+    Round to SIGNIFICANT_DIGITS significant digits of magnitude, the larger of
+    the scaled value and the offset, so cancellation noise in affine
+    conversions (32°F -> 7e-15°C) rounds to zero
+    """
+    if magnitude == 0:
+        return result
+    return round(result, SIGNIFICANT_DIGITS - 1 - math.floor(math.log10(magnitude)))
+
+
+def convert_many(values, source, target):
+    """
+    Convert a list of values between two units in one vectorised pass
+
+    Returns:
+        List of floats (NumPy when available, a plain loop otherwise)
+
+    Raises:
+        ConversionError: Unknown units, mixed dimensions, values that aren't
+            numbers (bools and numeric strings included) or results too large
+            to represent (JSON has no infinity)
+    """
+    source = source if isinstance(source, Unit) else get_unit(source)
+    target = target if isinstance(target, Unit) else get_unit(target)
+    scale, shift = conversion_factors(source, target)
+
+    if isinstance(values, (str, bytes)) or any(isinstance(value, bool) or not isinstance(value, (int, float))
+                                               for value in values):
+        raise ConversionError("Values must be a flat list of numbers")
+
+    if NUMPY_AVAILABLE:
+        try:
+            array = np.asarray(values, dtype=np.float64)
+        except OverflowError:
+            raise ConversionError("Values and results must be finite numbers")
+        with np.errstate(over='ignore', invalid='ignore'):
+            scaled = array * scale
+            results = scaled + shift
+        if not np.isfinite(results).all():
+            raise ConversionError("Values and results must be finite numbers")
+        magnitudes = np.maximum(np.abs(scaled), abs(shift))
+        return [_round_significant(result, magnitude)
+                for result, magnitude in zip(results.tolist(), magnitudes.tolist())]
+
+    try:
+        scaled = [float(value) * scale for value in values]
+    except OverflowError:
+        raise ConversionError("Values and results must be finite numbers")
+    results = [value + shift for value in scaled]
+    if not all(math.isfinite(result) for result in results):
+        raise ConversionError("Values and results must be finite numbers")
+    return [_round_significant(result, max(abs(value), abs(shift))) for value, result in zip(scaled, results)]
+
+
+def parse_conversion(query):
+    """
+    Read '<value> <unit> ... <unit>' out of a query in one pass
+    ('how many <unit> in <value> <unit>' is read target-first)
+
+    Returns:
+        (value, source Unit, target Unit)
+
+    Raises:
+        ConversionError: No value or more than one, or fewer than two known units
+    """
+    tokens = [(number, word.replace(' ', '') if word else None)
+              for number, word in _TOKEN_RE.findall(query.lower())]
+    value = None
+    units_before_value = 0
+    found = []
+    i = 0
+    while i < len(tokens) and len(found) < 2:
+        number, word = tokens[i]
+        if number:
+            if value is not None:
+                # '5 - 3 km' is arithmetic, not a conversion of 5
+                raise ConversionError("Please give a single number to convert. Example: 'convert 10 km to miles'")
+            value = float(number.replace(',', ''))
+            units_before_value = len(found)
+            i += 1
+            continue
+
+        # Longest alias starting at this word
+        matched = 0
+        for size in range(min(_MAX_ALIAS_WORDS, len(tokens) - i), 0, -1):
+            words = tokens[i:i + size]
+            if any(w is None for _, w in words):
+                continue
+            unit = ALIASES.get(' '.join(w for _, w in words))
+            if unit is not None:
+                found.append(unit)
+                matched = size
+                break
+        i += matched or 1
+
+    if value is None:
+        raise ConversionError("Please specify a number to convert. Example: 'convert 10 km to miles'")
+    if len(found) < 2:
+        raise ConversionError("Please name the units to convert between. Example: 'convert 10 km to miles'")
+    if units_before_value == 1:
+        return value, found[1], found[0]
+    return value, found[0], found[1]
+
+
+def format_value(value):
+    """Two decimals, or four significant digits for small magnitudes"""
+    if value != 0 and abs(value) < 0.01:
+        return f"{value:.4g}"
+    return f"{value:.2f}"
+
+
+def format_quantity(value, unit):
+    """Render a value with its unit ('100.0°C', '6.21 miles')"""
+    text = format_value(value) if not isinstance(value, str) else value
+    if unit.label.startswith('°'):
+        return f"{text}{unit.label}"
+    return f"{text} {unit.label}"
+
+
+def list_dimensions():
+    """Unit names per dimension (for help text and the API)"""
+    return {dimension: [row[0] for row in rows] for dimension, rows in UNIT_TABLE.items()}
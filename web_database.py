@@ -9,20 +9,140 @@ import hashlib
 import secrets
 from datetime import datetime, timedelta
 import json
+import re
+from db_pool import ConnectionPool, resolve_profile, apply_pragmas, read_pragmas, managed
+from session_cache import SessionCache
+from write_behind import WriteBehindQueue
 
 def get_ist_now():
     """Get current time in Indian Standard Time (UTC+5:30)"""
     return datetime.utcnow() + timedelta(hours=5, minutes=30)
 
+
+# Compound sentiment at or beyond +/- this is positive / negative (VADER's convention)
+SENTIMENT_THRESHOLD = 0.05
+
+# system_settings key holding the last chat_history id the sentiment backfill scored
+SENTIMENT_CHECKPOINT_KEY = 'sentiment_backfill_checkpoint'
+
+# Rollup key standing in for NULL (a primary key can't be NULL); read back as None
+ROLLUP_NULL_KEY = 'unknown'
+
+
+# Admin export queries: name -> (columns, query). Never export password hashes.
+EXPORT_QUERIES = {
+    'users': (
+        ['id', 'username', 'email', 'is_admin', 'is_superadmin', 'is_active', 'created_at', 'last_login'],
+        '''
+            SELECT id, username, email, is_admin, is_superadmin, is_active, created_at, last_login
+            FROM users
+            ORDER BY id
+        '''
+    ),
+    'chat-history': (
+        ['id', 'user_id', 'username', 'message', 'response', 'mode', 'language', 'sentiment', 'timestamp'],
+        '''
+            SELECT c.id, c.user_id, u.username, c.message, c.response, c.mode, c.language, c.sentiment,
+                   c.timestamp
+            FROM chat_history c
+            LEFT JOIN users u ON c.user_id = u.id
+            ORDER BY c.id
+        '''
+    ),
+    'activity-logs': (
+        ['id', 'user_id', 'username', 'action', 'details', 'ip_address', 'timestamp'],
+        '''
+            SELECT a.id, a.user_id, u.username, a.action, a.details, a.ip_address, a.timestamp
+            FROM activity_logs a
+            LEFT JOIN users u ON a.user_id = u.id
+            ORDER BY a.id
+        '''
+    ),
+}
+
 class WebDatabase:
-    def __init__(self, db_path='web_axon.db'):
-        """Initialize the web database"""
+    def __init__(self, db_path='web_axon.db', use_pool=True, profile='performance',
+                 session_cache_ttl=60, session_cache_size=10000,
+                 write_behind=False, write_behind_interval_ms=50, write_behind_batch=500):
+        """
+        Initialize the web database
+        
+        Args:
+            db_path: Path to the SQLite database file
+            use_pool: Reuse one connection per thread instead of connecting per call
+            profile: Performance profile name ('performance', 'safe') or a dict
+                of pragma overrides - see db_pool.PERFORMANCE_PROFILES
+            session_cache_ttl: Seconds verify_session may serve a session from
+                memory (0 disables the session cache)
+            session_cache_size: Maximum number of cached sessions
+            write_behind: Queue chat_history/activity_logs INSERTs and commit them
+                in batches from a background thread
+            write_behind_interval_ms: Longest time a queued row waits to be written
+            write_behind_batch: Queue depth that triggers an immediate flush
+        """
         self.db_path = db_path
+        self.profile = profile
+        self.pragmas = resolve_profile(profile)
+        self.pool = ConnectionPool(db_path, on_connect=self._configure_connection) if use_pool else None
+        self.session_cache = SessionCache(session_cache_size, session_cache_ttl) if session_cache_ttl else None
         self.create_tables()
+        self.write_queue = None
+        if write_behind:
+            self.write_queue = WriteBehindQueue(self.get_connection, write_behind_interval_ms, write_behind_batch)
+    
+    def _configure_connection(self, conn):
+        """Apply the performance profile to a new connection"""
+        apply_pragmas(conn, self.pragmas)
+    
+    def get_connection(self):
+        """Get a connection (this thread's pooled connection when pooling is on)"""
+        if self.pool:
+            return self.pool.get_connection()
+        conn = sqlite3.connect(self.db_path)
+        self._configure_connection(conn)
+        return conn
+    
+    def connection(self):
+        """Context manager for a connection that is released (and rolled back) even on error"""
+        return managed(self.get_connection())
+    
+    def get_pragmas(self):
+        """Get the configured profile and the pragmas actually in effect"""
+        conn = self.get_connection()
+        effective = read_pragmas(conn)
+        conn.close()
+        
+        return {
+            'database': self.db_path,
+            'profile': self.profile if isinstance(self.profile, str) else 'custom',
+            'configured': self.pragmas,
+            'effective': effective,
+            'pool': self.pool.get_stats() if self.pool else None
+        }
+    
+    def flush_writes(self):
+        """Commit queued write-behind rows before reading chat_history/activity_logs"""
+        if self.write_queue:
+            self.write_queue.flush()
+    
+    def get_runtime_stats(self):
+        """Get connection pool, session cache and write-behind metrics"""
+        return {
+            'pool': self.pool.get_stats() if self.pool else None,
+            'session_cache': self.session_cache.get_stats() if self.session_cache else None,
+            'write_behind': self.write_queue.get_stats() if self.write_queue else None
+        }
+    
+    def close(self):
+        """Flush queued writes and close all pooled connections (call at shutdown)"""
+        if self.write_queue:
+            self.write_queue.close()
+        if self.pool:
+            self.pool.close_all()
     
     def create_tables(self):
         """Create all necessary tables"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.get_connection()
         cursor = conn.cursor()
         
         # Users table
@@ -70,6 +190,12 @@ class WebDatabase:
             )
         ''')
         
+        # Compound sentiment of the message (-1..1), filled in by the sentiment backfill
+        try:
+            cursor.execute('ALTER TABLE chat_history ADD COLUMN sentiment REAL')
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+        
         # Sessions table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS sessions (
@@ -109,10 +235,18 @@ class WebDatabase:
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_username ON users(username)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_email ON users(email)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_session_token ON sessions(session_token)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_chat_user ON chat_history(user_id)')
+        # (user_id, id) serves both per-user lookups and keyset pagination of history
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_chat_user_id ON chat_history(user_id, id)')
+        cursor.execute('DROP INDEX IF EXISTS idx_chat_user')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_activity_user ON activity_logs(user_id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_activity_timestamp ON activity_logs(timestamp)')
         
+        # Analytics rollups kept current by triggers
+        self._create_analytics_rollups(cursor)
+        
+        # Full-text search index over chat history
+        self.search_available = self._create_search_index(cursor)
+        
         # Make first user superadmin if no admins exist
         cursor.execute('SELECT COUNT(*) FROM users WHERE is_superadmin = 1')
         superadmin_count = cursor.fetchone()[0]
@@ -123,109 +257,400 @@ class WebDatabase:
         conn.close()
         print("[+] Database tables created successfully")
     
-    def hash_password(self, password):
-        """Hash a password using SHA-256"""
-        return hashlib.sha256(password.encode()).hexdigest()
+    def _create_analytics_rollups(self, cursor):
+        """Create rollup tables and the triggers that maintain them"""
+        for table, key in [('analytics_daily_messages', 'date'),
+                           ('analytics_language_counts', 'language'),
+                           ('analytics_mode_counts', 'mode'),
+                           ('analytics_command_counts', 'command'),
+                           ('analytics_daily_registrations', 'date')]:
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS {table} (
+                    {key} TEXT PRIMARY KEY,
+                    count INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+        
+        # Same keys the old GROUP BY queries produced (first word for commands), with
+        # ROLLUP_NULL_KEY in place of NULL
+        message_keys = [
+            ('analytics_daily_messages', 'date', "COALESCE(SUBSTR({row}.timestamp, 1, 10), 'unknown')", None),
+            ('analytics_language_counts', 'language', "COALESCE({row}.language, 'unknown')", None),
+            ('analytics_mode_counts', 'mode', "COALESCE({row}.mode, 'unknown')", None),
+            ('analytics_command_counts', 'command',
+             "LOWER(SUBSTR({row}.message, 1, INSTR({row}.message || ' ', ' ') - 1))",
+             "LENGTH({row}.message) > 0"),
+        ]
+        
+        for table, key, expr, condition in message_keys:
+            insert_when = f"WHEN {condition.format(row='NEW')}" if condition else ''
+            delete_when = f"WHEN {condition.format(row='OLD')}" if condition else ''
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_insert
+                AFTER INSERT ON chat_history {insert_when}
+                BEGIN
+                    INSERT INTO {table} ({key}, count) VALUES ({expr.format(row='NEW')}, 1)
+                    ON CONFLICT({key}) DO UPDATE SET count = count + 1;
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_delete
+                AFTER DELETE ON chat_history {delete_when}
+                BEGIN
+                    UPDATE {table} SET count = count - 1 WHERE {key} = {expr.format(row='OLD')};
+                END
+            ''')
+        
+        self._create_sentiment_rollup(cursor)
+        
+        registration_date = "COALESCE(SUBSTR({row}.created_at, 1, 10), 'unknown')"
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_analytics_daily_registrations_insert
+            AFTER INSERT ON users
+            BEGIN
+                INSERT INTO analytics_daily_registrations (date, count) VALUES ({registration_date.format(row='NEW')}, 1)
+                ON CONFLICT(date) DO UPDATE SET count = count + 1;
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_analytics_daily_registrations_delete
+            AFTER DELETE ON users
+            BEGIN
+                UPDATE analytics_daily_registrations SET count = count - 1
+                WHERE date = {registration_date.format(row='OLD')};
+            END
+        ''')
+        
+        # Databases created before the rollups existed need a one-off backfill
+        cursor.execute('''
+            SELECT EXISTS(SELECT 1 FROM users) AND NOT EXISTS(SELECT 1 FROM analytics_daily_registrations)
+        ''')
+        if cursor.fetchone()[0]:
+            self._rebuild_analytics_rollups(cursor)
     
-    def create_user(self, username, email, password):
-        """Create a new user"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def _create_sentiment_rollup(self, cursor):
+        """Daily sentiment sums/counts over scored messages, kept current by triggers"""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS analytics_daily_sentiment (
+                date TEXT PRIMARY KEY,
+                scored INTEGER NOT NULL DEFAULT 0,
+                total REAL NOT NULL DEFAULT 0,
+                positive INTEGER NOT NULL DEFAULT 0,
+                negative INTEGER NOT NULL DEFAULT 0,
+                neutral INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
         
-        try:
-            # Check if this is the first user
-            cursor.execute('SELECT COUNT(*) FROM users')
-            user_count = cursor.fetchone()[0]
-            is_first_user = (user_count == 0)
-            
-            password_hash = self.hash_password(password)
-            created_at = get_ist_now()
+        date = "COALESCE(SUBSTR({row}.timestamp, 1, 10), 'unknown')"
+        
+        def add(row):
+            return f'''
+                INSERT INTO analytics_daily_sentiment (date, scored, total, positive, negative, neutral)
+                SELECT {date.format(row=row)}, 1, {row}.sentiment,
+                       {row}.sentiment >= {SENTIMENT_THRESHOLD}, {row}.sentiment <= -{SENTIMENT_THRESHOLD},
+                       ABS({row}.sentiment) < {SENTIMENT_THRESHOLD}
+                WHERE {row}.sentiment IS NOT NULL
+                ON CONFLICT(date) DO UPDATE SET
+                    scored = scored + 1, total = total + excluded.total, positive = positive + excluded.positive,
+                    negative = negative + excluded.negative, neutral = neutral + excluded.neutral;
+            '''
+        
+        def remove(row):
+            return f'''
+                UPDATE analytics_daily_sentiment SET
+                    scored = scored - 1, total = total - {row}.sentiment,
+                    positive = positive - ({row}.sentiment >= {SENTIMENT_THRESHOLD}),
+                    negative = negative - ({row}.sentiment <= -{SENTIMENT_THRESHOLD}),
+                    neutral = neutral - (ABS({row}.sentiment) < {SENTIMENT_THRESHOLD})
+                WHERE {row}.sentiment IS NOT NULL AND date = {date.format(row=row)};
+            '''
+        
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_analytics_daily_sentiment_insert
+            AFTER INSERT ON chat_history WHEN NEW.sentiment IS NOT NULL
+            BEGIN {add('NEW')} END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_analytics_daily_sentiment_update
+            AFTER UPDATE OF sentiment ON chat_history WHEN OLD.sentiment IS NOT NEW.sentiment
+            BEGIN {remove('OLD')} {add('NEW')} END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_analytics_daily_sentiment_delete
+            AFTER DELETE ON chat_history WHEN OLD.sentiment IS NOT NULL
+            BEGIN {remove('OLD')} END
+        ''')
+    
+    def _rebuild_analytics_rollups(self, cursor):
+        """Recompute every rollup table from chat_history and users"""
+        cursor.execute('DELETE FROM analytics_daily_messages')
+        cursor.execute('DELETE FROM analytics_language_counts')
+        cursor.execute('DELETE FROM analytics_mode_counts')
+        cursor.execute('DELETE FROM analytics_command_counts')
+        cursor.execute('DELETE FROM analytics_daily_registrations')
+        cursor.execute('DELETE FROM analytics_daily_sentiment')
+        
+        cursor.execute('''
+            INSERT INTO analytics_daily_messages (date, count)
+            SELECT COALESCE(SUBSTR(timestamp, 1, 10), 'unknown') AS d, COUNT(*) FROM chat_history GROUP BY d
+        ''')
+        cursor.execute('''
+            INSERT INTO analytics_language_counts (language, count)
+            SELECT COALESCE(language, 'unknown') AS l, COUNT(*) FROM chat_history GROUP BY l
+        ''')
+        cursor.execute('''
+            INSERT INTO analytics_mode_counts (mode, count)
+            SELECT COALESCE(mode, 'unknown') AS m, COUNT(*) FROM chat_history GROUP BY m
+        ''')
+        cursor.execute('''
+            INSERT INTO analytics_command_counts (command, count)
+            SELECT LOWER(SUBSTR(message, 1, INSTR(message || ' ', ' ') - 1)) AS c, COUNT(*)
+            FROM chat_history
+            WHERE LENGTH(message) > 0
+            GROUP BY c
+        ''')
+        cursor.execute('''
+            INSERT INTO analytics_daily_registrations (date, count)
+            SELECT COALESCE(SUBSTR(created_at, 1, 10), 'unknown') AS d, COUNT(*) FROM users GROUP BY d
+        ''')
+        cursor.execute(f'''
+            INSERT INTO analytics_daily_sentiment (date, scored, total, positive, negative, neutral)
+            SELECT COALESCE(SUBSTR(timestamp, 1, 10), 'unknown') AS d, COUNT(*), SUM(sentiment),
+                   SUM(sentiment >= {SENTIMENT_THRESHOLD}), SUM(sentiment <= -{SENTIMENT_THRESHOLD}),
+                   SUM(ABS(sentiment) < {SENTIMENT_THRESHOLD})
+            FROM chat_history
+            WHERE sentiment IS NOT NULL
+            GROUP BY d
+        ''')
+    
+    def rebuild_analytics_rollups(self):
+        """Rebuild the analytics rollup tables from scratch"""
+        self.flush_writes()
+        with self.connection() as conn:
+            cursor = conn.cursor()
             
-            if is_first_user:
-                # First user becomes SuperAdmin
-                cursor.execute('''
-                    INSERT INTO users (username, email, password_hash, is_admin, is_superadmin, is_active, created_at)
-                    VALUES (?, ?, ?, 1, 1, 1, ?)
-                ''', (username, email, password_hash, created_at))
-            else:
-                # Regular user
-                cursor.execute('''
-                    INSERT INTO users (username, email, password_hash, created_at)
-                    VALUES (?, ?, ?, ?)
-                ''', (username, email, password_hash, created_at))
+            self._rebuild_analytics_rollups(cursor)
             
             conn.commit()
-            user_id = cursor.lastrowid
-            conn.close()
+            return {'success': True, 'message': 'Analytics rollups rebuilt'}
+    
+    def _create_search_index(self, cursor):
+        """Create the FTS5 index mirroring chat_history (returns False if FTS5 is missing)"""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'chat_history_fts'")
+        index_exists = cursor.fetchone() is not None
+        
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS chat_history_fts USING fts5(
+                    message, response,
+                    content='chat_history', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            print(f"[WARNING] Chat search disabled (FTS5 not available): {e}")
+            return False
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_chat_history_fts_insert
+            AFTER INSERT ON chat_history
+            BEGIN
+                INSERT INTO chat_history_fts (rowid, message, response)
+                VALUES (NEW.id, NEW.message, NEW.response);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_chat_history_fts_delete
+            AFTER DELETE ON chat_history
+            BEGIN
+                INSERT INTO chat_history_fts (chat_history_fts, rowid, message, response)
+                VALUES ('delete', OLD.id, OLD.message, OLD.response);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_chat_history_fts_update
+            AFTER UPDATE OF message, response ON chat_history
+            BEGIN
+                INSERT INTO chat_history_fts (chat_history_fts, rowid, message, response)
+                VALUES ('delete', OLD.id, OLD.message, OLD.response);
+                INSERT INTO chat_history_fts (rowid, message, response)
+                VALUES (NEW.id, NEW.message, NEW.response);
+            END
+        ''')
+        
+        # Existing databases: index the messages stored before the FTS table existed
+        if not index_exists:
+            cursor.execute('SELECT EXISTS(SELECT 1 FROM chat_history)')
+            if cursor.fetchone()[0]:
+                print("[*] Backfilling chat search index...")
+                cursor.execute("INSERT INTO chat_history_fts (chat_history_fts) VALUES ('rebuild')")
+        
+        return True
+    
+    def rebuild_search_index(self):
+        """Rebuild (backfill) the chat history search index from chat_history"""
+        if not self.search_available:
+            return {'success': False, 'message': 'Full-text search is not available'}
+        
+        self.flush_writes()
+        with self.connection() as conn:
+            cursor = conn.cursor()
             
-            if is_first_user:
-                return {'success': True, 'user_id': user_id, 'message': 'SuperAdmin account created successfully', 'is_superadmin': True}
-            else:
-                return {'success': True, 'user_id': user_id, 'message': 'User created successfully'}
-        
-        except sqlite3.IntegrityError as e:
-            conn.close()
-            if 'username' in str(e):
-                return {'success': False, 'message': 'Username already exists'}
-            elif 'email' in str(e):
-                return {'success': False, 'message': 'Email already exists'}
-            else:
-                return {'success': False, 'message': 'User creation failed'}
+            cursor.execute("INSERT INTO chat_history_fts (chat_history_fts) VALUES ('rebuild')")
+            
+            conn.commit()
+            return {'success': True, 'message': 'Chat search index rebuilt'}
     
-    def create_admin_user(self, requester_id, username, email, password):
-        """Create a new admin user (SuperAdmin only)"""
-        conn = sqlite3.connect(self.db_path)
+    def get_sentiment_checkpoint(self):
+        """Last chat_history id the sentiment backfill has scored (0 = none)"""
+        value = self.get_setting(SENTIMENT_CHECKPOINT_KEY)
+        return int(value) if value else 0
+    
+    def get_unscored_messages(self, after_id, limit):
+        """Next chunk of (id, message) rows after the checkpoint that have no sentiment yet"""
+        conn = self.get_connection()
         cursor = conn.cursor()
         
-        # Verify requester is SuperAdmin
-        cursor.execute('SELECT is_superadmin FROM users WHERE id = ?', (requester_id,))
-        result = cursor.fetchone()
-        
-        if not result or not result[0]:
-            conn.close()
-            return {'success': False, 'message': 'Unauthorized to create admin accounts'}
+        cursor.execute('''
+            SELECT id, message FROM chat_history
+            WHERE id > ? AND sentiment IS NULL
+            ORDER BY id
+            LIMIT ?
+        ''', (after_id, limit))
+        rows = cursor.fetchall()
         
-        try:
-            password_hash = self.hash_password(password)
-            created_at = get_ist_now()
+        conn.close()
+        return rows
+    
+    def store_sentiment_scores(self, scores, checkpoint):
+        """
+        Save a chunk of sentiment scores and advance the checkpoint in one transaction
+        
+        Args:
+            scores: Iterable of (chat_history id, compound score)
+            checkpoint: Highest id covered by this chunk
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
             
+            cursor.executemany('UPDATE chat_history SET sentiment = ? WHERE id = ?',
+                               [(score, message_id) for message_id, score in scores])
             cursor.execute('''
-                INSERT INTO users (username, email, password_hash, is_admin, is_active, created_at)
-                VALUES (?, ?, ?, 1, 1, ?)
-            ''', (username, email, password_hash, created_at))
+                INSERT OR REPLACE INTO system_settings (setting_key, setting_value, updated_at)
+                VALUES (?, ?, ?)
+            ''', (SENTIMENT_CHECKPOINT_KEY, str(checkpoint), get_ist_now()))
             
             conn.commit()
-            user_id = cursor.lastrowid
-            conn.close()
-            return {'success': True, 'user_id': user_id, 'message': 'Admin user created successfully'}
-        
-        except sqlite3.IntegrityError as e:
-            conn.close()
-            if 'username' in str(e):
-                return {'success': False, 'message': 'Username already exists'}
-            elif 'email' in str(e):
-                return {'success': False, 'message': 'Email already exists'}
-            else:
-                return {'success': False, 'message': 'Admin user creation failed'}
     
-    def update_password(self, user_id, new_password):
-        """Update user password"""
-        conn = sqlite3.connect(self.db_path)
+    def get_sentiment_backlog(self):
+        """Messages after the checkpoint still waiting for a score"""
+        conn = self.get_connection()
         cursor = conn.cursor()
         
-        password_hash = self.hash_password(new_password)
-        cursor.execute('''
-            UPDATE users SET password_hash = ?
-            WHERE id = ?
-        ''', (password_hash, user_id))
+        cursor.execute('SELECT COUNT(*) FROM chat_history WHERE id > ?', (self.get_sentiment_checkpoint(),))
+        backlog = cursor.fetchone()[0]
         
-        conn.commit()
         conn.close()
-        return {'success': True, 'message': 'Password updated successfully'}
+        return backlog
+    
+    def hash_password(self, password):
+        """Hash a password using SHA-256"""
+        return hashlib.sha256(password.encode()).hexdigest()
+    
+    def create_user(self, username, email, password):
+        """Create a new user"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            try:
+                # Check if this is the first user
+                cursor.execute('SELECT COUNT(*) FROM users')
+                user_count = cursor.fetchone()[0]
+                is_first_user = (user_count == 0)
+            
+                password_hash = self.hash_password(password)
+                created_at = get_ist_now()
+            
+                if is_first_user:
+                    # First user becomes SuperAdmin
+                    cursor.execute('''
+                        INSERT INTO users (username, email, password_hash, is_admin, is_superadmin, is_active, created_at)
+                        VALUES (?, ?, ?, 1, 1, 1, ?)
+                    ''', (username, email, password_hash, created_at))
+                else:
+                    # Regular user
+                    cursor.execute('''
+                        INSERT INTO users (username, email, password_hash, created_at)
+                        VALUES (?, ?, ?, ?)
+                    ''', (username, email, password_hash, created_at))
+            
+                conn.commit()
+                user_id = cursor.lastrowid
+            
+                if is_first_user:
+                    return {'success': True, 'user_id': user_id, 'message': 'SuperAdmin account created successfully', 'is_superadmin': True}
+                else:
+                    return {'success': True, 'user_id': user_id, 'message': 'User created successfully'}
+            
+            except sqlite3.IntegrityError as e:
+                if 'username' in str(e):
+                    return {'success': False, 'message': 'Username already exists'}
+                elif 'email' in str(e):
+                    return {'success': False, 'message': 'Email already exists'}
+                else:
+                    return {'success': False, 'message': 'User creation failed'}
+    
+    def create_admin_user(self, requester_id, username, email, password):
+        """Create a new admin user (SuperAdmin only)"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            # Verify requester is SuperAdmin
+            cursor.execute('SELECT is_superadmin FROM users WHERE id = ?', (requester_id,))
+            result = cursor.fetchone()
+            
+            if not result or not result[0]:
+                return {'success': False, 'message': 'Unauthorized to create admin accounts'}
+            
+            try:
+                password_hash = self.hash_password(password)
+                created_at = get_ist_now()
+            
+                cursor.execute('''
+                    INSERT INTO users (username, email, password_hash, is_admin, is_active, created_at)
+                    VALUES (?, ?, ?, 1, 1, ?)
+                ''', (username, email, password_hash, created_at))
+            
+                conn.commit()
+                user_id = cursor.lastrowid
+                return {'success': True, 'user_id': user_id, 'message': 'Admin user created successfully'}
+            
+            except sqlite3.IntegrityError as e:
+                if 'username' in str(e):
+                    return {'success': False, 'message': 'Username already exists'}
+                elif 'email' in str(e):
+                    return {'success': False, 'message': 'Email already exists'}
+                else:
+                    return {'success': False, 'message': 'Admin user creation failed'}
+    
+    def update_password(self, user_id, new_password):
+        """Update user password"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            password_hash = self.hash_password(new_password)
+            cursor.execute('''
+                UPDATE users SET password_hash = ?
+                WHERE id = ?
+            ''', (password_hash, user_id))
+            
+            conn.commit()
+            self.invalidate_user_sessions(user_id)
+            return {'success': True, 'message': 'Password updated successfully'}
     
     def get_user_by_email(self, email):
         """Get user by email"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.get_connection()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -253,76 +678,79 @@ class WebDatabase:
     
     def verify_user(self, username, password):
         """Verify user credentials"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        password_hash = self.hash_password(password)
-        cursor.execute('''
-            SELECT id, username, email, is_admin, is_superadmin, is_active FROM users
-            WHERE username = ? AND password_hash = ?
-        ''', (username, password_hash))
-        
-        user = cursor.fetchone()
-        
-        if user:
-            # Check if user is active
-            if not user[5]:
-                conn.close()
-                return {'success': False, 'message': 'Account is banned'}
+        with self.connection() as conn:
+            cursor = conn.cursor()
             
-            # Update last login
-            last_login = get_ist_now()
+            password_hash = self.hash_password(password)
             cursor.execute('''
-                UPDATE users SET last_login = ?
-                WHERE id = ?
-            ''', (last_login, user[0],))
-            conn.commit()
+                SELECT id, username, email, is_admin, is_superadmin, is_active FROM users
+                WHERE username = ? AND password_hash = ?
+            ''', (username, password_hash))
             
-            conn.close()
-            return {
-                'success': True,
-                'user': {
-                    'id': user[0],
-                    'username': user[1],
-                    'email': user[2],
-                    'is_admin': bool(user[3]),
-                    'is_superadmin': bool(user[4]),
-                    'is_active': bool(user[5])
+            user = cursor.fetchone()
+            
+            if user:
+                # Check if user is active
+                if not user[5]:
+                    return {'success': False, 'message': 'Account is banned'}
+            
+                # Update last login
+                last_login = get_ist_now()
+                cursor.execute('''
+                    UPDATE users SET last_login = ?
+                    WHERE id = ?
+                ''', (last_login, user[0],))
+                conn.commit()
+            
+                return {
+                    'success': True,
+                    'user': {
+                        'id': user[0],
+                        'username': user[1],
+                        'email': user[2],
+                        'is_admin': bool(user[3]),
+                        'is_superadmin': bool(user[4]),
+                        'is_active': bool(user[5])
+                    }
                 }
-            }
-        else:
-            conn.close()
-            return {'success': False, 'message': 'Invalid credentials'}
+            else:
+                return {'success': False, 'message': 'Invalid credentials'}
     
     def create_session(self, user_id, hours=24):
         """Create a new session for a user"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Generate secure session token
-        session_token = secrets.token_urlsafe(32)
-        created_at = get_ist_now()
-        expires_at = created_at + timedelta(hours=hours)
-        
-        cursor.execute('''
-            INSERT INTO sessions (user_id, session_token, created_at, expires_at)
-            VALUES (?, ?, ?, ?)
-        ''', (user_id, session_token, created_at, expires_at))
-        
-        conn.commit()
-        conn.close()
-        
-        return session_token
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            # Generate secure session token
+            session_token = secrets.token_urlsafe(32)
+            created_at = get_ist_now()
+            expires_at = created_at + timedelta(hours=hours)
+            
+            cursor.execute('''
+                INSERT INTO sessions (user_id, session_token, created_at, expires_at)
+                VALUES (?, ?, ?, ?)
+            ''', (user_id, session_token, created_at, expires_at))
+            
+            conn.commit()
+            
+            return session_token
     
     def verify_session(self, session_token):
-        """Verify if a session is valid"""
-        conn = sqlite3.connect(self.db_path)
+        """Verify if a session is valid (served from the session cache when possible)"""
+        if self.session_cache:
+            cached_user = self.session_cache.get(session_token)
+            if cached_user:
+                return {'valid': True, 'user': cached_user}
+            # Taken before the read so an invalidation during it keeps this row out of the cache
+            generation = self.session_cache.generation()
+        
+        conn = self.get_connection()
         cursor = conn.cursor()
         
         current_time = get_ist_now()
         
         cursor.execute('''
-            SELECT s.user_id, u.username, u.email, u.is_admin, u.is_superadmin, u.is_active
+            SELECT s.user_id, u.username, u.email, u.is_admin, u.is_superadmin, u.is_active, s.expires_at
             FROM sessions s
             JOIN users u ON s.user_id = u.id
             WHERE s.session_token = ? AND s.expires_at > ?
@@ -332,88 +760,181 @@ class WebDatabase:
         conn.close()
         
         if result:
-            return {
-                'valid': True,
-                'user': {
-                    'id': result[0],
-                    'username': result[1],
-                    'email': result[2],
-                    'is_admin': bool(result[3]),
-                    'is_superadmin': bool(result[4]),
-                    'is_active': bool(result[5])
-                }
+            user = {
+                'id': result[0],
+                'username': result[1],
+                'email': result[2],
+                'is_admin': bool(result[3]),
+                'is_superadmin': bool(result[4]),
+                'is_active': bool(result[5])
             }
+            
+            if self.session_cache:
+                expires_in = (datetime.fromisoformat(str(result[6])) - current_time).total_seconds()
+                self.session_cache.put(session_token, user, expires_in, generation)
+            
+            return {'valid': True, 'user': user}
         else:
             return {'valid': False}
     
     def delete_session(self, session_token):
         """Delete a session (logout)"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        if self.session_cache:
+            self.session_cache.invalidate(session_token)
         
-        cursor.execute('DELETE FROM sessions WHERE session_token = ?', (session_token,))
-        
-        conn.commit()
-        conn.close()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('DELETE FROM sessions WHERE session_token = ?', (session_token,))
+            
+            conn.commit()
+    
+    def invalidate_user_sessions(self, user_id):
+        """Drop a user's cached sessions after their row changes"""
+        if self.session_cache:
+            self.session_cache.invalidate_user(user_id)
     
     def add_chat_message(self, user_id, message, response, mode='text', language='en'):
-        """Add a chat message to history"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        """Add a chat message to history (returns None when write-behind queues it)"""
         timestamp = get_ist_now()
-        
-        cursor.execute('''
+        sql = '''
             INSERT INTO chat_history (user_id, message, response, mode, language, timestamp)
             VALUES (?, ?, ?, ?, ?, ?)
-        ''', (user_id, message, response, mode, language, timestamp))
+        '''
+        params = (user_id, message, response, mode, language, timestamp)
         
-        conn.commit()
-        message_id = cursor.lastrowid
-        conn.close()
+        if self.write_queue:
+            self.write_queue.enqueue(sql, params)
+            return None
         
-        return message_id
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(sql, params)
+            
+            conn.commit()
+            message_id = cursor.lastrowid
+            
+            return message_id
     
     def get_chat_history(self, user_id, limit=50):
-        """Get chat history for a user"""
-        conn = sqlite3.connect(self.db_path)
+        """Get the newest chat history for a user"""
+        return self.get_chat_history_page(user_id, limit)['history']
+    
+    def get_chat_history_page(self, user_id, limit=50, before_id=None):
+        """
+        Get one page of chat history, newest first (keyset pagination on id)
+        
+        Args:
+            user_id: Owner of the history
+            limit: Page size
+            before_id: Only return messages older than this id (None = newest page)
+        
+        Returns:
+            dict with 'history' and 'next_cursor' (the before_id for the next
+            page, or None when there are no older messages)
+        """
+        self.flush_writes()
+        conn = self.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT message, response, mode, language, timestamp
-            FROM chat_history
-            WHERE user_id = ?
-            ORDER BY timestamp DESC
-            LIMIT ?
-        ''', (user_id, limit))
+        # Fetch one extra row to learn whether an older page exists
+        if before_id is not None:
+            cursor.execute('''
+                SELECT id, message, response, mode, language, timestamp
+                FROM chat_history
+                WHERE user_id = ? AND id < ?
+                ORDER BY id DESC
+                LIMIT ?
+            ''', (user_id, before_id, limit + 1))
+        else:
+            cursor.execute('''
+                SELECT id, message, response, mode, language, timestamp
+                FROM chat_history
+                WHERE user_id = ?
+                ORDER BY id DESC
+                LIMIT ?
+            ''', (user_id, limit + 1))
         
         history = cursor.fetchall()
         conn.close()
         
-        return [{
-            'message': h[0],
-            'response': h[1],
-            'mode': h[2],
-            'language': h[3],
-            'timestamp': h[4]
-        } for h in history]
+        has_more = len(history) > limit
+        history = history[:limit]
+        
+        return {
+            'history': [{
+                'id': h[0],
+                'message': h[1],
+                'response': h[2],
+                'mode': h[3],
+                'language': h[4],
+                'timestamp': h[5]
+            } for h in history],
+            'next_cursor': history[-1][0] if has_more else None
+        }
     
-    def clear_chat_history(self, user_id):
-        """Clear chat history for a user"""
-        conn = sqlite3.connect(self.db_path)
+    def search_chat_history(self, user_id, query, limit=20):
+        """
+        Full-text search over a user's chat history
+        
+        Returns:
+            List of matches, best first, with [bracketed] snippets of the
+            message and response around the matched terms
+        """
+        # Quote every term so user input can never be parsed as FTS5 syntax;
+        # the last term is a prefix match so results update while typing
+        terms = re.findall(r'\w+', query.lower())
+        if not terms or not self.search_available:
+            return []
+        match = ' '.join(f'"{term}"' for term in terms) + '*'
+        
+        self.flush_writes()
+        conn = self.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('DELETE FROM chat_history WHERE user_id = ?', (user_id,))
+        cursor.execute('''
+            SELECT c.id,
+                   snippet(chat_history_fts, 0, '[', ']', '...', 12),
+                   snippet(chat_history_fts, 1, '[', ']', '...', 16),
+                   c.mode, c.language, c.timestamp, chat_history_fts.rank
+            FROM chat_history_fts
+            JOIN chat_history c ON c.id = chat_history_fts.rowid
+            WHERE chat_history_fts MATCH ? AND c.user_id = ?
+            ORDER BY chat_history_fts.rank
+            LIMIT ?
+        ''', (match, user_id, limit))
         
-        conn.commit()
-        rows_deleted = cursor.rowcount
+        results = cursor.fetchall()
         conn.close()
         
-        return rows_deleted
+        return [{
+            'id': r[0],
+            'message': r[1],
+            'response': r[2],
+            'mode': r[3],
+            'language': r[4],
+            'timestamp': r[5],
+            'rank': r[6]
+        } for r in results]
+    
+    def clear_chat_history(self, user_id):
+        """Clear chat history for a user"""
+        self.flush_writes()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('DELETE FROM chat_history WHERE user_id = ?', (user_id,))
+            
+            conn.commit()
+            rows_deleted = cursor.rowcount
+            
+            return rows_deleted
     
     def get_user_stats(self, user_id):
         """Get statistics for a user"""
-        conn = sqlite3.connect(self.db_path)
+        self.flush_writes()
+        conn = self.get_connection()
         cursor = conn.cursor()
         
         # Total messages
@@ -450,7 +971,7 @@ class WebDatabase:
     
     def get_all_users(self, include_inactive=True):
         """Get all users (admin only)"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.get_connection()
         cursor = conn.cursor()
         
         if include_inactive:
@@ -483,7 +1004,7 @@ class WebDatabase:
     
     def get_user_by_id(self, user_id):
         """Get user details by ID"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.get_connection()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -514,107 +1035,111 @@ class WebDatabase:
     
     def update_user(self, user_id, username=None, email=None):
         """Update user details"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        try:
-            if username and email:
-                cursor.execute('''
-                    UPDATE users SET username = ?, email = ?
-                    WHERE id = ?
-                ''', (username, email, user_id))
-            elif username:
-                cursor.execute('''
-                    UPDATE users SET username = ?
-                    WHERE id = ?
-                ''', (username, user_id))
-            elif email:
-                cursor.execute('''
-                    UPDATE users SET email = ?
-                    WHERE id = ?
-                ''', (email, user_id))
+        with self.connection() as conn:
+            cursor = conn.cursor()
             
-            conn.commit()
-            conn.close()
-            return {'success': True, 'message': 'User updated successfully'}
-        except sqlite3.IntegrityError:
-            conn.close()
-            return {'success': False, 'message': 'Username or email already exists'}
+            try:
+                if username and email:
+                    cursor.execute('''
+                        UPDATE users SET username = ?, email = ?
+                        WHERE id = ?
+                    ''', (username, email, user_id))
+                elif username:
+                    cursor.execute('''
+                        UPDATE users SET username = ?
+                        WHERE id = ?
+                    ''', (username, user_id))
+                elif email:
+                    cursor.execute('''
+                        UPDATE users SET email = ?
+                        WHERE id = ?
+                    ''', (email, user_id))
+            
+                conn.commit()
+                self.invalidate_user_sessions(user_id)
+                return {'success': True, 'message': 'User updated successfully'}
+            except sqlite3.IntegrityError:
+                return {'success': False, 'message': 'Username or email already exists'}
     
     def delete_user(self, user_id):
         """Delete a user and all related data"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Delete chat history
-        cursor.execute('DELETE FROM chat_history WHERE user_id = ?', (user_id,))
-        # Delete sessions
-        cursor.execute('DELETE FROM sessions WHERE user_id = ?', (user_id,))
-        # Delete user
-        cursor.execute('DELETE FROM users WHERE id = ?', (user_id,))
-        
-        conn.commit()
-        conn.close()
-        
-        return {'success': True, 'message': 'User deleted successfully'}
+        self.flush_writes()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            # Delete chat history
+            cursor.execute('DELETE FROM chat_history WHERE user_id = ?', (user_id,))
+            # Delete sessions
+            cursor.execute('DELETE FROM sessions WHERE user_id = ?', (user_id,))
+            # Delete user
+            cursor.execute('DELETE FROM users WHERE id = ?', (user_id,))
+            
+            conn.commit()
+            self.invalidate_user_sessions(user_id)
+            
+            return {'success': True, 'message': 'User deleted successfully'}
     
     def toggle_admin_status(self, user_id):
         """Toggle admin status for a user"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT is_admin FROM users WHERE id = ?', (user_id,))
-        result = cursor.fetchone()
-        
-        if result:
-            new_status = 0 if result[0] else 1
-            cursor.execute('UPDATE users SET is_admin = ? WHERE id = ?', (new_status, user_id))
-            conn.commit()
-            conn.close()
-            return {'success': True, 'is_admin': bool(new_status)}
-        else:
-            conn.close()
-            return {'success': False, 'message': 'User not found'}
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT is_admin FROM users WHERE id = ?', (user_id,))
+            result = cursor.fetchone()
+            
+            if result:
+                new_status = 0 if result[0] else 1
+                cursor.execute('UPDATE users SET is_admin = ? WHERE id = ?', (new_status, user_id))
+                conn.commit()
+                self.invalidate_user_sessions(user_id)
+                return {'success': True, 'is_admin': bool(new_status)}
+            else:
+                return {'success': False, 'message': 'User not found'}
     
     def toggle_active_status(self, user_id):
         """Toggle active status for a user (ban/unban)"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT is_active FROM users WHERE id = ?', (user_id,))
-        result = cursor.fetchone()
-        
-        if result:
-            new_status = 0 if result[0] else 1
-            cursor.execute('UPDATE users SET is_active = ? WHERE id = ?', (new_status, user_id))
-            conn.commit()
-            conn.close()
-            return {'success': True, 'is_active': bool(new_status)}
-        else:
-            conn.close()
-            return {'success': False, 'message': 'User not found'}
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT is_active FROM users WHERE id = ?', (user_id,))
+            result = cursor.fetchone()
+            
+            if result:
+                new_status = 0 if result[0] else 1
+                cursor.execute('UPDATE users SET is_active = ? WHERE id = ?', (new_status, user_id))
+                conn.commit()
+                self.invalidate_user_sessions(user_id)
+                return {'success': True, 'is_active': bool(new_status)}
+            else:
+                return {'success': False, 'message': 'User not found'}
     
     def log_activity(self, user_id, action, details=None, ip_address=None):
-        """Log user activity"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        """Log user activity (returns None when write-behind queues it)"""
         timestamp = get_ist_now()
-        
-        cursor.execute('''
+        sql = '''
             INSERT INTO activity_logs (user_id, action, details, ip_address, timestamp)
             VALUES (?, ?, ?, ?, ?)
-        ''', (user_id, action, details, ip_address, timestamp))
+        '''
+        params = (user_id, action, details, ip_address, timestamp)
         
-        conn.commit()
-        log_id = cursor.lastrowid
-        conn.close()
+        if self.write_queue:
+            self.write_queue.enqueue(sql, params)
+            return None
         
-        return log_id
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(sql, params)
+            
+            conn.commit()
+            log_id = cursor.lastrowid
+            
+            return log_id
     
     def get_activity_logs(self, limit=100, user_id=None):
         """Get activity logs"""
-        conn = sqlite3.connect(self.db_path)
+        self.flush_writes()
+        conn = self.get_connection()
         cursor = conn.cursor()
         
         if user_id:
@@ -650,93 +1175,95 @@ class WebDatabase:
     
     def get_admin_analytics(self):
         """Get comprehensive analytics for admin dashboard"""
-        conn = sqlite3.connect(self.db_path)
+        self.flush_writes()
+        conn = self.get_connection()
         cursor = conn.cursor()
         
-        # Calculate start of today in IST for queries
-        today_ist = get_ist_now().date()
-        today_msg_query = f"{today_ist}%"
+        # Rollup tables are keyed by IST date (YYYY-MM-DD)
+        today_ist = str(get_ist_now().date())
         
-        # Total users
-        cursor.execute('SELECT COUNT(*) FROM users')
-        total_users = cursor.fetchone()[0]
-        
-        # Active users
-        cursor.execute('SELECT COUNT(*) FROM users WHERE is_active = 1')
-        active_users = cursor.fetchone()[0]
-        
-        # Admin users
-        cursor.execute('SELECT COUNT(*) FROM users WHERE is_admin = 1')
-        admin_users = cursor.fetchone()[0]
+        # User counts (users is small; chat_history is never scanned here)
+        cursor.execute('''
+            SELECT COUNT(*), COALESCE(SUM(is_active = 1), 0), COALESCE(SUM(is_admin = 1), 0)
+            FROM users
+        ''')
+        total_users, active_users, admin_users = cursor.fetchone()
         
         # Total messages
-        cursor.execute('SELECT COUNT(*) FROM chat_history')
+        cursor.execute('SELECT COALESCE(SUM(count), 0) FROM analytics_daily_messages')
         total_messages = cursor.fetchone()[0]
         
-        # Messages today (Using IST date pattern match)
-        cursor.execute('''
-            SELECT COUNT(*) FROM chat_history
-            WHERE timestamp LIKE ?
-        ''', (today_msg_query,))
-        messages_today = cursor.fetchone()[0]
+        # Messages today
+        cursor.execute('SELECT count FROM analytics_daily_messages WHERE date = ?', (today_ist,))
+        row = cursor.fetchone()
+        messages_today = row[0] if row else 0
         
         # Users registered today
-        cursor.execute('''
-            SELECT COUNT(*) FROM users
-            WHERE created_at LIKE ?
-        ''', (today_msg_query,))
-        users_today = cursor.fetchone()[0]
+        cursor.execute('SELECT count FROM analytics_daily_registrations WHERE date = ?', (today_ist,))
+        row = cursor.fetchone()
+        users_today = row[0] if row else 0
         
         # Messages by language
         cursor.execute('''
-            SELECT language, COUNT(*) as count
-            FROM chat_history
-            GROUP BY language
+            SELECT language, count FROM analytics_language_counts
+            WHERE count > 0
             ORDER BY count DESC
         ''')
-        language_stats = [{'language': row[0], 'count': row[1]} for row in cursor.fetchall()]
+        language_stats = [{'language': None if row[0] == ROLLUP_NULL_KEY else row[0], 'count': row[1]}
+                          for row in cursor.fetchall()]
         
         # Messages by mode
         cursor.execute('''
-            SELECT mode, COUNT(*) as count
-            FROM chat_history
-            GROUP BY mode
+            SELECT mode, count FROM analytics_mode_counts
+            WHERE count > 0
             ORDER BY count DESC
         ''')
-        mode_stats = [{'mode': row[0], 'count': row[1]} for row in cursor.fetchall()]
+        mode_stats = [{'mode': None if row[0] == ROLLUP_NULL_KEY else row[0], 'count': row[1]}
+                      for row in cursor.fetchall()]
         
-        # Popular commands (extract first word from message)
+        # Popular commands (first word of each message)
         cursor.execute('''
-            SELECT LOWER(SUBSTR(message, 1, INSTR(message || ' ', ' ') - 1)) as command, COUNT(*) as count
-            FROM chat_history
-            WHERE LENGTH(message) > 0
-            GROUP BY command
+            SELECT command, count FROM analytics_command_counts
+            WHERE count > 0
             ORDER BY count DESC
             LIMIT 10
         ''')
         popular_commands = [{'command': row[0], 'count': row[1]} for row in cursor.fetchall()]
         
-        # User registration trend (last 7 days - simplified)
-        # Note: SQLite extraction of date from timestamp string works if format is YYYY-MM-DD HH:MM:SS
+        # User registration trend (last 7 days with registrations)
         cursor.execute('''
-            SELECT substr(created_at, 1, 10) as date, COUNT(*) as count
-            FROM users
-            GROUP BY date
+            SELECT date, count FROM analytics_daily_registrations
+            WHERE count > 0 AND date != 'unknown'
             ORDER BY date DESC
             LIMIT 7
         ''')
         registration_trend = [{'date': row[0], 'count': row[1]} for row in cursor.fetchall()]
         
-        # Message volume trend (last 7 days)
+        # Message volume trend (last 7 days with messages)
         cursor.execute('''
-            SELECT substr(timestamp, 1, 10) as date, COUNT(*) as count
-            FROM chat_history
-            GROUP BY date
+            SELECT date, count FROM analytics_daily_messages
+            WHERE count > 0 AND date != 'unknown'
             ORDER BY date DESC
             LIMIT 7
         ''')
         message_trend = [{'date': row[0], 'count': row[1]} for row in cursor.fetchall()]
         
+        # Sentiment trend (last 7 days with scored messages)
+        cursor.execute('''
+            SELECT date, scored, total, positive, negative, neutral FROM analytics_daily_sentiment
+            WHERE scored > 0 AND date != 'unknown'
+            ORDER BY date DESC
+            LIMIT 7
+        ''')
+        sentiment_trend = [{
+            'date': row[0],
+            'scored': row[1],
+            'average': round(row[2] / row[1], 4),
+            'positive': row[3],
+            'negative': row[4],
+            'neutral': row[5]
+        } for row in cursor.fetchall()]
+        
         conn.close()
         
         return {
@@ -752,12 +1279,44 @@ class WebDatabase:
             'mode_stats': mode_stats,
             'popular_commands': popular_commands,
             'registration_trend': registration_trend,
-            'message_trend': message_trend
+            'message_trend': message_trend,
+            'sentiment_trend': sentiment_trend
         }
     
+    def iter_export(self, name, batch_size=1000):
+        """
+        Stream an admin export without loading it into memory
+        
+        Args:
+            name: Key of EXPORT_QUERIES ('users', 'chat-history', 'activity-logs')
+            batch_size: Rows fetched per fetchmany() call
+        
+        Returns:
+            (columns, generator yielding lists of row tuples)
+        """
+        columns, query = EXPORT_QUERIES[name]
+        self.flush_writes()
+        
+        def batches():
+            # A dedicated connection keeps the long-running read cursor off the
+            # request thread's pooled connection; closed when the stream ends
+            conn = sqlite3.connect(self.db_path)
+            try:
+                self._configure_connection(conn)
+                cursor = conn.execute(query)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+            finally:
+                conn.close()
+        
+        return columns, batches()
+    
     def get_setting(self, key):
         """Get a system setting"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.get_connection()
         cursor = conn.cursor()
         
         cursor.execute('SELECT setting_value FROM system_settings WHERE setting_key = ?', (key,))
@@ -768,23 +1327,22 @@ class WebDatabase:
     
     def set_setting(self, key, value):
         """Set a system setting"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        updated_at = get_ist_now()
-        cursor.execute('''
-            INSERT OR REPLACE INTO system_settings (setting_key, setting_value, updated_at)
-            VALUES (?, ?, ?)
-        ''', (key, value, updated_at))
-        
-        conn.commit()
-        conn.close()
-        
-        return {'success': True, 'message': 'Setting updated'}
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            updated_at = get_ist_now()
+            cursor.execute('''
+                INSERT OR REPLACE INTO system_settings (setting_key, setting_value, updated_at)
+                VALUES (?, ?, ?)
+            ''', (key, value, updated_at))
+            
+            conn.commit()
+            
+            return {'success': True, 'message': 'Setting updated'}
     
     def get_all_settings(self):
         """Get all system settings"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.get_connection()
         cursor = conn.cursor()
         
         cursor.execute('SELECT setting_key, setting_value, updated_at FROM system_settings')
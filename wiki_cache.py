@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+Wikipedia Lookup Cache for Axon AI
+Caches wikipedia.summary() results by normalised query: an in-process LRU in
+front of a SQLite table, with a TTL, negative caching of missing pages and
+disambiguation resolved to the first option
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from db_pool import ConnectionPool, resolve_profile, apply_pragmas
+from singleflight import get_group
+from lazy_loader import lazy_import, module_available
+
+# Imported on the first lookup (it pulls in requests and BeautifulSoup)
+wikipedia = lazy_import('wikipedia')
+WIKIPEDIA_AVAILABLE = module_available('wikipedia')
+
+# Threads missing the cache for the same query share one Wikipedia request
+WIKIPEDIA_CALLS = get_group('wikipedia')
+
+
+def normalize_query(query):
+    """
+    Normalise a query so trivially different phrasings share a cache entry
+
+    Case, runs of whitespace and trailing punctuation are ignored; symbols inside
+    the query are kept, so 'c++', 'c#' and 'c' stay separate entries.
+    """
+    return ' '.join(query.lower().split()).rstrip('?!.,;:').strip()
+
+
+class WikipediaCache:
+    """Memory + SQLite cache of Wikipedia summaries"""
+
+    def __init__(self, db_path='wiki_cache.db', max_size=1000, ttl=86400, negative_ttl=3600,
+                 sentences=3, profile='performance'):
+        """
+        Args:
+            db_path: SQLite file holding cached lookups (shared by all workers)
+            max_size: Entries kept in memory (least recently used are evicted)
+            ttl: Seconds a found summary is served from cache
+            negative_ttl: Seconds a "no such page" result is served from cache
+            sentences: Sentences per summary
+            profile: Database performance profile (see db_pool.PERFORMANCE_PROFILES)
+        """
+        self.db_path = db_path
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.sentences = sentences
+        self.pragmas = resolve_profile(profile)
+        self.pool = ConnectionPool(db_path, on_connect=self._configure_connection)
+
+        self._entries = OrderedDict()  # normalised query -> (result, expires_at)
+        self._lock = threading.Lock()
+        self.stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'negative_hits': 0,
+            'fetches': 0,
+            'fetch_errors': 0,
+            'evictions': 0
+        }
+
+        self.create_tables()
+
+    def _configure_connection(self, conn):
+        """Apply the performance profile to a new connection"""
+        apply_pragmas(conn, self.pragmas)
+
+    def create_tables(self):
+        """Create the cache table and drop expired rows"""
+        conn = self.pool.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS wiki_cache (
+                query TEXT PRIMARY KEY,
+                found INTEGER NOT NULL,
+                title TEXT,
+                summary TEXT,
+                expires_at REAL NOT NULL
+            )
+        ''')
+        cursor.execute('DELETE FROM wiki_cache WHERE expires_at <= ?', (time.time(),))
+        conn.commit()
+        conn.close()
+
+    def _remember(self, key, result, expires_at):
+        """Put an entry in the in-memory LRU"""
+        with self._lock:
+            self._entries[key] = (result, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def _count_hit(self, kind, result):
+        """Count a cache hit"""
+        with self._lock:
+            self.stats[kind] += 1
+            if not result['found']:
+                self.stats['negative_hits'] += 1
+
+    def _fetch(self, query):
+        """Look a query up on Wikipedia; returns a result dict"""
+        if not WIKIPEDIA_AVAILABLE:
+            raise RuntimeError('wikipedia package is not installed')
+
+        try:
+            return {'found': True, 'title': query,
+                    'summary': wikipedia.summary(query, sentences=self.sentences)}
+        except wikipedia.exceptions.DisambiguationError as e:
+            # Ambiguous - use the first option (as the Q&A handler always did)
+            if not e.options:
+                return {'found': False, 'title': None, 'summary': None}
+            title = e.options[0]
+        except wikipedia.exceptions.PageError:
+            return {'found': False, 'title': None, 'summary': None}
+
+        try:
+            return {'found': True, 'title': title,
+                    'summary': wikipedia.summary(title, sentences=self.sentences, auto_suggest=False)}
+        except (wikipedia.exceptions.DisambiguationError, wikipedia.exceptions.PageError):
+            return {'found': False, 'title': None, 'summary': None}
+
+    def lookup(self, query):
+        """
+        Get the Wikipedia summary for a query
+
+        Returns:
+            dict with 'found' (False when no page exists), 'title' and 'summary'
+
+        Raises:
+            Whatever the wikipedia client raises for network errors; those are not cached
+        """
+        key = normalize_query(query)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= now:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None:
+            self._count_hit('memory_hits', entry[0])
+            return dict(entry[0])
+
+        conn = self.pool.get_connection()
+        row = conn.execute('''
+            SELECT found, title, summary, expires_at FROM wiki_cache
+            WHERE query = ? AND expires_at > ?
+        ''', (key, now)).fetchone()
+        conn.close()
+
+        if row is not None:
+            result = {'found': bool(row[0]), 'title': row[1], 'summary': row[2]}
+            self._remember(key, result, row[3])
+            self._count_hit('disk_hits', result)
+            return dict(result)
+
+        with self._lock:
+            self.stats['misses'] += 1
+        # The normalised key only identifies the cache entry; Wikipedia gets what the user typed
+        return dict(WIKIPEDIA_CALLS.do(key, self._fetch_and_store, key, query.strip()))
+
+    def _fetch_and_store(self, key, query):
+        """Fetch a query and cache the result in SQLite and memory under its normalised key"""
+        with self._lock:
+            self.stats['fetches'] += 1
+        try:
+            result = self._fetch(query)
+        except Exception:
+            with self._lock:
+                self.stats['fetch_errors'] += 1
+            raise
+
+        expires_at = time.time() + (self.ttl if result['found'] else self.negative_ttl)
+        conn = self.pool.get_connection()
+        conn.execute('''
+            INSERT OR REPLACE INTO wiki_cache (query, found, title, summary, expires_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (key, int(result['found']), result['title'], result['summary'], expires_at))
+        conn.commit()
+        conn.close()
+
+        self._remember(key, result, expires_at)
+        return result
+
+    def clear(self):
+        """Drop every cached lookup"""
+        with self._lock:
+            self._entries.clear()
+        conn = self.pool.get_connection()
+        conn.execute('DELETE FROM wiki_cache')
+        conn.commit()
+        conn.close()
+
+    def close(self):
+        """Close pooled connections (call at shutdown)"""
+        self.pool.close_all()
+
+    def get_stats(self):
+        """Get cache statistics"""
+        with self._lock:
+            size = len(self._entries)
+            stats = dict(self.stats)
+        hits = stats['memory_hits'] + stats['disk_hits']
+        lookups = hits + stats['misses']
+        stats.update(size=size, hit_rate=round(hits / lookups, 4) if lookups else 0.0)
+        return stats
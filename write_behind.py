@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Write-Behind Queue for Axon AI
+Collects INSERTs from the request path and commits them in batches
+from a background writer thread (one executemany transaction per flush)
+
+A flush that fails because the database is locked or busy is retried on the
+next flushes, up to max_retries times per row; rows that still can't be
+written, or that fail for any other reason, are dropped and counted.
+"""
+
+import sqlite3
+import threading
+import time
+
+MAX_RETRIES = 5
+
+
+def is_busy_error(error):
+    """Whether an SQLite error is a lock/busy condition that a later flush can get past"""
+    message = str(error).lower()
+    return isinstance(error, sqlite3.OperationalError) and ('locked' in message or 'busy' in message)
+
+
+class WriteBehindQueue:
+    """Batches INSERT statements and flushes them every N ms or M rows"""
+
+    def __init__(self, get_connection, flush_interval_ms=50, max_batch=500, max_retries=MAX_RETRIES):
+        """
+        Args:
+            get_connection: Callable returning a connection (closed after each flush)
+            flush_interval_ms: Longest time a queued row waits before it is written
+            max_batch: Queue depth that triggers an immediate flush
+            max_retries: Flushes a row is retried after lock/busy errors before it is dropped
+        """
+        self.get_connection = get_connection
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_batch = max_batch
+        self.max_retries = max_retries
+
+        self._pending = []                       # [(sql, params, attempts), ...]
+        self._lock = threading.Lock()            # guards _pending and stats
+        self._wakeup = threading.Condition(self._lock)
+        self._flush_lock = threading.Lock()      # one flush at a time
+        self._running = True
+
+        self.stats = {
+            'enqueued': 0,
+            'written': 0,
+            'failed': 0,
+            'retried': 0,
+            'dead_lettered': 0,
+            'flushes': 0,
+            'last_flush_ms': 0.0,
+            'max_flush_ms': 0.0,
+            'total_flush_ms': 0.0,
+            'max_queue_depth': 0
+        }
+
+        self._thread = threading.Thread(target=self._run, name='axon-write-behind', daemon=True)
+        self._thread.start()
+
+    def enqueue(self, sql, params):
+        """Queue one INSERT; it is committed by the next flush"""
+        with self._lock:
+            if not self._running:
+                raise sqlite3.ProgrammingError('Write-behind queue is closed')
+
+            self._pending.append((sql, params, 0))
+            self.stats['enqueued'] += 1
+            depth = len(self._pending)
+            if depth > self.stats['max_queue_depth']:
+                self.stats['max_queue_depth'] = depth
+            if depth >= self.max_batch:
+                self._wakeup.notify()
+
+    def _run(self):
+        """Writer thread main loop"""
+        while True:
+            with self._lock:
+                if self._running and len(self._pending) < self.max_batch:
+                    self._wakeup.wait(self.flush_interval)
+                if not self._running:
+                    break
+            self.flush()
+
+    def flush(self):
+        """Write everything queued so far; returns the number of rows written"""
+        with self._flush_lock:
+            with self._lock:
+                batch = self._pending
+                self._pending = []
+
+            if not batch:
+                return 0
+
+            # Group by statement so each table gets a single executemany
+            statements = {}
+            for sql, params, _ in batch:
+                statements.setdefault(sql, []).append(params)
+
+            start = time.perf_counter()
+            written = failed = retried = dead_lettered = 0
+            conn = self.get_connection()
+            try:
+                for sql, rows in statements.items():
+                    conn.executemany(sql, rows)
+                conn.commit()
+                written = len(batch)
+            except sqlite3.Error as e:
+                conn.rollback()
+                if is_busy_error(e):
+                    # Put the rows back for the next flush until they run out of retries
+                    retry = [(sql, params, attempts + 1) for sql, params, attempts in batch
+                             if attempts < self.max_retries]
+                    retried = len(retry)
+                    dead_lettered = len(batch) - retried
+                    with self._lock:
+                        self._pending[:0] = retry
+                    print(f"[WARNING] Write-behind flush error (retrying {retried} rows, "
+                          f"dropped {dead_lettered} after {self.max_retries} retries): {e}")
+                else:
+                    failed = len(batch)
+                    print(f"[WARNING] Write-behind flush error (dropped {failed} rows): {e}")
+            finally:
+                conn.close()
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self.stats['written'] += written
+                self.stats['failed'] += failed
+                self.stats['retried'] += retried
+                self.stats['dead_lettered'] += dead_lettered
+                self.stats['flushes'] += 1
+                self.stats['last_flush_ms'] = elapsed_ms
+                self.stats['total_flush_ms'] += elapsed_ms
+                if elapsed_ms > self.stats['max_flush_ms']:
+                    self.stats['max_flush_ms'] = elapsed_ms
+            return written
+
+    def close(self):
+        """Stop the writer thread and flush whatever is still queued"""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            self._wakeup.notify()
+        self._thread.join()
+        self.flush()
+        # Rows put back after lock/busy errors get their remaining retries now
+        while self.get_stats()['queue_depth']:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def get_stats(self):
+        """Get queue depth and flush latency metrics"""
+        with self._lock:
+            stats = dict(self.stats, queue_depth=len(self._pending))
+        flushes = stats['flushes']
+        stats['avg_flush_ms'] = round(stats['total_flush_ms'] / flushes if flushes else 0.0, 3)
+        for key in ('last_flush_ms', 'max_flush_ms', 'total_flush_ms'):
+            stats[key] = round(stats[key], 3)
+        return stats